@@ -7,73 +7,12 @@ import requests
 import os
 from datetime import datetime
 
-def get_api_key_from_config():
-    """Read API key from config.txt file"""
-    try:
-        with open('config.txt', 'r') as f:
-            for line in f:
-                if line.startswith('NEWS_API_KEY='):
-                    api_key = line.strip().split('=', 1)[1]
-                    api_key = api_key.strip('"\'')
-                    if api_key:
-                        return api_key
-    except FileNotFoundError:
-        print("config.txt file not found.")
-    except Exception as e:
-        print(f"Error reading config file: {e}")
-    return None
-
-def get_top_indian_news_sources(api_key):
-    """Get a list of Indian news sources"""
-    url = "https://newsapi.org/v2/sources"
-    params = {
-        'category': 'general',
-        'country': 'in',
-        'apiKey': api_key
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            if data['status'] == 'ok':
-                sources = [source['id'] for source in data['sources']]
-                print(f"Found {len(sources)} Indian news sources: {sources}")
-                return sources
-    except Exception as e:
-        print(f"Error fetching sources: {e}")
-    
-    # Fallback to known Indian news sources
-    return ['the-times-of-india', 'the-hindu', 'google-news-in']
+from src.fetchers.source_catalogue import SourceCatalogue, fetch_top_sources
+from src.services.config_service import get_setting
 
-def get_articles_from_sources(api_key, sources):
-    """Fetch articles from specific sources"""
-    all_articles = []
-    
-    for source in sources[:3]:  # Limit to first 3 sources
-        print(f"Fetching from source: {source}")
-        url = "https://newsapi.org/v2/top-headlines"
-        params = {
-            'sources': source,
-            'apiKey': api_key,
-            'pageSize': '5'
-        }
-        
-        try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                if data['status'] == 'ok' and data.get('articles'):
-                    # Add source info to articles
-                    for article in data['articles']:
-                        if article.get('title') and not article['title'].startswith('Google News'):
-                            all_articles.append(article)
-                            if len(all_articles) >= 15:  # Limit total articles
-                                return all_articles
-        except Exception as e:
-            print(f"Error fetching from {source}: {e}")
-    
-    return all_articles
+def get_api_key_from_config():
+    """Read API key from config.txt (or environment) via the shared config service"""
+    return get_setting('NEWS_API_KEY')
 
 def get_country_news(api_key):
     """Fetch news using country parameter"""
@@ -137,10 +76,11 @@ def main():
     
     print("✅ API key found")
     
-    # Method 1: Try specific sources
+    # Method 1: Try the best Indian news sources (cached catalogue, fetched concurrently)
     print("\n1. Trying specific Indian news sources...")
-    sources = get_top_indian_news_sources(api_key)
-    articles = get_articles_from_sources(api_key, sources)
+    catalogue = SourceCatalogue(api_key)
+    print(f"Top sources: {catalogue.top(3)}")
+    articles = fetch_top_sources(catalogue, top_n=3, per_source=5, max_articles=15)
     
     # Method 2: If not enough articles, try country method
     if len(articles) < 5:
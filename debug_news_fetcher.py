@@ -7,22 +7,16 @@ import requests
 import os
 from datetime import datetime
 
+from src.services.config_service import get_setting
+
 def get_api_key_from_config():
-    """Read API key from config.txt file"""
-    try:
-        with open('config.txt', 'r') as f:
-            for line in f:
-                if line.startswith('NEWS_API_KEY='):
-                    api_key = line.strip().split('=', 1)[1]
-                    api_key = api_key.strip('"\'')
-                    if api_key:
-                        print(f"Found API key: {api_key[:5]}***")  # Show only first 5 chars
-                        return api_key
-    except FileNotFoundError:
-        print("config.txt file not found.")
-    except Exception as e:
-        print(f"Error reading config file: {e}")
-    return None
+    """Read API key from config.txt (or environment) via the shared config service"""
+    api_key = get_setting('NEWS_API_KEY')
+    if api_key:
+        print(f"Found API key: {api_key[:5]}***")  # Show only first 5 chars
+    else:
+        print("NEWS_API_KEY not found in config.txt or environment.")
+    return api_key
 
 def get_indian_news(api_key):
     """Fetch top headlines from Indian news sources"""
@@ -1,33 +1,33 @@
-import requests
 from datetime import datetime
 import os
-import html
 import json
-import re
+import time
+
+from src.fetchers.fast_json import decode_response, project_list
+from src.fetchers.image_cache import DEFAULT_DIRECTORY as IMAGE_CACHE_DIRECTORY
+from src.fetchers.image_cache import ImageCache
+from src.fetchers.link_checker import DEFAULT_CACHE_PATH as LINK_CACHE_PATH
+from src.fetchers.link_checker import PAYWALLED, LinkCache, LinkChecker
+from src.fetchers.newsapi_fetcher import ARTICLE_FIELDS
+from src.fetchers.retry_policy import AUTH, DEFAULT_POLICY, ProviderError, get_with_retry
+from src.fetchers.summarizer import summarize_articles
+from src.fetchers.text_normalizer import normalize_text
+from src.fetchers.urls import UrlIndex
+from src.services.config_service import get_config_service, get_setting
+from src.services.story_threads import StoryThreads
 
 def get_api_key_from_config():
     """
-    Read API key from config.txt file
+    Read API key from config.txt (or environment) via the shared config service
     """
-    try:
-        with open('config.txt', 'r') as f:
-            for line in f:
-                if line.startswith('NEWS_API_KEY='):
-                    api_key = line.strip().split('=', 1)[1]
-                    # Remove any quotes around the API key
-                    api_key = api_key.strip('"\'')
-                    if api_key:
-                        return api_key
-    except FileNotFoundError:
-        print("config.txt file not found.")
-    except Exception as e:
-        print(f"Error reading config file: {e}")
-    return None
+    return get_setting('NEWS_API_KEY')
 
-def get_indian_news(api_key):
+def get_indian_news(api_key, deadline=None):
     """
     Fetch top headlines from Indian news sources
     """
+    if deadline is None:
+        deadline = time.monotonic() + DEFAULT_POLICY.max_total
     # Try different sources to get better quality articles
     sources = [
         {'country': 'in'},  # India (broader search)
@@ -47,31 +47,37 @@ def get_indian_news(api_key):
         params['pageSize'] = '20'  # Get more articles to filter through
         
         try:
-            # Make the API request
-            response = requests.get(url, params=params)
+            # Make the API request (transient errors and 429s are retried)
+            response = get_with_retry(url, params=params, provider='newsapi',
+                                      deadline=deadline, api_key=api_key)
             
-            if response.status_code == 200:
-                # Parse the JSON response
-                data = response.json()
-                
-                # Check if the request was successful
-                if data['status'] == 'ok' and data.get('articles'):
-                    # Filter out generic "Google News" titles
-                    filtered_articles = [
-                        article for article in data['articles'] 
-                        if article.get('title') and not article['title'].startswith('Google News')
-                    ]
-                    all_articles.extend(filtered_articles)
+            # Parse the JSON response, keeping only the fields used
+            data = decode_response(response)
+            
+            # Check if the request was successful
+            if data['status'] == 'ok' and data.get('articles'):
+                # Filter out generic "Google News" titles
+                filtered_articles = [
+                    article for article in project_list(data['articles'], ARTICLE_FIELDS)
+                    if article.get('title') and not article['title'].startswith('Google News')
+                ]
+                all_articles.extend(filtered_articles)
                     
-        except requests.exceptions.RequestException as e:
+        except ProviderError as e:
             print(f"Error fetching news: {e}")
+            if e.kind == AUTH:
+                # The other queries use the same key
+                break
+        except ValueError as e:
+            print(f"Invalid response: {e}")
     
-    # Remove duplicates based on title
+    # Remove duplicates based on title and canonical URL (tracking/AMP variants)
     seen_titles = set()
+    seen_urls = UrlIndex()
     unique_articles = []
     for article in all_articles:
         title = article.get('title', '').strip()
-        if title and title not in seen_titles:
+        if title and title not in seen_titles and seen_urls.add(article.get('url') or ''):
             seen_titles.add(title)
             unique_articles.append(article)
     
@@ -82,13 +88,16 @@ def clean_html(text):
     """
     Remove HTML tags and decode HTML entities
     """
-    if not text:
+    return normalize_text(text)
+
+def story_label(article):
+    """
+    " (N updates)" for an article heading a developing story, else ""
+    """
+    updates = article.get('story_updates')
+    if not updates:
         return ""
-    # Decode HTML entities
-    text = html.unescape(text)
-    # Remove common HTML tags (basic cleaning)
-    clean = re.compile('<.*?>')
-    return re.sub(clean, '', text).strip()
+    return f" ({updates} update{'s' if updates != 1 else ''})"
 
 def save_news_for_youtube(articles):
     """
@@ -102,13 +111,14 @@ def save_news_for_youtube(articles):
             f.write("No articles found.\n")
             return
             
-        for i, article in enumerate(articles[:15], 1):  # Increase to 15 articles
+        articles = articles[:15]  # Increase to 15 articles
+        summaries = summarize_articles(articles, max_length=600)
+        for i, (article, description) in enumerate(zip(articles, summaries), 1):
             title = article.get('title', 'No title')
             source = article['source']['name'] if article.get('source') else 'Unknown source'
             published_at = article.get('publishedAt', '')[:19].replace('T', ' ') if article.get('publishedAt') else 'Unknown date'
             
-            # Clean and display description
-            description = clean_html(article.get('description', ''))
+            # Summarized description (whole when short)
             if not description:
                 description = "No description available."
             
@@ -116,7 +126,7 @@ def save_news_for_youtube(articles):
             url = article.get('url', 'No URL available')
             
             # Write to file
-            f.write(f"{i}. {title}\n")
+            f.write(f"{i}. {title}{story_label(article)}\n")
             f.write(f"   Source: {source}\n")
             f.write(f"   Published: {published_at}\n")
             f.write(f"   Description: {description}\n")
@@ -132,23 +142,49 @@ def generate_html_dashboard(articles):
         articles_html = "<p>No articles found.</p>"
     else:
         articles_html = ""
-        for i, article in enumerate(articles[:15], 1):  # Increase to 15 articles
+        # Skip repeats of the same page (tracking, AMP and mobile variants)
+        shown = UrlIndex()
+        articles = [a for a in articles if shown.add(a.get('url') or '')][:20]
+        settings = get_config_service().get()
+        # Dead links are dropped, paywalled ones labelled (all checked at once),
+        # unless LINK_CHECK=false
+        if settings.get('LINK_CHECK', 'true').lower() != 'false':
+            checker = LinkChecker(LinkCache(settings.get('LINK_CACHE_FILE') or LINK_CACHE_PATH))
+            articles = checker.filter_articles(articles)
+        articles = articles[:15]  # Increase to 15 articles
+        summaries = summarize_articles(articles, max_length=300)
+        # With IMAGE_CACHE=true, thumbnails are served from the local cache,
+        # fetched once and shrunk
+        if settings.get('IMAGE_CACHE', 'false').lower() == 'true':
+            images = ImageCache(
+                settings.get('IMAGE_CACHE_DIR') or IMAGE_CACHE_DIRECTORY,
+                max_bytes=int(settings.number('IMAGE_CACHE_MB', 50) * 1024 * 1024)
+            )
+            images.localize(articles)
+        else:
+            images = None
+        for i, (article, description) in enumerate(zip(articles, summaries), 1):
             # Clean and prepare article data
             title = article.get('title', 'No title')
             source = article['source']['name'] if article.get('source') else 'Unknown source'
             published_at = article.get('publishedAt', '')[:19].replace('T', ' ') if article.get('publishedAt') else 'Unknown date'
             
-            # Clean and display description
-            description = clean_html(article.get('description', ''))
+            # Summarized description (at most 300 characters)
             if not description:
                 description = "No description available."
-            elif len(description) > 300:
-                description = description[:297] + "..."
             
             # Display URL if available and seems valid
             url = article.get('url', '#')
             if not url or not url.startswith('http'):
                 url = '#'
+            paywall_note = " | Subscription required" if article.get('link_status') == PAYWALLED else ""
+            thumbnail = article.get('image_files', {}).get('webp') if images else None
+            if thumbnail:
+                # Relative to the dashboard, which is written to the working directory
+                thumbnail = os.path.relpath(images.path(thumbnail)).replace(os.sep, '/')
+                thumbnail_html = f'<img class="thumb" src="{thumbnail}" alt="" loading="lazy">'
+            else:
+                thumbnail_html = ''
             
             # Escape strings for JavaScript (must be done outside f-string)
             url_escaped = url.replace("'", "\\'")
@@ -159,8 +195,9 @@ def generate_html_dashboard(articles):
             # Add article to HTML
             articles_html += f'''
             <div class="article">
-                <h3>{i}. {title}</h3>
-                <p class="meta">Source: {source} | Published: {published_at}</p>
+                {thumbnail_html}
+                <h3>{i}. {title}{story_label(article)}</h3>
+                <p class="meta">Source: {source} | Published: {published_at}{paywall_note}</p>
                 <p class="description">{description}</p>
                 <div class="url-container">
                     <span class="url-label">Link:</span>
@@ -206,6 +243,13 @@ def generate_html_dashboard(articles):
                 border-radius: 5px;
                 box-shadow: 0 2px 5px rgba(0,0,0,0.1);
             }}
+            .thumb {{
+                width: 100%;
+                max-height: 180px;
+                object-fit: cover;
+                border-radius: 3px;
+                margin-bottom: 10px;
+            }}
             .article h3 {{
                 margin-top: 0;
                 color: #2c3e50;
@@ -353,17 +397,15 @@ def display_news(articles):
     print(f"TOP NEWS FROM INDIA - {datetime.now().strftime('%Y-%m-%d')}")
     print(f"{'='*100}")
     
-    for i, article in enumerate(articles[:15], 1):  # Increase to 15 articles
-        print(f"\n{i}. {article['title']}")
+    articles = articles[:15]  # Increase to 15 articles
+    summaries = summarize_articles(articles, max_sentences=2, max_length=200)
+    for i, (article, description) in enumerate(zip(articles, summaries), 1):
+        print(f"\n{i}. {article['title']}{story_label(article)}")
         print(f"   Source: {article['source']['name']}")
         print(f"   Published: {article['publishedAt'][:19].replace('T', ' ')}")
         
-        # Clean and display description
-        description = clean_html(article.get('description', ''))
+        # Summarized description, short for readability
         if description:
-            # Limit description length for better readability
-            if len(description) > 200:
-                description = description[:197] + "..."
             print(f"   Description: {description}")
         
         # Display URL if available and seems valid
@@ -391,6 +433,9 @@ def main():
     print("Fetching today's top news from India...")
     articles = get_indian_news(api_key)
     
+    # One entry per developing story (threads persist across runs)
+    articles = StoryThreads().collapse(articles)
+    
     # Display news in console
     display_news(articles)
     
@@ -4,17 +4,47 @@ News Scheduler Application
 Automatically sends Indian news updates 3 times daily via email
 """
 
-import time
 import signal
 import sys
-from datetime import datetime, time as datetime_time
-from typing import List
-import schedule
+import threading
+import time
+from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 
-from src.services.news_service import NewsService, load_config
+from src.fetchers.article_extractor import DEFAULT_CACHE_PATH as ARTICLE_CACHE_PATH
+from src.fetchers.article_extractor import ArticleExtractor, BodyCache
+from src.fetchers.image_cache import DEFAULT_DIRECTORY as IMAGE_CACHE_DIRECTORY
+from src.fetchers.image_cache import ImageCache
+from src.fetchers.link_checker import DEFAULT_CACHE_PATH as LINK_CACHE_PATH
+from src.fetchers.link_checker import LinkCache, LinkChecker
+from src.fetchers.rate_limiter import rate_limiters
+from src.fetchers.retry_policy import metrics as retry_metrics
 from src.services.email_sender import EmailSender
+from src.services.email_optimizer import OptimizedEmailSender
+from src.services.config_service import KEY_GROUPS, KNOWN_KEYS, ConfigService, Settings
+from src.services.checkpoint import DEFAULT_RESUME_MAX_AGE_MINUTES, SendCheckpoint
+from src.services.job_executor import JobExecutor
+from src.services.prefetch import (
+    DEFAULT_LEAD_MINUTES, DEFAULT_MAX_AGE_MINUTES, DigestPrefetcher, PreparedDigest, build_digest
+)
+from src.services.process_lock import ProcessLock
+from src.services.aggregator import FetchAggregator
+from src.services.provider_router import ProviderRouter
+from src.services.recipient_profiles import load_profiles
+from src.services.story_threads import DEFAULT_SIMILARITY as STORY_SIMILARITY
+from src.services.story_threads import DEFAULT_STATE_PATH as STORY_STATE_PATH
+from src.services.story_threads import StoryThreads
+from src.services.scheduler_core import ScheduleSlot, SlotScheduler, parse_schedule_times
+
+
+# Settings whose change requires rebuilding each component
+NEWS_SERVICE_KEYS = set(KEY_GROUPS['news_service'])
+PROVIDER_HEALTH_KEYS = set(KEY_GROUPS['provider_health'])
+EMAIL_KEYS = set(KEY_GROUPS['email'])
+SCHEDULE_KEYS = set(KEY_GROUPS['schedule'])
+JOB_KEYS = set(KEY_GROUPS['jobs'])
+STARTUP_KEYS = set(KEY_GROUPS['startup'])
 
 
 # Ensure logs directory exists
@@ -41,16 +71,37 @@ if sys.stdout.encoding != 'utf-8':
 class NewsScheduler:
     """Automated news scheduler with email notifications"""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, config_service: ConfigService = None):
         """
         Initialize news scheduler
         
         Args:
             config: Configuration dictionary
+            config_service: Watched for changes while running (optional)
         """
-        self.config = config
+        self.config = config if isinstance(config, Settings) else Settings(config)
+        self.config_service = config_service
+        self._stop_watching = threading.Event()
         self.news_service = None
+        self.extractor = None
+        self.story_threads = None
+        self.link_checker = None
+        self.image_cache = None
         self.email_sender = None
+        self.profiles = []
+        self.slot_scheduler = None
+        self.prefetcher = DigestPrefetcher(
+            max_age=self.config.number('PREFETCH_MAX_AGE_MINUTES', DEFAULT_MAX_AGE_MINUTES) * 60
+        )
+        self.executor = JobExecutor()
+        self.checkpoint = SendCheckpoint(
+            config.get('CHECKPOINT_FILE', str(Path('state') / 'send_checkpoint.json')),
+            max_age=self.config.number('RESUME_MAX_AGE_MINUTES', DEFAULT_RESUME_MAX_AGE_MINUTES) * 60
+        )
+        self.job_timeout = self.config.number('JOB_TIMEOUT_MINUTES', 15) * 60
+        self.prefetch_lead = timedelta(
+            minutes=self.config.number('PREFETCH_LEAD_MINUTES', DEFAULT_LEAD_MINUTES)
+        )
         self.running = True
         
         # Setup signal handlers for graceful shutdown
@@ -63,64 +114,204 @@ class NewsScheduler:
     def _initialize_services(self):
         """Initialize news and email services"""
         try:
-            # Initialize news service
-            self.news_service = NewsService(self.config)
-            logger.info("News service initialized")
-            
-            # Initialize email sender
-            smtp_server = self.config.get('SMTP_SERVER')
-            smtp_port = int(self.config.get('SMTP_PORT', 587))
-            sender_email = self.config.get('SENDER_EMAIL')
-            sender_password = self.config.get('SENDER_PASSWORD', '').replace(' ', '')  # Strip spaces (Gmail app passwords)
-            recipient_emails_str = self.config.get('RECIPIENT_EMAILS', '')
-            
-            if not all([smtp_server, sender_email, sender_password, recipient_emails_str]):
-                raise ValueError("Email configuration incomplete")
-            
-            recipient_emails = [email.strip() for email in recipient_emails_str.split(',') if email.strip()]
-            
-            self.email_sender = EmailSender(
-                smtp_server, smtp_port, sender_email, 
-                sender_password, recipient_emails
-            )
-            logger.info(f"Email sender initialized for {len(recipient_emails)} recipient(s)")
-            
+            self._initialize_news_service()
+            self._initialize_email()
         except Exception as e:
             logger.error(f"Failed to initialize services: {e}")
             raise
     
+    def _initialize_news_service(self, rebuild_health: bool = False):
+        """
+        (Re)build the news service from the current configuration
+        
+        Args:
+            rebuild_health: Rebuild the circuit breakers with the current
+                settings (from the saved state) instead of keeping them
+        """
+        # Routes between single-provider services with circuit breakers;
+        # health state survives rebuilds so a reload does not reset breakers
+        rate_limiters.configure(self.config)
+        previous = self.news_service
+        health = None
+        if previous is not None:
+            if rebuild_health:
+                # The new breakers start from the state saved here
+                previous.health.save(force=True)
+            else:
+                health = previous.health
+        if (self.config.get('FETCH_MODE') or 'router').lower() == 'aggregate':
+            # Every enabled fetcher plugin at once, results merged
+            self.news_service = FetchAggregator.from_config(self.config, health=health)
+        else:
+            self.news_service = ProviderRouter.from_config(self.config, health=health)
+        logger.info(f"News service initialized (providers: {', '.join(self.news_service.preference)})")
+        
+        # Full article text from the linked pages (opt-in: one download per new article)
+        if self.config.get('ENRICH_ARTICLES', 'false').lower() == 'true':
+            cache = BodyCache(self.config.get('ARTICLE_CACHE_FILE') or ARTICLE_CACHE_PATH)
+            self.extractor = ArticleExtractor(cache)
+        else:
+            self.extractor = None
+        
+        # One digest entry per developing story, threaded across runs
+        if self.config.get('STORY_THREADS', 'true').lower() != 'false':
+            self.story_threads = StoryThreads(
+                self.config.get('STORY_STATE_FILE') or STORY_STATE_PATH,
+                similarity=self.config.number('STORY_SIMILARITY', STORY_SIMILARITY)
+            )
+        else:
+            self.story_threads = None
+        
+        # Dead links are dropped before the digest goes out
+        if self.config.get('LINK_CHECK', 'true').lower() != 'false':
+            self.link_checker = LinkChecker(LinkCache(self.config.get('LINK_CACHE_FILE') or LINK_CACHE_PATH))
+        else:
+            self.link_checker = None
+        
+        # Thumbnails fetched once and kept on disk, for email templates that embed
+        # them (ImageCache.mime_images); opt-in, since the stock template does not
+        if self.config.get('IMAGE_CACHE', 'false').lower() == 'true':
+            self.image_cache = ImageCache(
+                self.config.get('IMAGE_CACHE_DIR') or IMAGE_CACHE_DIRECTORY,
+                max_bytes=int(self.config.number('IMAGE_CACHE_MB', 50) * 1024 * 1024)
+            )
+        else:
+            self.image_cache = None
+    
+    def _prepare_articles(self, articles: list) -> list:
+        """Add full article text, group stories, drop dead links and cache thumbnails, as configured"""
+        if self.extractor is not None:
+            articles = self.extractor.enrich(articles)
+        if self.story_threads is not None:
+            articles = self.story_threads.collapse(articles)
+        if self.link_checker is not None:
+            articles = self.link_checker.filter_articles(articles)
+        if self.image_cache is not None:
+            articles = self.image_cache.localize(articles)
+        return articles
+    
+    def _initialize_email(self):
+        """(Re)build email senders and recipient profiles from the current configuration"""
+        smtp_server = self.config.smtp_server
+        sender_email = self.config.sender_email
+        sender_password = self.config.sender_password
+        recipient_emails = self.config.recipient_emails
+        
+        if not all([smtp_server, sender_email, sender_password, recipient_emails]):
+            raise ValueError("Email configuration incomplete")
+        
+        self._smtp_settings = (smtp_server, self.config.smtp_port, sender_email, sender_password)
+        
+        # Shrink digests (shared styles, trimmed descriptions) unless disabled,
+        # optionally with a compact text/plain alternative
+        if self.config.get('EMAIL_OPTIMIZE', 'true').lower() != 'false':
+            self._sender_class = OptimizedEmailSender
+            self._sender_options = {
+                'plain_text': self.config.get('EMAIL_PLAIN_TEXT', 'false').lower() == 'true'
+            }
+        else:
+            self._sender_class = EmailSender
+            self._sender_options = {}
+        
+        self.email_sender = EmailSender(*self._smtp_settings, recipient_emails)
+        logger.info(f"Email sender initialized for {len(recipient_emails)} recipient(s)")
+        
+        # Load recipient profiles (RECIPIENT_EMAILS without one get everything)
+        self.profiles = load_profiles(self.config)
+        logger.info(f"Loaded {len(self.profiles)} recipient profile(s)")
+    
+    def _apply_config_change(self, settings: Settings, changed: set):
+        """Rebuild only the components whose settings changed"""
+        self.config = settings
+        
+        if changed & (NEWS_SERVICE_KEYS | PROVIDER_HEALTH_KEYS):
+            self._initialize_news_service(rebuild_health=bool(changed & PROVIDER_HEALTH_KEYS))
+        if changed & EMAIL_KEYS:
+            self._initialize_email()
+            # Prepared digests were grouped for the old recipients
+            self.prefetcher.clear()
+        if changed & SCHEDULE_KEYS:
+            self.prefetch_lead = timedelta(
+                minutes=settings.number('PREFETCH_LEAD_MINUTES', DEFAULT_LEAD_MINUTES)
+            )
+            self.setup_schedule(settings.schedule_times)
+        if changed & JOB_KEYS:
+            # SHUTDOWN_GRACE_SECONDS is read from self.config at shutdown
+            self.prefetcher.max_age = settings.number('PREFETCH_MAX_AGE_MINUTES', DEFAULT_MAX_AGE_MINUTES) * 60
+            self.checkpoint.max_age = (
+                settings.number('RESUME_MAX_AGE_MINUTES', DEFAULT_RESUME_MAX_AGE_MINUTES) * 60
+            )
+            self.job_timeout = settings.number('JOB_TIMEOUT_MINUTES', 15) * 60
+        if changed & STARTUP_KEYS:
+            logger.warning(f"Changes to {', '.join(sorted(changed & STARTUP_KEYS))} "
+                           f"take effect after a restart")
+    
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
+        """Handle shutdown signals; only flags the main loop, which does the draining"""
+        if not self.running:
+            logger.warning("Second shutdown signal received, exiting immediately")
+            sys.exit(1)
         logger.info("Shutdown signal received, stopping scheduler...")
         self.running = False
-        sys.exit(0)
+        if self.slot_scheduler is not None:
+            self.slot_scheduler.stop()
+    
+    def prefetch_news(self, slot: str, cancel: threading.Event = None):
+        """
+        Build a slot's digest ahead of its send time
+        
+        Args:
+            slot: Schedule slot (HH:MM) to prepare
+            cancel: Set when the job must stop (deadline or shutdown)
+        """
+        try:
+            logger.info(f"Prefetching digest for {slot}...")
+            digest = build_digest(self.news_service.fetch_news, self.profiles, slot, prepare=self._prepare_articles)
+            if cancel is not None and cancel.is_set():
+                logger.warning(f"Prefetch for {slot} finished after its deadline, discarding")
+                return
+            if digest is None:
+                logger.warning(f"Prefetch for {slot} returned no articles; will fetch at send time")
+                self.prefetcher.discard(slot)
+                return
+            self.prefetcher.store(digest)
+            logger.info(f"Digest for {slot} ready ({len(digest.groups)} email(s))")
+        except Exception as e:
+            logger.error(f"Prefetch for {slot} failed, will fetch at send time: {e}")
+            self.prefetcher.discard(slot)
     
-    def fetch_and_send_news(self):
-        """Fetch news and send via email"""
+    def fetch_and_send_news(self, slot: str = None, cancel: threading.Event = None):
+        """
+        Send each recipient their digest, fetching news if nothing was prefetched
+        
+        Args:
+            slot: Schedule slot (HH:MM) being served, None for an ad-hoc run
+            cancel: Set when the job must stop (deadline or shutdown)
+        """
         try:
             logger.info("=" * 70)
-            logger.info("Starting scheduled news fetch...")
             
-            # Fetch hottest/most interesting news articles
-            # NewsData.io will fetch from multiple categories and filter for viral content
-            articles, api_source = self.news_service.fetch_news(max_articles=25)
+            # A send stopped at its deadline left emails unsent; finish them
+            # (if still recent enough) before this send takes the checkpoint
+            if self.checkpoint.path.exists():
+                self.resume_interrupted_send(cancel)
+                if cancel is not None and cancel.is_set():
+                    return
+            
+            digest = self.prefetcher.take(slot)
+            if digest is not None:
+                logger.info(f"Using digest prefetched {digest.age:.0f}s ago")
+            else:
+                logger.info("Starting scheduled news fetch...")
+                digest = build_digest(self.news_service.fetch_news, self.profiles, slot, prepare=self._prepare_articles)
             
-            if not articles:
+            if digest is None:
                 error_msg = "No articles fetched from any API"
                 logger.error(error_msg)
                 self.email_sender.send_error_notification(error_msg)
                 return
             
-            logger.info(f"Fetched {len(articles)} articles from {api_source}")
-            
-            # Send email
-            success = self.email_sender.send_news_email(articles, api_source)
-            
-            if success:
-                logger.info("✅ News email sent successfully")
-            else:
-                logger.error("❌ Failed to send news email")
-            
+            self._send_digest(digest, set(), time.time(), cancel)
             logger.info("=" * 70)
             
         except Exception as e:
@@ -131,68 +322,162 @@ class NewsScheduler:
             except Exception as notify_error:
                 logger.error(f"Failed to send error notification: {notify_error}")
     
-    def setup_schedule(self, schedule_times: List[str]):
+    def _send_digest(self, digest: PreparedDigest, sent: set, created_at: float,
+                     cancel: threading.Event = None):
+        """
+        Send a digest's emails, checkpointing after each one
+        
+        Args:
+            digest: Digest to send
+            sent: Indices of groups already sent (when resuming)
+            created_at: When the send first started (wall-clock seconds)
+            cancel: Set when the job should stop at the next email boundary
+        """
+        self.checkpoint.begin(digest, sent, created_at)
+        
+        # One email per distinct digest
+        for i, (articles, recipients) in enumerate(digest.groups):
+            if i in sent:
+                continue
+            if cancel is not None and cancel.is_set():
+                remaining = len(digest.groups) - len(sent)
+                logger.warning(f"Send interrupted, {remaining} email(s) checkpointed for next start")
+                return
+            sender = self._sender_class(*self._smtp_settings, recipients, **self._sender_options)
+            success = sender.send_news_email(articles, digest.api_source)
+            
+            if success:
+                logger.info(f"✅ News email sent successfully to {len(recipients)} recipient(s)")
+            else:
+                logger.error(f"❌ Failed to send news email to {', '.join(recipients)}")
+            
+            # Failed emails are not retried on resume, only unsent ones
+            sent.add(i)
+            self.checkpoint.mark_sent(i)
+        
+        self.checkpoint.clear()
+    
+    def resume_interrupted_send(self, cancel: threading.Event = None):
+        """Finish a slot that an earlier run was stopped in the middle of"""
+        try:
+            resumed = self.checkpoint.load()
+            if resumed is None:
+                return
+            digest, sent, created_at = resumed
+            logger.info(f"Resuming interrupted send for slot {digest.slot} "
+                        f"({len(sent)}/{len(digest.groups)} email(s) already sent)")
+            self._send_digest(digest, sent, created_at, cancel)
+        except Exception as e:
+            logger.error(f"Failed to resume interrupted send: {e}")
+    
+    def shutdown(self):
+        """Stop accepting jobs, drain running ones and flush logs"""
+        self._stop_watching.set()
+        grace = self.config.number('SHUTDOWN_GRACE_SECONDS', 30)
+        if self.executor.shutdown(grace):
+            logger.info("All jobs finished")
+        counters = retry_metrics.snapshot()
+        if len(counters) > 1:
+            logger.info(f"Provider request metrics: {counters}")
+            logger.info(f"Rate limiter waits: {rate_limiters.stats()}")
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+    
+    def setup_schedule(self, schedule_times: str):
         """
         Setup scheduled times for news updates
         
         Args:
-            schedule_times: List of times in HH:MM format (e.g., ["06:00", "14:00", "22:00"])
+            schedule_times: Comma-separated HH:MM times, each optionally with an
+                IANA timezone (e.g., "06:00,14:00,22:00 Asia/Kolkata")
         """
-        schedule.clear()
+        slots = parse_schedule_times(schedule_times, self.config.get('SCHEDULE_TIMEZONE'))
         
-        for time_str in schedule_times:
-            try:
-                schedule.every().day.at(time_str).do(self.fetch_and_send_news)
-                logger.info(f"Scheduled news update at {time_str}")
-            except Exception as e:
-                logger.error(f"Failed to schedule time {time_str}: {e}")
+        for slot in slots:
+            logger.info(f"Scheduled news update at {slot.label} ({getattr(slot.tz, 'key', 'local time')})")
+        
+        # Prefetch stage runs a lead time ahead so the send fires exactly on time
+        lead = self.prefetch_lead
+        if lead > timedelta(0):
+            slots += [slot.with_phase('prefetch', -lead) for slot in slots]
+            logger.info(f"Digests are prefetched {lead.total_seconds() / 60:g} minute(s) ahead")
         
-        if not schedule.get_jobs():
-            raise ValueError("No valid schedule times configured")
+        if self.slot_scheduler is None:
+            self.slot_scheduler = SlotScheduler(
+                slots, self._run_slot,
+                misfire_policy=self.config.get('MISFIRE_POLICY', 'coalesce').lower(),
+                misfire_grace=self.config.number('MISFIRE_GRACE_MINUTES', 5) * 60
+            )
+        else:
+            self.slot_scheduler.misfire_policy = self.config.get('MISFIRE_POLICY', 'coalesce').lower()
+            self.slot_scheduler.misfire_grace = self.config.number('MISFIRE_GRACE_MINUTES', 5) * 60
+            self.slot_scheduler.reload(slots)
+    
+    def _run_slot(self, slot: ScheduleSlot, due: datetime):
+        """Hand the job for a due slot to a worker so the scheduler loop never blocks"""
+        logger.info(f"Slot {slot.label} {slot.phase} due at {due.astimezone():%Y-%m-%d %H:%M:%S %Z}")
+        if slot.phase == 'prefetch':
+            # A prefetch still running at send time is useless, so it gets the lead as deadline
+            self.executor.submit(f"prefetch:{slot.label}", self.prefetch_news,
+                                 self.prefetch_lead.total_seconds(), slot.label)
+        else:
+            # All sends share one key (and the checkpoint), so they never overlap;
+            # a slot due while another send runs waits for it instead of being dropped
+            self.executor.enqueue('send', self.fetch_and_send_news, self.job_timeout, slot=slot.label)
     
     def run(self):
-        """Run the scheduler"""
+        """Run the scheduler, refusing to start if another instance is running"""
+        lock_path = self.config.get('SCHEDULER_LOCK_FILE', str(Path('state') / 'news_scheduler.lock'))
+        with ProcessLock(lock_path):
+            self._run()
+    
+    def _run(self):
         logger.info("=" * 70)
         logger.info("🚀 Indian News Scheduler Started")
         logger.info("=" * 70)
         
         # Get schedule times from config
-        schedule_times_str = self.config.get('SCHEDULE_TIMES', '06:00,14:00,22:00')
-        schedule_times = [t.strip() for t in schedule_times_str.split(',') if t.strip()]
+        schedule_times = self.config.schedule_times
         
-        logger.info(f"Schedule times: {', '.join(schedule_times)}")
+        logger.info(f"Schedule times: {schedule_times}")
         
         # Setup schedule
         self.setup_schedule(schedule_times)
         
         # Display next run times
-        jobs = schedule.get_jobs()
-        logger.info(f"Total scheduled jobs: {len(jobs)}")
-        for job in jobs:
-            logger.info(f"  Next run: {job.next_run}")
+        upcoming = self.slot_scheduler.upcoming()
+        logger.info(f"Total scheduled jobs: {len(upcoming)}")
+        for due, slot in upcoming:
+            logger.info(f"  Next run: {due.astimezone():%Y-%m-%d %H:%M:%S %Z} ({slot.label} {slot.phase})")
         
         logger.info("=" * 70)
         
+        # Pick up config.txt edits (schedule, recipients, API keys) without a restart
+        reload_interval = self.config.number('CONFIG_RELOAD_SECONDS', 30)
+        if self.config_service is not None and reload_interval > 0:
+            self.config_service.subscribe(KNOWN_KEYS, self._apply_config_change)
+            self.config_service.watch(reload_interval, self._stop_watching)
+            logger.info(f"Watching {self.config_service.path} for changes every {reload_interval:g}s")
+        
+        # Finish a slot interrupted by the previous shutdown, without new API calls
+        if self.checkpoint.path.exists():
+            self.executor.submit('send', self.resume_interrupted_send, self.job_timeout)
+        
         # Optional: Send immediate test notification
         if '--test' in sys.argv or '--immediate' in sys.argv:
             logger.info("Running immediate test...")
-            self.fetch_and_send_news()
+            self.executor.submit('send', self.fetch_and_send_news, self.job_timeout)
         
-        # Main scheduler loop
+        # Main scheduler loop: sleeps until the next slot, woken early by signals
         logger.info("Scheduler is running. Press Ctrl+C to stop.")
         
-        while self.running:
+        if self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-                
+                self.slot_scheduler.run()
             except KeyboardInterrupt:
                 logger.info("Keyboard interrupt received")
-                break
-            except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(60)
         
+        self.shutdown()
         logger.info("Scheduler stopped")
 
 
@@ -206,26 +491,13 @@ def validate_config(config: dict) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    required_keys = [
-        'SMTP_SERVER', 'SMTP_PORT', 'SENDER_EMAIL', 
-        'SENDER_PASSWORD', 'RECIPIENT_EMAILS'
-    ]
-    
-    # Check if at least one API key is configured
-    has_news_api = config.get('NEWS_API_KEY') and config.get('NEWS_API_KEY') != 'your_api_key_here'
-    has_newsdata_api = config.get('NEWSDATA_API_KEY') and config.get('NEWSDATA_API_KEY') != 'your_newsdata_io_api_key_here'
-    
-    if not has_news_api and not has_newsdata_api:
-        logger.error("No API key configured! Please set NEWS_API_KEY or NEWSDATA_API_KEY")
-        return False
+    settings = config if isinstance(config, Settings) else Settings(config)
+    errors = settings.validate()
     
-    # Check email configuration
-    for key in required_keys:
-        if not config.get(key):
-            logger.error(f"Missing required configuration: {key}")
-            return False
+    for error in errors:
+        logger.error(error)
     
-    return True
+    return not errors
 
 
 def main():
@@ -240,7 +512,8 @@ def main():
     try:
         # Load configuration
         logger.info("Loading configuration...")
-        config = load_config()
+        config_service = ConfigService()
+        config = config_service.get()
         
         # Validate configuration
         if not validate_config(config):
@@ -251,7 +524,7 @@ def main():
         logger.info("✅ Configuration loaded and validated")
         
         # Create and run scheduler
-        scheduler = NewsScheduler(config)
+        scheduler = NewsScheduler(config, config_service)
         scheduler.run()
         
     except KeyboardInterrupt:
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+JSON Decode Benchmark
+Compares response.json() plus full-copy normalization with the fast decode and field projection
+
+Usage:
+    python scripts/benchmark_json_decode.py [recorded_response.json ...]
+
+Without arguments, NewsAPI-shaped responses (100 articles per page, with
+full 'content' and the usual extra fields) are generated.
+"""
+
+import gc
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import fast_json
+from src.fetchers.newsapi_fetcher import normalize_article
+from src.fetchers.text_normalizer import cache_clear, normalize_text
+
+# Set stdout encoding to UTF-8 for Windows compatibility
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+PAGES = 200
+ARTICLES_PER_PAGE = 100
+
+# Timings are the best of this many runs
+REPEAT = 3
+
+WORDS = ('India government minister Delhi Mumbai market cricket election court monsoon '
+         'policy startup rupee budget state police farmers report').split()
+
+# One article in ten is in Hindi
+HINDI_WORDS = 'सरकार मंत्री दिल्ली चुनाव अदालत बाजार क्रिकेट किसान'.split()
+
+
+class RecordedResponse:
+    """The parts of a requests.Response the decoders use"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def json(self):
+        # What requests does: decode the body to text, then parse it
+        return json.loads(self.content.decode('utf-8'))
+
+
+def make_article(rng: random.Random) -> dict:
+    vocabulary = HINDI_WORDS if rng.random() < 0.1 else WORDS
+
+    def words(low, high):
+        return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(low, high)))
+
+    return {
+        'source': {'id': f"source-{rng.randint(1, 50)}", 'name': words(1, 3)},
+        'author': words(2, 4),
+        'title': words(8, 16),
+        'description': f"<p>{words(25, 60)}</p>",
+        'url': f"https://example.com/news/{rng.getrandbits(48):x}?utm_source=feed",
+        'urlToImage': f"https://cdn.example.com/img/{rng.getrandbits(48):x}.jpg",
+        'publishedAt': f"2024-05-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+        'content': words(300, 600) + ' [+3200 chars]',
+    }
+
+
+def make_response(rng: random.Random) -> bytes:
+    articles = [make_article(rng) for _ in range(ARTICLES_PER_PAGE)]
+    return json.dumps({'status': 'ok', 'totalResults': 10000, 'articles': articles},
+                      ensure_ascii=False).encode('utf-8')
+
+
+def legacy_normalize(article):
+    """normalize_article as it was: a full copy of the decoded article"""
+    title = normalize_text(article.get('title'))
+    if not title or title.startswith('Google News'):
+        return None
+    normalized = dict(article)
+    normalized['title'] = title
+    normalized['description'] = normalize_text(article.get('description'))
+    normalized['source'] = article.get('source') or {'name': 'Unknown'}
+    return normalized
+
+
+def legacy_page(response):
+    data = response.json()
+    return [article for article in map(legacy_normalize, data.get('articles') or []) if article]
+
+
+def projected_page(response):
+    data = fast_json.decode_response(response)
+    return [article for article in map(normalize_article, data.get('articles') or []) if article]
+
+
+def decode_all(decode_page, responses):
+    # Articles from every page are kept, as the fetch cache and digest do
+    cache_clear()
+    return [article for response in responses for article in decode_page(response)]
+
+
+def run(label, decode_page, responses, baseline=None):
+    elapsed = float('inf')
+    for _ in range(REPEAT):
+        gc.collect()
+        started = time.perf_counter()
+        kept = decode_all(decode_page, responses)
+        elapsed = min(elapsed, time.perf_counter() - started)
+        del kept
+
+    gc.collect()
+    tracemalloc.start()
+    kept = decode_all(decode_page, responses)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    speedup = f"  speedup {baseline / elapsed:4.1f}x" if baseline else ''
+    print(f"  {label:<30} {elapsed:6.2f}s  peak {peak / 2**20:7.1f} MB  "
+          f"retained {retained / 2**20:7.1f} MB{speedup}")
+    return elapsed
+
+
+def main():
+    if len(sys.argv) > 1:
+        responses = []
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                responses.append(RecordedResponse(f.read()))
+    else:
+        rng = random.Random(42)
+        responses = [RecordedResponse(make_response(rng)) for _ in range(PAGES)]
+    size = sum(len(response.content) for response in responses)
+
+    print("=" * 78)
+    print(f"  JSON decode + normalize: {len(responses)} responses, {size / 2**20:.1f} MB")
+    print("=" * 78)
+
+    baseline = run("response.json() + full copy", legacy_page, responses)
+    if fast_json.orjson is not None:
+        run("orjson + projection", projected_page, responses, baseline)
+        fast_json.orjson = None
+    else:
+        print("  (orjson not installed; pip install orjson for the fast backend)")
+    run("stdlib bytes + projection", projected_page, responses, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Recipient Profiles Benchmark
+Times ranking 10k recipient profiles over one shared fetch against the 1 second target
+
+Usage:
+    python scripts/benchmark_recipient_profiles.py [profile count]
+
+Exits with status 1 when grouping the recipients takes longer than the target.
+"""
+
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.recipient_profiles import ArticleIndex, RecipientProfile
+
+# Set stdout encoding to UTF-8 for Windows compatibility
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+PROFILES = 10_000
+ARTICLES = 300
+
+# Seconds for building the index and ranking every profile
+TARGET = 1.0
+
+# Timings are the best of this many runs
+REPEAT = 5
+
+CATEGORIES = ('top business sports technology entertainment politics health science '
+              'world environment').split()
+
+WORDS = ('India government minister Delhi Mumbai Bengaluru Chennai market cricket election '
+         'court monsoon policy startup rupee budget state police farmers report Sensex '
+         'Nifty Parliament railway airport inflation exports hospital students flood').split()
+
+PHRASES = ['Supreme Court', 'stock market', 'Lok Sabha', 'climate change', 'World Cup',
+           'interest rates', 'electric vehicles', 'artificial intelligence']
+
+
+def make_articles(rng: random.Random):
+    """Half NewsData.io-shaped (with categories), half NewsAPI-shaped (without)"""
+    articles = []
+    for i in range(ARTICLES):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(30, 60))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(CATEGORIES))
+        article = {'title': ' '.join(words[:12]), 'description': ' '.join(words[12:])}
+        if i % 2 == 0:
+            article['category'] = rng.sample(CATEGORIES, rng.randint(1, 2))
+        articles.append(article)
+    return articles
+
+
+def make_profiles(rng: random.Random, count: int):
+    """Mostly distinct tastes: a few categories and keywords each"""
+    profiles = []
+    for i in range(count):
+        keywords = [rng.choice(WORDS) for _ in range(rng.randint(0, 3))]
+        if rng.random() < 0.3:
+            keywords.append(rng.choice(PHRASES))
+        profiles.append(RecipientProfile(
+            f"reader{i}@example.com",
+            categories=rng.sample(CATEGORIES, rng.randint(0, 3)),
+            keywords=keywords,
+            max_articles=rng.choice((10, 15, 20, 25)),
+        ))
+    return profiles
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PROFILES
+    rng = random.Random(42)
+    articles = make_articles(rng)
+    profiles = make_profiles(rng, count)
+    signatures = len({profile.signature for profile in profiles})
+
+    print("=" * 70)
+    print(f"  Recipient profiles: {count:,} profiles ({signatures:,} distinct), {ARTICLES} articles")
+    print("=" * 70)
+
+    elapsed = float('inf')
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        groups = ArticleIndex(articles).group_recipients(profiles)
+        elapsed = min(elapsed, time.perf_counter() - started)
+
+    recipients = sum(len(emails) for _, emails in groups)
+    print(f"  index + ranking  {elapsed * 1000:8.1f} ms  ({elapsed / count * 1e6:.1f} µs/profile)")
+    print(f"  {len(groups):,} digests for {recipients:,} recipients "
+          f"({count - recipients:,} matched nothing)")
+
+    if elapsed > TARGET:
+        print(f"\n❌ Over the {TARGET:.1f}s target")
+        sys.exit(1)
+    print(f"\n✅ Within the {TARGET:.1f}s target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Summarizer Benchmark
+Times batch summarization of a run's worth of articles, cold and cached
+"""
+
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import summarizer
+from src.fetchers.summarizer import cache_info, summarize_articles
+
+# Set stdout encoding to UTF-8 for Windows compatibility
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+COUNT = 300
+
+WORDS = ('India government minister Delhi Mumbai market cricket election court monsoon '
+         'policy startup rupee budget state police farmers report Supreme Court opposition '
+         'Parliament infrastructure railway airport inflation exports investment technology '
+         'hospital students university rainfall flood district officials announced crore '
+         'said on Monday Tuesday according to statement the of and in a for with').split()
+
+
+def make_article(rng):
+    """Description-length or extracted-body-length text (5-40 sentences)"""
+    sentences = []
+    for _ in range(rng.randint(5, 40)):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 30))]
+        sentences.append(' '.join(words).capitalize() + rng.choice('..!?'))
+    return {'body': ' '.join(sentences)}
+
+
+def main():
+    rng = random.Random(42)
+    articles = [make_article(rng) for _ in range(COUNT)]
+
+    print("=" * 70)
+    print(f"  Summarizer benchmark ({COUNT} articles, numpy: {summarizer.np is not None})")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    summarize_articles(articles)
+    cold = time.perf_counter() - started
+    print(f"  cold batch    {cold * 1000:8.1f} ms")
+
+    # The same articles rendered again (console, dashboard, email)
+    started = time.perf_counter()
+    summarize_articles(articles)
+    warm = time.perf_counter() - started
+    print(f"  cached batch  {warm * 1000:8.1f} ms")
+    print(f"  cache: {cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
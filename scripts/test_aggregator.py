@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the fetch aggregator: concurrent fetchers, timeouts and merging
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers.registry import NewsFetcher
+from src.services.aggregator import FetchAggregator, merge_articles, normalize_article
+from src.services.provider_health import ProviderHealth
+
+
+class FakeFetcher(NewsFetcher):
+    """Returns fixed articles, optionally after a delay or by raising"""
+
+    def __init__(self, name, articles=(), delay=0.0, error=None, timeout=5.0):
+        super().__init__({})
+        self.name = name
+        self.articles = list(articles)
+        self.delay = delay
+        self.error = error
+        self.timeout = timeout
+        self.calls = 0
+        self.release = threading.Event()
+
+    def fetch(self, max_articles, deadline):
+        self.calls += 1
+        if self.delay:
+            self.release.wait(self.delay)
+        if self.error:
+            raise self.error
+        return self.articles
+
+
+def story(title, url):
+    return {'title': title, 'url': url}
+
+
+class TestMergeArticles(unittest.TestCase):
+
+    def test_round_robin_without_duplicates(self):
+        first = [story('A', 'https://a.com/1'), story('B', 'https://a.com/2')]
+        second = [story('a ', 'https://b.com/1'), story('C', 'https://www.a.com/2?utm_source=x'),
+                  story('D', 'https://b.com/3')]
+        merged = merge_articles([first, second], max_articles=10)
+        self.assertEqual([a['title'] for a in merged], ['A', 'B', 'D'])
+
+    def test_newsdata_fields_are_mapped(self):
+        article = normalize_article({'title': ' Budget  2026 ', 'link': 'https://n.com/1',
+                                     'pubDate': '2026-02-01 06:00:00', 'source_id': 'thehindu',
+                                     'image_url': 'https://img.n.com/1.jpg'}, 'newsdata')
+        self.assertEqual(article['title'], 'Budget 2026')
+        self.assertEqual((article['url'], article['publishedAt']), ('https://n.com/1', '2026-02-01 06:00:00'))
+        self.assertEqual(article['source'], {'name': 'thehindu'})
+        self.assertEqual(article['provider'], 'newsdata')
+        self.assertIsNone(normalize_article({'title': '  '}, 'newsdata'))
+
+
+class TestFetchAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.health = ProviderHealth(breaker_options={'min_calls': 1, 'failure_rate': 1.0})
+
+    def test_results_are_merged_in_preference_order(self):
+        rss = FakeFetcher('rss', [story('Feed story', 'https://f.com/1')])
+        newsapi = FakeFetcher('newsapi', [story('API story', 'https://a.com/1')])
+        articles, source = FetchAggregator([newsapi, rss], self.health).fetch_news()
+        self.assertEqual(source, 'newsapi+rss')
+        self.assertEqual([a['title'] for a in articles], ['API story', 'Feed story'])
+
+    def test_failed_fetcher_is_left_out_and_recorded(self):
+        broken = FakeFetcher('newsapi', error=RuntimeError('401'))
+        rss = FakeFetcher('rss', [story('Feed story', 'https://f.com/1')])
+        aggregator = FetchAggregator([broken, rss], self.health)
+        with self.assertLogs('src.services.aggregator', 'WARNING'):
+            self.assertEqual(aggregator.fetch_news()[1], 'rss')
+        # The breaker opened: the next run does not call it
+        aggregator.fetch_news()
+        self.assertEqual(broken.calls, 1)
+
+    def test_slow_fetcher_does_not_delay_the_run(self):
+        slow = FakeFetcher('newsapi', [story('Late', 'https://a.com/1')], delay=5, timeout=0.2)
+        rss = FakeFetcher('rss', [story('Feed story', 'https://f.com/1')])
+        started = time.monotonic()
+        try:
+            with self.assertLogs('src.services.aggregator', 'WARNING'):
+                articles, source = FetchAggregator([slow, rss], self.health).fetch_news()
+        finally:
+            slow.release.set()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(source, 'rss')
+
+    def test_quota_skips_a_fetcher(self):
+        newsapi = FakeFetcher('newsapi', [story('API story', 'https://a.com/1')])
+        newsapi.requests_per_fetch = 5
+        self.health.count_requests('newsapi', 98)
+        aggregator = FetchAggregator([newsapi], self.health, quotas={'newsapi': 100})
+        with self.assertLogs('src.services.aggregator', 'WARNING'):
+            self.assertEqual(aggregator.fetch_news(), ([], 'none'))
+        self.assertEqual(newsapi.calls, 0)
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the fetch aggregator...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestMergeArticles))
+    suite.addTests(loader.loadTestsFromTestCase(TestFetchAggregator))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for the article extractor, against a local HTTP stand-in
+"""
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers.article_extractor import ArticleExtractor, BodyCache, decode_page, extract_main_text
+from src.fetchers.rate_limiter import rate_limiters
+from src.fetchers.urls import canonical_url
+
+PARAGRAPH = ("The monsoon reached Kerala on Thursday, two days ahead of schedule, the India "
+             "Meteorological Department said, bringing relief to farmers across the state.")
+
+ARTICLE_PAGE = f'''<html><head><title>Monsoon</title><script>var x = 1;</script></head>
+<body>
+  <nav><a href="/">Home</a> <a href="/india">India</a></nav>
+  <div class="share-tools"><p>Share this story on social media and with your friends today.</p></div>
+  <article class="story-content">
+    <p>{PARAGRAPH}</p>
+    <p>{PARAGRAPH} Sowing of kharif crops is expected to pick up next week.</p>
+  </article>
+  <footer><p>Copyright 2024 Example News. All rights reserved.</p></footer>
+</body></html>'''
+
+HINDI = "नई दिल्ली: मानसून ने गुरुवार को केरल में दस्तक दी, किसानों को “बड़ी राहत” मिली है।"
+
+# Served as plain text/html, which requests reads as ISO-8859-1
+UTF8_PAGE = f'''<html><body><article><p>{HINDI}</p><p>{PARAGRAPH}</p></article></body></html>'''
+
+LEGACY_PAGE = f'''<html><head><meta http-equiv="Content-Type" content="text/html; charset=windows-1252">
+</head><body><article><p>“Café owners” in Mumbai said {PARAGRAPH}</p></article></body></html>'''
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves an article, a page cut off mid-stream and pages with odd headers"""
+
+    def do_GET(self):
+        if self.path.startswith('/article'):
+            self._send(ARTICLE_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+        elif self.path.startswith('/unknown-charset'):
+            self._send(ARTICLE_PAGE.encode('utf-8'), 'text/html; charset=x-no-such-charset')
+        elif self.path.startswith('/no-charset'):
+            self._send(UTF8_PAGE.encode('utf-8'), 'text/html')
+        elif self.path.startswith('/meta-charset'):
+            self._send(LEGACY_PAGE.encode('cp1252'), 'text/html')
+        elif self.path.startswith('/image'):
+            self._send(b'\x89PNG\r\n', 'image/png')
+        elif self.path.startswith('/truncated'):
+            # Chunked response whose connection drops before the last chunk
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b'400\r\n<html><body><p>' + b'x' * 100)
+            self.wfile.flush()
+            self.close_connection = True
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestArticleExtractor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Every test page is on one host; lift the per-site page limit
+        rate_limiters.configure({'ARTICLE_RATE_LIMIT': '100/s,100'})
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        rate_limiters.configure({})
+
+    def setUp(self):
+        self.extractor = ArticleExtractor(BodyCache(None), timeout=5)
+
+    def test_extract_main_text(self):
+        """The article paragraphs are kept; navigation, share tools and footer are not"""
+        text = extract_main_text(ARTICLE_PAGE)
+        self.assertIn('monsoon reached Kerala', text)
+        self.assertIn('kharif crops', text)
+        self.assertNotIn('Share this story', text)
+        self.assertNotIn('Copyright', text)
+        self.assertNotIn('var x', text)
+
+    def test_enrich_fills_body_and_placeholder_description(self):
+        articles = [
+            {'url': f"{self.base}/article/1", 'description': 'No description available.'},
+            {'url': f"{self.base}/article/1?utm_source=feed", 'description': 'Kept as is'},
+        ]
+        self.extractor.enrich(articles)
+        self.assertIn('monsoon reached Kerala', articles[0]['body'])
+        self.assertTrue(articles[0]['description'].startswith('The monsoon'))
+        self.assertEqual(articles[1]['description'], 'Kept as is')
+        self.assertEqual(articles[0]['body'], articles[1]['body'])
+
+    def test_failed_pages_do_not_break_the_batch(self):
+        """A dropped connection, an unknown charset, a 404 or an image only affect their own article"""
+        articles = [
+            {'url': f"{self.base}/truncated"},
+            {'url': f"{self.base}/unknown-charset"},
+            {'url': f"{self.base}/missing"},
+            {'url': f"{self.base}/image"},
+            {'url': f"{self.base}/article/2"},
+        ]
+        self.extractor.enrich(articles)
+        self.assertNotIn('body', articles[0])
+        self.assertIn('monsoon reached Kerala', articles[1]['body'])
+        self.assertNotIn('body', articles[2])
+        self.assertNotIn('body', articles[3])
+        self.assertIn('monsoon reached Kerala', articles[4]['body'])
+
+    def test_charset_without_a_header_declaration(self):
+        """text/html with no charset is not read as ISO-8859-1; a <meta> charset is honoured"""
+        articles = [{'url': f"{self.base}/no-charset"}, {'url': f"{self.base}/meta-charset"}]
+        self.extractor.enrich(articles)
+        self.assertIn(HINDI, articles[0]['body'])
+        self.assertIn('“Café owners” in Mumbai', articles[1]['body'])
+
+    def test_decode_page(self):
+        # The header wins over the page
+        text = 'Rupee “slips” – 83'
+        self.assertEqual(decode_page(text.encode('cp1252'), 'text/html; charset="windows-1252"'), text)
+        text = 'Rupee “slips” – ₹83'
+        # Unknown declared charsets fall through to UTF-8
+        self.assertEqual(decode_page(text.encode('utf-8'), 'text/html; charset=x-unknown'), text)
+        # A multi-byte character cut off at the size limit is dropped
+        self.assertEqual(decode_page(text.encode('utf-8')[:-1], 'text/html'), text[:-1])
+        # Neither declared nor UTF-8: guessed from the content (a single-byte
+        # encoding, whose exact choice is up to the detector)
+        page = ('<p>' + 'Crème brûlée à la café, ' * 20 + '</p>').encode('latin-1')
+        text = decode_page(page, 'text/html')
+        self.assertIn('Cr', text)
+        self.assertNotIn('\ufffd', text)
+
+    def test_failures_are_cached(self):
+        url = f"{self.base}/missing/again"
+        self.assertEqual(self.extractor.body(url), '')
+        self.assertEqual(self.extractor.cache.get(canonical_url(url))['body'], '')
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the article extractor...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestArticleExtractor)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
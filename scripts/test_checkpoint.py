@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the send checkpoint used to resume interrupted slots
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.checkpoint import SendCheckpoint
+from src.services.prefetch import PreparedDigest
+
+
+def digest(slot='07:00', groups=3):
+    return PreparedDigest(
+        slot, 'newsapi',
+        [([{'title': f"Story {i}"}], [f"reader{i}@example.com"]) for i in range(groups)],
+        groups
+    )
+
+
+class TestSendCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'state', 'send_checkpoint.json')
+        self.checkpoint = SendCheckpoint(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resume_after_an_interruption(self):
+        created_at = time.time()
+        self.checkpoint.begin(digest(), set(), created_at)
+        self.checkpoint.mark_sent(0)
+        self.checkpoint.mark_sent(2)
+
+        restored, sent, restored_at = SendCheckpoint(self.path).load()
+        self.assertEqual(restored.slot, '07:00')
+        self.assertEqual(restored.groups[1], ([{'title': 'Story 1'}], ['reader1@example.com']))
+        self.assertEqual(sent, {0, 2})
+        self.assertEqual(restored_at, created_at)
+
+    def test_resuming_keeps_the_sent_log(self):
+        created_at = time.time()
+        self.checkpoint.begin(digest(), set(), created_at)
+        self.checkpoint.mark_sent(0)
+        restored, sent, _ = self.checkpoint.load()
+        self.checkpoint.begin(restored, sent, created_at)
+        self.checkpoint.mark_sent(1)
+        self.assertEqual(self.checkpoint.load()[1], {0, 1})
+
+    def test_partial_line_is_ignored(self):
+        created_at = time.time()
+        self.checkpoint.begin(digest(), set(), created_at)
+        self.checkpoint.mark_sent(1)
+        with open(self.checkpoint.sent_path, 'a', encoding='utf-8') as f:
+            f.write('2')
+        self.assertEqual(self.checkpoint.load()[1], {1})
+
+    def test_sent_log_of_another_digest_is_ignored(self):
+        self.checkpoint.begin(digest(), set(), 1000.0)
+        self.checkpoint.mark_sent(0)
+        sent_log = self.checkpoint.sent_path.read_text(encoding='utf-8')
+        self.checkpoint.begin(digest(), set(), time.time())
+        self.checkpoint.sent_path.write_text(sent_log, encoding='utf-8')
+        self.assertEqual(self.checkpoint.load()[1], set())
+
+    def test_old_checkpoint_is_not_resumed(self):
+        self.checkpoint.max_age = 60
+        self.checkpoint.begin(digest(), set(), time.time() - 120)
+        self.assertIsNone(self.checkpoint.load())
+        self.assertFalse(self.checkpoint.path.exists())
+        self.assertFalse(self.checkpoint.sent_path.exists())
+
+    def test_unreadable_checkpoint_is_cleared(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"slot": ')
+        self.assertIsNone(self.checkpoint.load())
+        self.assertFalse(self.checkpoint.path.exists())
+
+    def test_overwriting_an_unfinished_send_is_logged(self):
+        self.checkpoint.begin(digest('07:00'), set(), time.time() - 10)
+        self.checkpoint.mark_sent(0)
+        with self.assertLogs('src.services.checkpoint', 'WARNING') as logs:
+            self.checkpoint.begin(digest('13:00'), set(), time.time())
+        self.assertIn('slot 07:00 (2 email(s) not sent)', logs.output[0])
+
+    def test_clear(self):
+        self.checkpoint.begin(digest(), set(), time.time())
+        self.checkpoint.mark_sent(0)
+        self.checkpoint.clear()
+        self.assertIsNone(self.checkpoint.load())
+        self.assertFalse(self.checkpoint.sent_path.exists())
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the send checkpoint...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestSendCheckpoint)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
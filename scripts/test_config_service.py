@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached, hot-reloadable configuration service
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.config_service import ConfigService
+
+VALID_CONFIG = {
+    'NEWS_API_KEY': 'abc123',
+    'SMTP_SERVER': 'smtp.gmail.com',
+    'SMTP_PORT': '587',
+    'SENDER_EMAIL': 'sender@example.com',
+    'SENDER_PASSWORD': 'abcd efgh ijkl mnop',
+    'RECIPIENT_EMAILS': 'one@example.com, two@example.com',
+    'SCHEDULE_TIMES': '07:00,19:00',
+}
+
+
+class TestConfigService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'config.txt')
+        self.writes = 0
+        self.write(VALID_CONFIG)
+        self.service = ConfigService(paths=[self.path], environ={})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, values, **changes):
+        values = dict(values, **changes)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('# Test configuration\n\n')
+            for key, value in values.items():
+                f.write(f"{key}={value}\n")
+        # Distinct mtime for every write, however fast the test runs
+        self.writes += 1
+        os.utime(self.path, ns=(self.writes * 10 ** 9, self.writes * 10 ** 9))
+
+    def test_typed_settings(self):
+        settings = self.service.get()
+        self.assertEqual(settings.smtp_port, 587)
+        self.assertEqual(settings.sender_password, 'abcdefghijklmnop')
+        self.assertEqual(settings.recipient_emails, ['one@example.com', 'two@example.com'])
+        self.assertEqual(settings.validate(), [])
+
+    def test_file_is_parsed_once(self):
+        self.assertIs(self.service.get(), self.service.get())
+        self.assertEqual(self.service.reload_if_changed(), set())
+
+    def test_environment_overrides_the_file(self):
+        service = ConfigService(paths=[self.path], environ={'SMTP_PORT': '465', 'MAX_ARTICLES': '10'})
+        self.assertEqual(service.get().smtp_port, 465)
+        self.assertEqual(service.get()['MAX_ARTICLES'], '10')
+
+    def test_placeholders_count_as_unset(self):
+        self.write(VALID_CONFIG, NEWS_API_KEY='your_newsapi_key_here')
+        settings = ConfigService(paths=[self.path], environ={}).get()
+        self.assertIsNone(settings.news_api_key)
+        self.assertIn('No API key configured', settings.validate()[0])
+
+    def test_subscribers_hear_only_their_keys(self):
+        heard = []
+        self.service.get()
+        self.service.subscribe(['SCHEDULE_TIMES'], lambda settings, changed: heard.append(('schedule', changed)))
+        self.service.subscribe(['SMTP_SERVER'], lambda settings, changed: heard.append(('email', changed)))
+        self.write(VALID_CONFIG, SCHEDULE_TIMES='08:00')
+        self.assertEqual(self.service.reload_if_changed(), {'SCHEDULE_TIMES'})
+        self.assertEqual(heard, [('schedule', {'SCHEDULE_TIMES'})])
+        self.assertEqual(self.service.get().schedule_times, '08:00')
+
+    def test_invalid_change_is_rejected(self):
+        self.service.get()
+        bad_values = {'SMTP_PORT': 'smtp', 'SCHEDULE_TIMES': '25:00', 'MISFIRE_POLICY': 'sometimes',
+                      'RECIPIENT_EMAILS': 'not-an-address', 'JOB_TIMEOUT_MINUTES': '-5'}
+        for key, value in bad_values.items():
+            with self.subTest(key=key):
+                self.write(VALID_CONFIG, **{key: value})
+                with self.assertLogs('src.services.config_service', 'ERROR'):
+                    self.assertEqual(self.service.reload_if_changed(), set())
+                self.assertEqual(self.service.get().get(key), VALID_CONFIG.get(key))
+
+    def test_failing_subscriber_does_not_block_the_others(self):
+        heard = []
+
+        def failing(settings, changed):
+            raise RuntimeError('boom')
+
+        self.service.get()
+        self.service.subscribe(['MAX_ARTICLES'], failing)
+        self.service.subscribe(['MAX_ARTICLES'], lambda settings, changed: heard.append(changed))
+        self.write(VALID_CONFIG, MAX_ARTICLES='12')
+        with self.assertLogs('src.services.config_service', 'ERROR'):
+            self.service.reload_if_changed()
+        self.assertEqual(heard, [{'MAX_ARTICLES'}])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the configuration service...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestConfigService)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
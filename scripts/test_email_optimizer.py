@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for the email payload optimizer and its text/plain alternative
+"""
+
+import os
+import re
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.email_optimizer import (
+    EmailSender, OptimizedEmailSender, build_plain_text, optimize_html
+)
+
+SMTP_SETTINGS = ('smtp.example.com', 587, 'digest@example.com', 'secret')
+
+ARTICLES = [
+    {'title': 'Sensex closes higher', 'source': {'name': 'Mint'},
+     'description': 'Banks lead the rally. ' * 30, 'url': 'https://example.com/sensex',
+     'content': 'Full text ' * 100},
+    {'title': 'Monsoon reaches Kerala', 'source': {'name': 'The Hindu'},
+     'description': 'Farmers relieved.', 'url': 'https://example.com/monsoon'},
+]
+
+# A template that already uses short class names of its own
+TEMPLATE = """<html><head><style>.s0{color:red}</style></head><body>
+  <div class="s0" style="padding: 4px; margin:0">
+    <b>Top</b> <a href="#">stories</a>
+  </div>
+  <div style="padding:4px;margin:0">Second</div>
+  <p class="s1" style="font-size:12px">Third</p>
+  <p style="font-size: 12px">Fourth</p>
+</body></html>"""
+
+
+def render(articles, api_source):
+    """Stand-in for the EmailSender template"""
+    items = ''.join(f'<div style="padding:4px">{a["title"]}: {a["description"]}</div>' for a in articles)
+    return f"<html><head></head><body>{items}</body></html>"
+
+
+def styles_by_element(content):
+    """Effective declarations for each element, from inline styles and the <style> block"""
+    rules = dict(re.findall(r'\.([\w-]+)\{([^}]*)\}', ''.join(re.findall(r'<style>(.*?)</style>', content))))
+    elements = []
+    for attrs in re.findall(r'<(?:div|p)([^>]*)>', content):
+        classes = re.search(r'class="([^"]*)"', attrs)
+        inline = re.search(r'style="([^"]*)"', attrs)
+        declarations = [rules[name] for name in (classes.group(1).split() if classes else []) if name in rules]
+        if inline:
+            declarations.append(inline.group(1))
+        elements.append(';'.join(declarations).replace(' ', ''))
+    return elements
+
+
+class TestOptimizeHtml(unittest.TestCase):
+
+    def test_rendered_styles_are_unchanged(self):
+        content, report = optimize_html(TEMPLATE)
+        self.assertEqual(report.shared_styles, 2)
+        self.assertEqual(styles_by_element(content), [
+            'color:red;padding:4px;margin:0', 'padding:4px;margin:0',
+            'font-size:12px', 'font-size:12px',
+        ])
+
+    def test_shared_classes_do_not_collide_with_the_template(self):
+        content, _ = optimize_html(TEMPLATE)
+        generated = re.findall(r'\.([\w-]+)\{', content.split('</style>', 1)[1])
+        self.assertEqual(len(generated), 2)
+        for name in generated:
+            self.assertNotIn(name, TEMPLATE)
+            self.assertNotIn(name, ('s0', 's1'))
+        # The template's own rule still matches its own element only
+        self.assertIn('.s0{color:red}', content)
+
+    def test_spaces_between_inline_elements_are_kept(self):
+        content, _ = optimize_html(TEMPLATE)
+        self.assertIn('<b>Top</b> <a href="#">stories</a>', content)
+
+    def test_output_is_smaller(self):
+        content, report = optimize_html(TEMPLATE)
+        self.assertLess(report.optimized_bytes, report.original_bytes)
+        self.assertEqual(report.optimized_bytes, len(content.encode('utf-8')))
+
+
+@patch.object(EmailSender, '_create_html_email', side_effect=render, create=True)
+class TestOptimizedEmailSender(unittest.TestCase):
+
+    def sender(self, **kwargs):
+        return OptimizedEmailSender(*SMTP_SETTINGS, ['a@example.com', 'b@example.com'], **kwargs)
+
+    def test_template_output_is_optimized(self, _):
+        sender = self.sender()
+        content = sender._create_html_email(ARTICLES, 'NewsAPI')
+        self.assertIn('<style>', content)
+        self.assertEqual(sender.last_report.shared_styles, 1)
+
+    def test_without_plain_text_the_base_sender_sends(self, _):
+        with patch.object(EmailSender, 'send_news_email', return_value=True, create=True) as send:
+            self.assertTrue(self.sender().send_news_email(ARTICLES, 'NewsAPI'))
+        articles, api_source = send.call_args[0]
+        self.assertEqual(api_source, 'NewsAPI')
+        self.assertNotIn('content', articles[0])
+        self.assertLessEqual(len(articles[0]['description']), 220)
+
+    def test_plain_text_alternative(self, _):
+        message = self.sender(plain_text=True).build_message(ARTICLES, 'NewsAPI')
+        self.assertEqual(message.get_content_type(), 'multipart/alternative')
+        parts = message.get_payload()
+        self.assertEqual([part.get_content_type() for part in parts], ['text/plain', 'text/html'])
+        text = parts[0].get_payload(decode=True).decode('utf-8')
+        self.assertIn('1. Sensex closes higher (Mint)', text)
+        self.assertIn('https://example.com/monsoon', text)
+        self.assertEqual(message['To'], 'a@example.com, b@example.com')
+
+    def test_plain_text_message_is_sent(self, _):
+        with patch('smtplib.SMTP') as smtp:
+            self.assertTrue(self.sender(plain_text=True).send_news_email(ARTICLES, 'NewsAPI'))
+        connection = smtp.return_value
+        connection.starttls.assert_called_once_with()
+        connection.login.assert_called_once_with('digest@example.com', 'secret')
+        message, sender, recipients = connection.send_message.call_args[0]
+        self.assertEqual(recipients, ['a@example.com', 'b@example.com'])
+        # Descriptions were compacted before rendering
+        self.assertNotIn('Full text', message.as_string())
+
+    def test_smtp_failure_is_reported(self, _):
+        with patch('smtplib.SMTP', side_effect=OSError('unreachable')):
+            self.assertFalse(self.sender(plain_text=True).send_news_email(ARTICLES, 'NewsAPI'))
+
+    def test_build_plain_text(self, _):
+        text = build_plain_text(ARTICLES[1:], 'RSS')
+        self.assertTrue(text.startswith('Indian News Update (1 stories, via RSS)'))
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the email payload optimizer...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestOptimizeHtml))
+    suite.addTests(loader.loadTestsFromTestCase(TestOptimizedEmailSender))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
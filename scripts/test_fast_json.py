@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for fast JSON decoding and field projection
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import fast_json
+from src.fetchers.fast_json import decode_response, loads, project, project_list
+
+BODY = '{"status": "ok", "articles": [{"title": "Sensex at record high ₹", "content": "x", "url": "https://a.com"}]}'
+
+
+class TestFastJson(unittest.TestCase):
+
+    def test_bytes_and_text_decode_alike(self):
+        self.assertEqual(loads(BODY.encode('utf-8')), loads(BODY))
+        self.assertEqual(decode_response(Mock(content=BODY.encode('utf-8')))['status'], 'ok')
+
+    def test_standard_library_fallback(self):
+        with patch.object(fast_json, 'orjson', None):
+            self.assertEqual(loads(BODY.encode('utf-8')), loads(BODY))
+            with self.assertRaises(ValueError):
+                loads(b'{"status": ')
+
+    def test_invalid_json_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            loads(b'<html>Service Unavailable</html>')
+
+    def test_projection_keeps_only_present_fields(self):
+        article = loads(BODY)['articles'][0]
+        self.assertEqual(project(article, ('title', 'url', 'urlToImage')),
+                         {'title': 'Sensex at record high ₹', 'url': 'https://a.com'})
+        self.assertEqual(project(None, ('title',)), {})
+
+    def test_list_projection_skips_non_objects(self):
+        items = [{'title': 'A', 'content': 'x'}, None, 'junk', {'title': 'B'}]
+        self.assertEqual(project_list(items, iter(['title'])), [{'title': 'A'}, {'title': 'B'}])
+        self.assertEqual(project_list(None, ('title',)), [])
+
+
+def run_tests():
+    """Run all tests"""
+    print(f"Running tests for fast JSON ({fast_json.BACKEND})...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestFastJson)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the image cache: storage, LRU eviction and failed images
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import image_cache
+from src.fetchers.image_cache import ImageCache, Image
+
+
+def png_bytes(size=(640, 360)) -> bytes:
+    output = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(output, 'PNG')
+    return output.getvalue()
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ImageCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lru_eviction(self):
+        self.cache.max_bytes = 25
+        names = [self.cache._store(bytes([i]) * 10, 'jpg') for i in range(3)]
+        for age, name in enumerate(names):
+            self.cache._files[name][1] = 1000 + age
+            self.cache._sources[f"https://example.com/{age}.jpg"] = {'files': {'jpeg': name}, 'at': 0}
+        # The oldest image was used most recently
+        self.cache._files[names[0]][1] = 2000
+
+        self.cache.evict()
+
+        self.assertEqual(sorted(self.cache._files), sorted([names[0], names[2]]))
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, names[1])))
+        self.assertNotIn("https://example.com/1.jpg", self.cache._sources)
+        self.assertIn("https://example.com/0.jpg", self.cache._sources)
+
+    def test_index_survives_a_restart(self):
+        name = self.cache._store(b'x' * 10, 'jpg')
+        self.cache._sources['https://example.com/a.jpg'] = {'files': {'jpeg': name}, 'at': 0}
+        self.cache.save()
+        reloaded = ImageCache(self.directory.name)
+        self.assertEqual(reloaded.get('https://example.com/a.jpg'), {'jpeg': name})
+
+    def test_identical_images_stored_concurrently(self):
+        errors = []
+
+        def store():
+            try:
+                for _ in range(50):
+                    self.cache._store(b'placeholder' * 1000, 'jpg')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=store) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual([name for name in os.listdir(self.directory.name) if name.endswith('.tmp')], [])
+
+    def test_unwritable_directory_fails_the_image(self):
+        blocked = os.path.join(self.directory.name, 'blocked')
+        with open(blocked, 'w') as f:
+            f.write('not a directory')
+        cache = ImageCache(blocked)
+        data = png_bytes() if Image is not None else b'\xff\xd8' + b'x' * 100
+        with patch.object(cache, '_download', return_value=(data, 'image/jpeg')):
+            articles = [{'urlToImage': 'https://example.com/a.jpg'}]
+            cache.localize(articles)
+        self.assertNotIn('image_files', articles[0])
+        self.assertEqual(cache.get('https://example.com/a.jpg'), {})
+
+    @unittest.skipIf(Image is None, "Pillow not installed")
+    def test_thumbnails(self):
+        with patch.object(self.cache, '_download', return_value=(png_bytes(), 'image/png')):
+            files = self.cache.get('https://example.com/a.png')
+        self.assertEqual(sorted(files), ['jpeg', 'webp'])
+        with Image.open(self.cache.path(files['jpeg'])) as thumbnail:
+            self.assertLessEqual(thumbnail.size[0], image_cache.THUMBNAIL_SIZE[0])
+
+    @unittest.skipIf(Image is None, "Pillow not installed")
+    def test_decompression_bomb_is_not_an_image(self):
+        with patch.object(Image, 'MAX_IMAGE_PIXELS', 1000):
+            self.assertIsNone(image_cache._encode(png_bytes((100, 100)), 'jpeg'))
+
+    def test_mime_images_share_parts(self):
+        name = self.cache._store(b'\xff\xd8\xff\xe0\x00\x10JFIF\x00' + b'x' * 100, 'jpg')
+        articles = [{'image_files': {'jpeg': name}}, {'image_files': {'jpeg': name}}, {}]
+        parts = self.cache.mime_images(articles)
+        self.assertEqual(len(parts), 1)
+        self.assertEqual(articles[0]['image_cid'], articles[1]['image_cid'])
+        self.assertNotIn('image_cid', articles[2])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the image cache...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestImageCache)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
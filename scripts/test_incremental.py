@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental fetch cache and its high-water marks
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers.incremental import IncrementalCache, published_at, query_key
+
+
+def article(i, hours_ago, **fields):
+    published = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return dict({'title': f"Story {i}", 'url': f"https://example.com/{i}",
+                 'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ')}, **fields)
+
+
+class TestIncrementalCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = IncrementalCache(None, window_hours=24)
+
+    def test_query_key_ignores_credentials_and_paging(self):
+        url = 'https://newsapi.org/v2/top-headlines'
+        self.assertEqual(query_key(url, {'country': 'in', 'apiKey': 'a', 'page': 1}),
+                         query_key(url, {'page': 3, 'apiKey': 'b', 'country': 'in'}))
+        self.assertNotEqual(query_key(url, {'country': 'in'}), query_key(url, {'country': 'us'}))
+
+    def test_publish_time_formats(self):
+        self.assertEqual(published_at({'publishedAt': '2026-01-31T06:15:00Z'}),
+                         datetime(2026, 1, 31, 6, 15, tzinfo=timezone.utc))
+        self.assertEqual(published_at({'pubDate': '2026-01-31 06:15:00'}),
+                         datetime(2026, 1, 31, 6, 15, tzinfo=timezone.utc))
+        self.assertIsNone(published_at({'publishedAt': 'yesterday'}))
+
+    def test_high_water_mark_is_the_newest_article(self):
+        self.assertIsNone(self.cache.high_water('q'))
+        newest = article(1, 1)
+        self.cache.merge('q', [article(2, 5), newest, article(3, 3)], limit=10)
+        self.assertEqual(self.cache.high_water('q'), published_at(newest))
+
+    def test_merge_keeps_newest_first_within_the_limit(self):
+        self.cache.merge('q', [article(1, 5), article(2, 4)], limit=3)
+        window = self.cache.merge('q', [article(3, 1), article(4, 2)], limit=3)
+        self.assertEqual([a['title'] for a in window], ['Story 3', 'Story 4', 'Story 2'])
+
+    def test_fresh_copy_replaces_the_cached_one(self):
+        self.cache.merge('q', [article(1, 2)], limit=10)
+        window = self.cache.merge('q', [article(1, 2, title='Story 1 (updated)',
+                                                url='https://www.example.com/1?utm_source=feed')], limit=10)
+        self.assertEqual([a['title'] for a in window], ['Story 1 (updated)'])
+
+    def test_articles_past_the_window_are_dropped(self):
+        self.cache.merge('q', [article(1, 30)], limit=10)
+        window = self.cache.merge('q', [article(2, 1)], limit=10)
+        self.assertEqual([a['title'] for a in window], ['Story 2'])
+
+    def test_state_survives_a_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'state', 'fetch_cache.json')
+            cache = IncrementalCache(path)
+            cache.merge('q', [article(1, 1)], limit=10)
+            cache.save()
+            restored = IncrementalCache(path)
+            self.assertEqual(restored.high_water('q'), cache.high_water('q'))
+            self.assertEqual(len(restored.merge('q', [], limit=10)), 1)
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the incremental fetch cache...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestIncrementalCache)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for the job executor: single-flight keys, deadlines and waiting jobs
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.job_executor import JobExecutor
+
+
+class Job:
+    """Records its runs; blocks until released (or cancelled, if it honours cancel)"""
+
+    def __init__(self, honours_cancel=True):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.runs = []
+        self.cancelled = []
+        self.honours_cancel = honours_cancel
+        self.lock = threading.Lock()
+
+    def __call__(self, label=None, cancel=None):
+        with self.lock:
+            self.runs.append(label)
+        self.started.set()
+        while not self.release.wait(0.01):
+            if self.honours_cancel and cancel.is_set():
+                break
+        self.cancelled.append(cancel.is_set())
+
+
+def wait_idle(executor, key, timeout=5.0):
+    """Whether the key is free within `timeout` seconds"""
+    deadline = time.monotonic() + timeout
+    while executor.is_running(key) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not executor.is_running(key)
+
+
+class TestJobExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = JobExecutor()
+
+    def test_same_key_is_single_flight(self):
+        job = Job()
+        self.assertTrue(self.executor.submit('send', job, 10, 'first'))
+        self.assertFalse(self.executor.submit('send', job, 10, 'second'))
+        # Other keys are independent
+        other = Job()
+        self.assertTrue(self.executor.submit('prefetch:07:00', other, 10))
+        job.release.set()
+        other.release.set()
+        self.assertTrue(wait_idle(self.executor, 'send'))
+        self.assertEqual(job.runs, ['first'])
+
+    def test_deadline_sets_cancel(self):
+        job = Job()
+        self.executor.submit('send', job, 0.05)
+        self.assertTrue(wait_idle(self.executor, 'send'))
+        self.assertEqual(job.cancelled, [True])
+
+    def test_key_stays_held_until_the_worker_exits(self):
+        job = Job(honours_cancel=False)
+        self.executor.submit('send', job, 0.05)
+        job.started.wait(1)
+        time.sleep(0.2)
+        self.assertTrue(self.executor.is_running('send'))
+        self.assertFalse(self.executor.submit('send', job, 10))
+        job.release.set()
+        self.assertTrue(wait_idle(self.executor, 'send'))
+
+    def test_enqueued_jobs_wait_for_the_running_one(self):
+        job = Job()
+        self.executor.enqueue('send', job, 10, '07:00')
+        job.started.wait(1)
+        self.assertTrue(self.executor.enqueue('send', job, 10, '13:00'))
+        self.assertTrue(self.executor.enqueue('send', job, 10, '13:00'))
+        self.assertTrue(self.executor.enqueue('send', job, 10, '19:00'))
+        self.assertEqual(job.runs, ['07:00'])
+        job.release.set()
+        self.assertTrue(wait_idle(self.executor, 'send'))
+        self.assertEqual(job.runs, ['07:00', '13:00', '19:00'])
+
+    def test_waiting_job_gets_its_own_deadline(self):
+        first, second = Job(), Job()
+        self.executor.enqueue('send', first, 0.05)
+        first.started.wait(1)
+        self.executor.enqueue('send', second, 10)
+        second.started.wait(2)
+        self.assertTrue(self.executor.is_running('send'))
+        self.assertEqual(first.cancelled, [True])
+        second.release.set()
+        self.assertTrue(wait_idle(self.executor, 'send'))
+        self.assertEqual(second.cancelled, [False])
+
+    def test_shutdown_drains_and_drops_waiting_jobs(self):
+        job = Job()
+        self.executor.enqueue('send', job, 10, '07:00')
+        job.started.wait(1)
+        self.executor.enqueue('send', job, 10, '13:00')
+        threading.Timer(0.05, job.release.set).start()
+        self.assertTrue(self.executor.shutdown(grace=2))
+        self.assertEqual(job.runs, ['07:00'])
+        self.assertFalse(self.executor.submit('send', job, 10))
+        self.assertFalse(self.executor.enqueue('send', job, 10))
+
+    def test_shutdown_cancels_stragglers(self):
+        job = Job()
+        self.executor.submit('send', job, 10)
+        job.started.wait(1)
+        self.assertTrue(self.executor.shutdown(grace=0.05, cancel_wait=2))
+        self.assertEqual(job.cancelled, [True])
+
+    def test_failing_job_releases_its_key(self):
+        def failing(cancel=None):
+            raise RuntimeError('boom')
+        self.executor.submit('send', failing, 10)
+        self.assertTrue(wait_idle(self.executor, 'send'))
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the job executor...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestJobExecutor)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for digest link checking and its outage guard
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import link_checker
+from src.fetchers.link_checker import BROKEN, OK, PAYWALLED, UNKNOWN, LinkCache, LinkChecker, classify_status
+
+
+class FakeSite:
+    """Answers HEAD/GET by URL: a status code, or an exception to raise"""
+
+    def __init__(self, answers, get_answers=None):
+        self.answers = answers
+        self.get_answers = get_answers or {}
+        self.requests = []
+
+    def _answer(self, method, url, answers):
+        self.requests.append((method, url))
+        answer = answers[url]
+        if isinstance(answer, Exception):
+            raise answer
+        return Mock(status_code=answer)
+
+    def head(self, url, **kwargs):
+        return self._answer('HEAD', url, self.answers)
+
+    def get(self, url, **kwargs):
+        return self._answer('GET', url, self.get_answers)
+
+
+class TestLinkChecker(unittest.TestCase):
+
+    def checker(self, site):
+        return LinkChecker(LinkCache(None), max_workers=4, session=site)
+
+    def test_status_codes(self):
+        self.assertEqual(classify_status(200), OK)
+        self.assertEqual(classify_status(402), PAYWALLED)
+        self.assertEqual(classify_status(410), BROKEN)
+        self.assertEqual(classify_status(503), UNKNOWN)
+
+    def test_dead_links_are_dropped_and_paywalls_marked(self):
+        site = FakeSite({'https://a.com/1': 200, 'https://b.com/2': 404, 'https://c.com/3': 401})
+        articles = [{'url': url} for url in site.answers] + [{'title': 'No link'}]
+        kept = self.checker(site).filter_articles(articles)
+        self.assertEqual([a.get('url') for a in kept], ['https://a.com/1', 'https://c.com/3', None])
+        self.assertEqual(kept[1]['link_status'], PAYWALLED)
+
+    def test_refused_head_falls_back_to_get(self):
+        site = FakeSite({'https://a.com/1': 405}, {'https://a.com/1': 200})
+        self.assertEqual(self.checker(site).status('https://a.com/1'), OK)
+        self.assertEqual([method for method, _ in site.requests], ['HEAD', 'GET'])
+
+    def test_bot_blocks_and_timeouts_are_not_dead(self):
+        site = FakeSite({'https://a.com/1': 403, 'https://b.com/2': requests.exceptions.ReadTimeout()},
+                        {'https://a.com/1': 403})
+        checker = self.checker(site)
+        self.assertEqual(checker.status('https://a.com/1'), UNKNOWN)
+        self.assertEqual(checker.status('https://b.com/2'), UNKNOWN)
+
+    def test_only_a_missing_host_is_dead(self):
+        site = FakeSite({'https://gone.example/1': requests.exceptions.ConnectionError('nxdomain'),
+                         'https://flaky.example/2': requests.exceptions.ConnectionError('reset')})
+        with patch.object(link_checker, 'host_missing', side_effect=lambda host: host == 'gone.example'):
+            checker = self.checker(site)
+            self.assertEqual(checker.status('https://gone.example/1'), BROKEN)
+            self.assertEqual(checker.status('https://flaky.example/2'), UNKNOWN)
+
+    def test_results_are_cached_by_canonical_url(self):
+        site = FakeSite({'https://a.com/1': 200})
+        checker = self.checker(site)
+        checker.status('https://a.com/1')
+        self.assertEqual(checker.status('https://www.a.com/1?utm_source=mail'), OK)
+        self.assertEqual(len(site.requests), 1)
+
+    def test_mostly_broken_batch_is_kept(self):
+        site = FakeSite({f"https://site{i}.com/story": 404 for i in range(4)})
+        site.answers['https://ok.com/story'] = 200
+        checker = self.checker(site)
+        with self.assertLogs('src.fetchers.link_checker', 'ERROR'):
+            statuses = checker.check(list(site.answers))
+        self.assertEqual(sorted(statuses.values()), [OK] + [UNKNOWN] * 4)
+        # Nothing from the suspect batch is remembered as broken
+        self.assertIsNone(checker.cache.get('https://site0.com/story'))
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the link checker...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestLinkChecker)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -8,12 +8,12 @@ import os
 import sys
 from unittest.mock import patch, Mock
 import json
-import builtins
 
 # Add the current directory to the path so we can import our news_fetcher module
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import news_fetcher
+from src.services.config_service import ConfigService
 
 class TestNewsFetcher(unittest.TestCase):
     
@@ -24,14 +24,9 @@ class TestNewsFetcher(unittest.TestCase):
         with open('test_config.txt', 'w') as f:
             f.write(test_config_content)
         
-        # Temporarily replace the config file name in the function
-        original_open = builtins.open
-        def mock_open(file, mode='r'):
-            if file == 'config.txt':
-                file = 'test_config.txt'
-            return original_open(file, mode)
-        
-        with patch('builtins.open', side_effect=mock_open):
+        # Point the shared config service at the test file
+        service = ConfigService(paths=['test_config.txt'], environ={})
+        with patch('src.services.config_service.get_config_service', return_value=service):
             api_key = news_fetcher.get_api_key_from_config()
             self.assertEqual(api_key, 'test_api_key_12345')
         
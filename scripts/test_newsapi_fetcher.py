@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming, paginated NewsAPI.org fetching
+"""
+
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import newsapi_fetcher
+from src.fetchers.incremental import IncrementalCache
+from src.fetchers.newsapi_fetcher import get_indian_news, iter_pages, take_unique
+
+URL = "https://newsapi.org/v2/top-headlines"
+
+
+def article(i, hours_ago=1):
+    published = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return {
+        'source': {'id': None, 'name': f"Source {i}"},
+        'title': f"Story {i}",
+        'description': f"<p>About story {i}</p>",
+        'url': f"https://example.com/story/{i}",
+        'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'content': 'Truncated [+1200 chars]',
+    }
+
+
+class FakeNewsAPI:
+    """Serves `total` articles per query, paged as NewsAPI does, and records each request"""
+
+    def __init__(self, total):
+        self.total = total
+        self.requests = []
+        self.queries = {}
+
+    def __call__(self, url, params=None, **kwargs):
+        self.requests.append(dict(params))
+        page, size = int(params['page']), int(params['pageSize'])
+        # Each query has its own articles: 1000, 1001, ... for the first, 2000, ... for the next
+        query = tuple(sorted((k, v) for k, v in params.items() if k not in ('page', 'pageSize')))
+        offset = 1000 * self.queries.setdefault(query, len(self.queries) + 1)
+        start = (page - 1) * size
+        articles = [article(offset + i) for i in range(start, min(start + size, self.total))]
+        body = {'status': 'ok', 'totalResults': self.total, 'articles': articles}
+        return Mock(content=json.dumps(body).encode('utf-8'))
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_pages_stop_at_the_total(self):
+        api = FakeNewsAPI(total=45)
+        with patch.object(newsapi_fetcher, 'get_with_retry', api):
+            pages = list(iter_pages(URL, {'country': 'in'}, 'key', deadline=0))
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(len(api.requests), 3)
+
+    def test_pages_are_requested_lazily(self):
+        api = FakeNewsAPI(total=100)
+        with patch.object(newsapi_fetcher, 'get_with_retry', api):
+            pages = iter_pages(URL, {'country': 'in'}, 'key', deadline=0)
+            next(pages)
+            self.assertEqual(len(api.requests), 1)
+
+    def test_articles_are_normalized_and_projected(self):
+        with patch.object(newsapi_fetcher, 'get_with_retry', FakeNewsAPI(total=1)):
+            first = next(iter_pages(URL, {'country': 'in'}, 'key', deadline=0))[0]
+        self.assertEqual(first['description'], 'About story 1000')
+        self.assertNotIn('content', first)
+
+    def test_fetch_stops_once_enough_articles_are_found(self):
+        api = FakeNewsAPI(total=100)
+        with patch.object(newsapi_fetcher, 'get_with_retry', api):
+            articles = get_indian_news('key', deadline=0, cache=IncrementalCache(None), max_articles=25)
+        self.assertEqual(len(articles), 25)
+        # Two pages of the first query; the other queries are never asked
+        self.assertEqual(len(api.requests), 2)
+
+    def test_second_run_only_reads_past_the_high_water_mark(self):
+        cache = IncrementalCache(None)
+        with patch.object(newsapi_fetcher, 'get_with_retry', FakeNewsAPI(total=20)):
+            get_indian_news('key', deadline=0, cache=cache, max_articles=60)
+        api = FakeNewsAPI(total=20)
+        with patch.object(newsapi_fetcher, 'get_with_retry', api):
+            articles = get_indian_news('key', deadline=0, cache=cache, max_articles=60)
+        # top-headlines has no `from` filter: one small page per query shows nothing new
+        self.assertEqual([request['pageSize'] for request in api.requests], ['5', '5', '5'])
+        self.assertEqual(len(articles), 60)
+
+
+class TestTakeUnique(unittest.TestCase):
+
+    def test_duplicates_by_title_and_canonical_url(self):
+        stream = [
+            {'title': 'A', 'url': 'https://example.com/a'},
+            {'title': 'A', 'url': 'https://example.com/other'},
+            {'title': 'B', 'url': 'https://www.example.com/a?utm_source=x'},
+            {'title': 'C', 'url': 'https://example.com/c'},
+            {'title': '', 'url': 'https://example.com/d'},
+        ]
+        self.assertEqual([a['title'] for a in take_unique(stream, 10)], ['A', 'C'])
+
+    def test_stream_is_not_read_past_the_last_article_needed(self):
+        read = []
+
+        def stream():
+            for i in range(10):
+                read.append(i)
+                yield {'title': f"Story {i}", 'url': f"https://example.com/{i}"}
+
+        self.assertEqual(len(take_unique(stream(), 3)), 3)
+        self.assertEqual(read, [0, 1, 2])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the NewsAPI.org fetcher...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestPagination))
+    suite.addTests(loader.loadTestsFromTestCase(TestTakeUnique))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for provider circuit breakers and adaptive provider ordering
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.provider_health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ProviderHealth
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window=10,
+                                      slow_call_seconds=5, open_seconds=60)
+
+    def test_opens_at_the_failure_rate(self):
+        for success in (True, False, True):
+            self.assertFalse(self.breaker.record(success, 1.0, now=0))
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.record(False, 1.0, now=10))
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow(now=20))
+
+    def test_slow_calls_count_as_failures(self):
+        for _ in range(4):
+            self.breaker.record(True, 6.0, now=0)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_allows_one_trial(self):
+        for _ in range(4):
+            self.breaker.record(False, 1.0, now=0)
+        self.assertTrue(self.breaker.allow(now=61))
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow(now=61))
+
+    def test_trial_success_closes(self):
+        for _ in range(4):
+            self.breaker.record(False, 1.0, now=0)
+        self.breaker.allow(now=61)
+        self.assertTrue(self.breaker.record(True, 1.0, now=62))
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.outcomes, [])
+
+    def test_trial_failure_reopens(self):
+        for _ in range(4):
+            self.breaker.record(False, 1.0, now=0)
+        self.breaker.allow(now=61)
+        self.breaker.record(False, 1.0, now=62)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow(now=100))
+        self.assertTrue(self.breaker.allow(now=123))
+
+    def test_interrupted_trial_is_retried_after_a_restart(self):
+        restored = CircuitBreaker()
+        restored.load({'state': HALF_OPEN, 'opened_at': 5.0, 'outcomes': [False] * 20})
+        self.assertEqual(restored.state, OPEN)
+        self.assertEqual(len(restored.outcomes), restored.window)
+
+
+class TestProviderOrder(unittest.TestCase):
+
+    def setUp(self):
+        self.health = ProviderHealth(breaker_options={'failure_rate': 0.75, 'min_calls': 2})
+
+    def test_untried_providers_keep_the_preference_order(self):
+        self.assertEqual(self.health.order(['newsdata', 'newsapi', 'rss']), ['newsdata', 'newsapi', 'rss'])
+
+    def test_healthy_providers_come_before_untried_ones(self):
+        self.health.record('rss', True, 2.0)
+        self.assertEqual(self.health.order(['newsdata', 'newsapi', 'rss']), ['rss', 'newsdata', 'newsapi'])
+
+    def test_cheaper_healthy_provider_first(self):
+        self.health.record('newsapi', True, 4.0)
+        self.health.record('newsdata', True, 1.0)
+        self.assertEqual(self.health.order(['newsapi', 'newsdata']), ['newsdata', 'newsapi'])
+
+    def test_failing_providers_come_after_untried_ones(self):
+        for _ in range(3):
+            self.health.record('newsapi', True, 1.0)
+        for _ in range(3):
+            self.health.record('newsapi', False, 1.0)
+        self.assertEqual(self.health.state('newsapi'), CLOSED)
+        self.assertEqual(self.health.order(['newsapi', 'newsdata']), ['newsdata', 'newsapi'])
+
+    def test_open_circuits_are_left_out(self):
+        self.health.record('newsapi', False, 1.0)
+        self.health.record('newsapi', False, 1.0)
+        self.assertEqual(self.health.state('newsapi'), OPEN)
+        self.assertEqual(self.health.order(['newsapi', 'newsdata']), ['newsdata'])
+
+    def test_state_survives_a_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'health.json')
+            health = ProviderHealth(path, breaker_options={'min_calls': 2})
+            health.record('newsapi', False, 1.0)
+            health.record('newsapi', False, 1.0)
+            health.count_requests('newsapi', 3)
+            health.save(force=True)
+            restored = ProviderHealth(path, breaker_options={'min_calls': 2})
+        self.assertEqual(restored.state('newsapi'), OPEN)
+        self.assertEqual(restored.requests_today('newsapi'), 3)
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for provider health...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestCircuitBreaker))
+    suite.addTests(loader.loadTestsFromTestCase(TestProviderOrder))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the provider router: failover, hedged requests and quota accounting
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import Mock
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers.retry_policy import RetryPolicy, get_with_retry
+from src.services.provider_health import ProviderHealth
+from src.services.provider_router import ProviderRouter
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+def response(status):
+    return Mock(status_code=status, headers={})
+
+
+def http_provider(name, statuses):
+    """Provider making one GET per status in `statuses` (retrying failed ones)"""
+    session = Mock()
+    session.get.side_effect = [response(status) for status in statuses]
+
+    def fetch_news(max_articles=25):
+        get_with_retry('https://example.com/news', provider=f"test-{name}", policy=NO_WAIT, session=session)
+        return [{'title': f"{name} story"}], name
+    return fetch_news
+
+
+def provider(name, fail=False, release=None):
+    """Provider without HTTP that answers at once, or once `release` is set"""
+    def fetch_news(max_articles=25):
+        if release is not None:
+            release.wait(5)
+        if fail:
+            raise RuntimeError(f"{name} is down")
+        return [{'title': f"{name} story"}], name
+    return fetch_news
+
+
+class TestProviderRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.health = ProviderHealth(breaker_options={'min_calls': 1, 'failure_rate': 1.0})
+
+    def router(self, providers, **kwargs):
+        return ProviderRouter(providers, list(providers), self.health, **kwargs)
+
+    def test_failover_to_the_next_provider(self):
+        router = self.router({'newsapi': provider('newsapi', fail=True), 'newsdata': provider('newsdata')})
+        self.assertEqual(router.fetch_news(), ([{'title': 'newsdata story'}], 'newsdata'))
+
+    def test_open_circuit_is_skipped(self):
+        first = Mock(side_effect=RuntimeError('down'))
+        router = self.router({'newsapi': first, 'newsdata': provider('newsdata')})
+        router.fetch_news()
+        router.fetch_news()
+        self.assertEqual(first.call_count, 1)
+
+    def test_actual_http_attempts_are_counted(self):
+        router = self.router({'newsapi': http_provider('newsapi', [500, 503, 200])})
+        router.fetch_news()
+        self.assertEqual(self.health.requests_today('newsapi'), 3)
+
+    def test_slow_primary_is_hedged(self):
+        release = threading.Event()
+        self.health.record('newsapi', True, 0.05)
+        router = self.router({'newsapi': provider('newsapi', release=release),
+                              'newsdata': provider('newsdata')}, hedge=True)
+        try:
+            articles, api_source = router.fetch_news()
+        finally:
+            release.set()
+        self.assertEqual(api_source, 'newsdata')
+
+    def test_failed_primary_fails_over_despite_the_quota_reserve(self):
+        self.health.record('newsapi', True, 0.05)
+        self.health.count_requests('newsdata', 190)
+        router = self.router({'newsapi': provider('newsapi', fail=True),
+                              'newsdata': provider('newsdata')}, hedge=True)
+        self.assertEqual(router.fetch_news()[1], 'newsdata')
+
+    def test_hedge_refused_for_the_quota_reserve(self):
+        release = threading.Event()
+        self.health.record('newsapi', True, 0.05)
+        self.health.count_requests('newsdata', 120)
+        router = self.router({'newsapi': provider('newsapi', release=release),
+                              'newsdata': provider('newsdata')}, hedge=True)
+        with self.assertLogs('src.services.provider_router', 'INFO') as logs:
+            threading.Timer(0.3, release.set).start()
+            self.assertEqual(router.fetch_news()[1], 'newsapi')
+        self.assertTrue(any('newsdata quota is reserved' in line for line in logs.output))
+
+    def test_hedge_refused_for_an_open_circuit(self):
+        release = threading.Event()
+        self.health.record('newsapi', True, 0.05)
+        self.health.record('newsdata', False, 1.0)
+        router = self.router({'newsapi': provider('newsapi', release=release),
+                              'newsdata': provider('newsdata')}, hedge=True)
+        with self.assertLogs('src.services.provider_router', 'INFO') as logs:
+            threading.Timer(0.3, release.set).start()
+            self.assertEqual(router._fetch_hedged('newsapi', 'newsdata', 25)[1], 'newsapi')
+        self.assertTrue(any('newsdata circuit is open' in line for line in logs.output))
+        self.assertFalse(any('quota' in line for line in logs.output))
+
+    def test_observed_attempts_gate_the_hedge(self):
+        router = self.router({'newsapi': provider('newsapi'),
+                              'newsdata': http_provider('newsdata', [500, 500, 200])}, hedge=True)
+        router.quotas['newsdata'] = 10
+        router._call('newsdata', 25)
+        # 3 of 10 used; another 3 would leave 4, under the reserve of 5
+        self.assertFalse(router._hedge_affordable('newsdata'))
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the provider router...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestProviderRouter)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
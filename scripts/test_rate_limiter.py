@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared token-bucket rate limiter
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import rate_limiter
+from src.fetchers.rate_limiter import RateLimiterRegistry, TokenBucket, parse_rate_limit
+
+
+class TestParseRateLimit(unittest.TestCase):
+
+    def test_specs(self):
+        self.assertEqual(parse_rate_limit('2/s,5'), (2.0, 5.0))
+        self.assertEqual(parse_rate_limit('30/15min'), (30 / 900, 30.0))
+        self.assertEqual(parse_rate_limit(' 100 / h '), (100 / 3600, 100.0))
+
+    def test_bad_specs(self):
+        for spec in ('fast', '2/fortnight', '0/s', '2/s,0'):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_rate_limit(spec)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.sleep = patch.object(rate_limiter.time, 'sleep').start()
+        self.addCleanup(patch.stopall)
+
+    def test_burst_then_spaced_out(self):
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        # Reservations queue: the fourth waits ~1s, the fifth ~2s
+        self.assertAlmostEqual(waits[3], 1.0, delta=0.05)
+        self.assertAlmostEqual(waits[4], 2.0, delta=0.05)
+        self.assertEqual(bucket.stats()['acquired'], 5)
+
+    def test_timeout_does_not_take_a_token(self):
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+        self.assertIsNone(bucket.acquire(timeout=1))
+        self.assertEqual(bucket.stats()['acquired'], 1)
+
+    def test_pause_holds_back_the_next_caller(self):
+        bucket = TokenBucket(rate=2.0, capacity=5)
+        bucket.pause(10)
+        self.assertAlmostEqual(bucket.acquire(), 10.5, delta=0.05)
+
+    def test_concurrent_callers_get_distinct_slots(self):
+        bucket = TokenBucket(rate=10.0, capacity=1)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = bucket.acquire()
+            with lock:
+                waits.append(round(wait, 1))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(waits), [0.0, 0.1, 0.2, 0.3])
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_buckets_per_provider_and_key(self):
+        registry = RateLimiterRegistry()
+        self.assertIs(registry.bucket('newsapi', 'a'), registry.bucket('newsapi', 'a'))
+        self.assertIsNot(registry.bucket('newsapi', 'a'), registry.bucket('newsapi', 'b'))
+        self.assertIsNot(registry.bucket('newsapi', 'a'), registry.bucket('newsdata', 'a'))
+
+    def test_configure_updates_existing_buckets(self):
+        registry = RateLimiterRegistry()
+        bucket = registry.bucket('newsapi', 'a')
+        with self.assertLogs('src.fetchers.rate_limiter', 'ERROR'):
+            registry.configure({'NEWSAPI_RATE_LIMIT': '1/s,2', 'NEWSDATA_RATE_LIMIT': 'lots'})
+        self.assertEqual((bucket.rate, bucket.capacity, bucket.tokens), (1.0, 2.0, 2.0))
+        self.assertEqual(registry.bucket('newsdata').rate, parse_rate_limit('30/15min,6')[0])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the rate limiter...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestParseRateLimit))
+    suite.addTests(loader.loadTestsFromTestCase(TestTokenBucket))
+    suite.addTests(loader.loadTestsFromTestCase(TestRegistry))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for recipient profiles and per-profile ranking
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.recipient_profiles import ArticleIndex, RecipientProfile, load_profiles
+
+ARTICLES = [
+    # NewsData.io articles carry categories
+    {'title': 'Sensex closes higher', 'description': 'Banks lead the rally', 'category': ['business']},
+    {'title': 'India win the series', 'description': 'Cricket in Chennai', 'category': ['sports']},
+    {'title': 'Monsoon reaches Kerala', 'description': 'Farmers relieved', 'category': 'top'},
+    # NewsAPI and RSS articles do not
+    {'title': 'Supreme Court hears petition', 'description': 'Business groups object'},
+    {'title': 'Court adjourns Supreme hearing', 'description': 'Next date in June'},
+    {'title': 'Startup raises funding', 'description': 'Bengaluru firm expands'},
+]
+
+
+def emails(groups):
+    return sorted(sorted(recipients) for _, recipients in groups)
+
+
+class TestRecipientProfiles(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ArticleIndex(ARTICLES)
+
+    def titles(self, profile):
+        return [article['title'] for article in self.index.select(profile)]
+
+    def test_default_profile_gets_the_top_articles(self):
+        profile = RecipientProfile('a@example.com', max_articles=2)
+        self.assertEqual(self.titles(profile), ['Sensex closes higher', 'India win the series'])
+
+    def test_category_and_keyword_matches(self):
+        profile = RecipientProfile('a@example.com', categories=['Sports'], keywords=['startup'])
+        self.assertEqual(self.titles(profile), ['Startup raises funding', 'India win the series'])
+
+    def test_phrases_match_in_order(self):
+        profile = RecipientProfile('a@example.com', keywords=['Supreme Court'])
+        self.assertEqual(self.titles(profile), ['Supreme Court hears petition'])
+
+    def test_uncategorized_articles_match_categories_by_name(self):
+        profile = RecipientProfile('a@example.com', categories=['business'])
+        self.assertEqual(self.titles(profile), ['Sensex closes higher', 'Supreme Court hears petition'])
+
+    def test_category_only_profile_without_categorized_articles(self):
+        index = ArticleIndex([article for article in ARTICLES if 'category' not in article])
+        profile = RecipientProfile('a@example.com', categories=['business'])
+        self.assertEqual([a['title'] for a in index.select(profile)], ['Supreme Court hears petition'])
+
+    def test_max_articles(self):
+        profile = RecipientProfile('a@example.com', keywords=['court', 'india', 'startup'], max_articles=1)
+        self.assertEqual(len(self.index.select(profile)), 1)
+
+    def test_group_recipients(self):
+        profiles = [
+            RecipientProfile('a@example.com', categories=['sports']),
+            RecipientProfile('b@example.com', categories=['sports']),
+            RecipientProfile('c@example.com', keywords=['kerala'], slots=['07:00']),
+            RecipientProfile('d@example.com', keywords=['nothing-matches-this']),
+        ]
+        self.assertEqual(emails(self.index.group_recipients(profiles)),
+                         [['a@example.com', 'b@example.com'], ['c@example.com']])
+        self.assertEqual(emails(self.index.group_recipients(profiles, slot='18:00')),
+                         [['a@example.com', 'b@example.com']])
+
+    def test_load_profiles(self):
+        entries = [
+            {'email': ' a@example.com ', 'categories': 'business, sports', 'max_articles': 10},
+            {'email': 'b@example.com', 'keywords': ['Supreme Court'], 'slots': ['07:00']},
+            {'categories': ['top']},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profiles.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            profiles = load_profiles({
+                'RECIPIENT_PROFILES': path,
+                'RECIPIENT_EMAILS': 'b@example.com, c@example.com',
+                'MAX_ARTICLES': '15',
+            })
+
+        by_email = {profile.email: profile for profile in profiles}
+        self.assertEqual(sorted(by_email), ['a@example.com', 'b@example.com', 'c@example.com'])
+        self.assertEqual(by_email['a@example.com'].categories, frozenset({'business', 'sports'}))
+        self.assertEqual(by_email['a@example.com'].max_articles, 10)
+        self.assertEqual(by_email['b@example.com'].keywords, frozenset({('supreme', 'court')}))
+        self.assertFalse(by_email['b@example.com'].wants_slot('18:00'))
+        self.assertEqual(by_email['c@example.com'].max_articles, 15)
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for recipient profiles...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestRecipientProfiles)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the fetcher plugin registry
+"""
+
+import os
+import sys
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import registry
+from src.fetchers.registry import NewsFetcher, create_fetchers, discover_fetchers, register_fetcher
+
+
+class StaticFetcher(NewsFetcher):
+    """Returns one article named after the fetcher"""
+
+    def fetch(self, max_articles, deadline):
+        return [{'title': f"{self.name} story"}]
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        # Built-ins register once, on first import; keep them across tests
+        discover_fetchers({})
+        self.saved = dict(registry._registry)
+
+    def tearDown(self):
+        registry._registry.clear()
+        registry._registry.update(self.saved)
+
+    def test_fetcher_without_fetch_cannot_be_created(self):
+        class Incomplete(NewsFetcher):
+            name = 'incomplete'
+        with self.assertRaises(TypeError):
+            Incomplete({})
+
+    def test_fetcher_needs_a_name(self):
+        with self.assertRaises(ValueError):
+            register_fetcher(type('Nameless', (StaticFetcher,), {}))
+
+    def test_builtin_fetchers_are_discovered(self):
+        available = discover_fetchers({})
+        for name in ('newsapi', 'newsdata', 'rss'):
+            self.assertIn(name, available)
+        self.assertEqual(available['newsdata'].__module__, 'src.fetchers.newsdata_service_fetcher')
+
+    def test_plugins_from_config(self):
+        config = {'FETCHER_PLUGINS': f"{__name__}:StaticFetcher, missing.module:Nothing"}
+        StaticFetcher.name = 'static'
+        try:
+            with self.assertLogs('src.fetchers.registry', 'ERROR'):
+                available = discover_fetchers(config)
+        finally:
+            StaticFetcher.name = ''
+        self.assertIs(available['static'], StaticFetcher)
+
+    def test_enabled_fetchers_keep_the_configured_order(self):
+        register_fetcher(type('First', (StaticFetcher,), {'name': 'first'}))
+        register_fetcher(type('Second', (StaticFetcher,), {'name': 'second'}))
+        fetchers = create_fetchers({'FETCHERS': 'second, first'})
+        self.assertEqual([fetcher.name for fetcher in fetchers], ['second', 'first'])
+
+    def test_unconfigured_fetchers_are_skipped(self):
+        register_fetcher(type('Keyless', (StaticFetcher,), {
+            'name': 'keyless', 'is_configured': classmethod(lambda cls, config: False)}))
+        fetchers = create_fetchers({'FETCHERS': 'keyless,newsdata', 'NEWSDATA_API_KEY': 'your_key_here'})
+        self.assertEqual(fetchers, [])
+
+    def test_preferred_fetcher_comes_first_by_default(self):
+        fetchers = create_fetchers({'NEWS_API_KEY': 'key', 'NEWSDATA_API_KEY': 'key',
+                                    'API_PREFERENCE': 'newsdata'})
+        self.assertEqual(fetchers[0].name, 'newsdata')
+        self.assertIn('newsapi', [fetcher.name for fetcher in fetchers])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the fetcher registry...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestRegistry)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
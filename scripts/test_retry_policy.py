@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for provider retries: error classes, backoff and Retry-After
+"""
+
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock, patch
+
+import requests
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import retry_policy
+from src.fetchers.retry_policy import (
+    AUTH, RATE_LIMITED, SERVER, TIMEOUT, AttemptCounter, ProviderError, RetryPolicy,
+    classify, get_with_retry, parse_retry_after,
+)
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+def response(status, retry_after=None):
+    return Mock(status_code=status, headers={'Retry-After': retry_after} if retry_after else {})
+
+
+def session(*results):
+    http = Mock()
+    http.get.side_effect = list(results)
+    return http
+
+
+class TestClassify(unittest.TestCase):
+
+    def test_responses(self):
+        self.assertIsNone(classify(response(200)))
+        self.assertEqual(classify(response(429)), RATE_LIMITED)
+        self.assertEqual(classify(response(401)), AUTH)
+        self.assertEqual(classify(response(503)), SERVER)
+
+    def test_exceptions(self):
+        self.assertEqual(classify(error=requests.exceptions.ReadTimeout()), TIMEOUT)
+
+    def test_retry_after_forms(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        later = datetime.now(timezone.utc) + timedelta(seconds=90)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(later, usegmt=True)), 90, delta=2)
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        self.assertEqual(parse_retry_after(format_datetime(past, usegmt=True)), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class TestGetWithRetry(unittest.TestCase):
+
+    def test_transient_errors_are_retried(self):
+        http = session(response(502), requests.exceptions.ConnectionError('reset'), response(200))
+        with AttemptCounter() as attempts:
+            result = get_with_retry('https://example.com', provider='test-retry', policy=NO_WAIT, session=http)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(attempts.count, 3)
+
+    def test_auth_errors_are_not_retried(self):
+        http = session(response(401), response(200))
+        with self.assertRaises(ProviderError) as raised:
+            get_with_retry('https://example.com', provider='test-retry', policy=NO_WAIT, session=http)
+        self.assertEqual(raised.exception.kind, AUTH)
+        self.assertEqual(http.get.call_count, 1)
+
+    def test_gives_up_after_max_attempts(self):
+        http = session(response(500), response(500), response(500), response(200))
+        with self.assertRaises(ProviderError) as raised:
+            get_with_retry('https://example.com', provider='test-retry', policy=NO_WAIT, session=http)
+        self.assertEqual((raised.exception.kind, raised.exception.status), (SERVER, 500))
+        self.assertEqual(http.get.call_count, 3)
+
+    def test_retry_after_replaces_the_backoff(self):
+        http = session(response(503, retry_after='7'), response(200))
+        with patch.object(retry_policy.time, 'sleep') as sleep:
+            get_with_retry('https://example.com', provider='test-retry', session=http,
+                           deadline=time.monotonic() + 60)
+        # Other sleeps are the rate limiter spacing out the test's requests
+        sleep.assert_any_call(7.0)
+
+    def test_rate_limit_pauses_the_shared_bucket(self):
+        http = session(response(429, retry_after='3'), response(200))
+        with patch.object(retry_policy.time, 'sleep') as sleep:
+            get_with_retry('https://example.com', provider='test-retry-429', api_key='key',
+                           session=http, deadline=time.monotonic() + 60)
+        # The wait happens in the rate limiter, before the next attempt
+        waited = sum(call.args[0] for call in sleep.call_args_list)
+        self.assertGreaterEqual(waited, 3.0)
+        self.assertLess(waited, 4.0)
+
+    def test_retry_after_past_the_deadline_gives_up(self):
+        http = session(response(503, retry_after='120'), response(200))
+        with patch.object(retry_policy.time, 'sleep') as sleep:
+            with self.assertRaises(ProviderError) as raised:
+                get_with_retry('https://example.com', provider='test-retry', session=http,
+                               deadline=time.monotonic() + 30)
+        self.assertIn('no time left', str(raised.exception))
+        self.assertFalse(any(call.args[0] >= 1 for call in sleep.call_args_list))
+        self.assertEqual(http.get.call_count, 1)
+
+    def test_nested_attempt_counters_add_up(self):
+        with AttemptCounter() as outer:
+            with AttemptCounter() as inner:
+                get_with_retry('https://example.com', provider='test-retry', policy=NO_WAIT,
+                               session=session(response(500), response(200)))
+            get_with_retry('https://example.com', provider='test-retry', policy=NO_WAIT,
+                           session=session(response(200)))
+        self.assertEqual((inner.count, outer.count), (2, 3))
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the retry policy...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestClassify))
+    suite.addTests(loader.loadTestsFromTestCase(TestGetWithRetry))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming RSS/Atom fetcher and its conditional GETs
+"""
+
+import io
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import rss_fetcher
+from src.fetchers.retry_policy import SERVER, ProviderError
+from src.fetchers.rss_fetcher import FeedState, fetch_feed, fetch_feeds, parse_feed
+
+FEED_URL = 'https://news.example.com/feed'
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+  <channel>
+    <title>Example News</title>
+    <item>
+      <title>Monsoon reaches Kerala</title>
+      <link>https://news.example.com/monsoon</link>
+      <description>&lt;p&gt;Rains arrive &amp;amp; early&lt;/p&gt;</description>
+      <pubDate>Mon, 01 Jun 2026 10:30:00 +0530</pubDate>
+      <media:thumbnail url="https://img.example.com/monsoon.jpg"/>
+    </item>
+    <item>
+      <title>Budget session begins</title>
+      <link>https://news.example.com/budget</link>
+      <pubDate>Mon, 01 Jun 2026 09:00:00 +0530</pubDate>
+    </item>
+    <item><title></title><link>https://news.example.com/untitled</link></item>
+  </channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example Atom</title>
+  <entry>
+    <title>Chandrayaan update</title>
+    <link rel="related" href="https://other.example.com/"/>
+    <link rel="alternate" href="https://atom.example.com/chandrayaan"/>
+    <summary>New images released</summary>
+    <updated>2026-06-01T06:00:00Z</updated>
+  </entry>
+</feed>
+"""
+
+
+class FeedResponse:
+    """Streamed response as rss_fetcher uses it"""
+
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.raw = io.BytesIO(body)
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestParseFeed(unittest.TestCase):
+
+    def test_rss_items(self):
+        articles = list(parse_feed(io.BytesIO(RSS)))
+        self.assertEqual([a['title'] for a in articles], ['Monsoon reaches Kerala', 'Budget session begins'])
+        first = articles[0]
+        self.assertEqual(first['description'], 'Rains arrive & early')
+        self.assertEqual(first['publishedAt'], '2026-06-01T05:00:00Z')
+        self.assertEqual(first['urlToImage'], 'https://img.example.com/monsoon.jpg')
+        self.assertEqual(first['source'], {'name': 'Example News'})
+
+    def test_atom_entries(self):
+        article = next(parse_feed(io.BytesIO(ATOM)))
+        self.assertEqual(article['url'], 'https://atom.example.com/chandrayaan')
+        self.assertEqual(article['description'], 'New images released')
+        self.assertEqual(article['publishedAt'], '2026-06-01T06:00:00Z')
+
+    def test_reading_stops_at_max_items(self):
+        self.assertEqual(len(list(parse_feed(io.BytesIO(RSS), max_items=1))), 1)
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.state = FeedState(None)
+
+    def fetch(self, response):
+        with patch.object(rss_fetcher, 'get_with_retry', return_value=response) as get:
+            articles = fetch_feed(FEED_URL, self.state, deadline=0)
+        return articles, get.call_args.kwargs['headers']
+
+    def test_validators_are_sent_back(self):
+        articles, headers = self.fetch(FeedResponse(200, RSS, {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jun 2026'}))
+        self.assertNotIn('If-None-Match', headers)
+        self.assertEqual(len(articles), 2)
+
+        articles, headers = self.fetch(FeedResponse(304))
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 01 Jun 2026')
+        self.assertEqual([a['title'] for a in articles], ['Monsoon reaches Kerala', 'Budget session begins'])
+
+    def test_failed_or_broken_feed_keeps_the_last_articles(self):
+        self.fetch(FeedResponse(200, RSS, {'ETag': '"v1"'}))
+        with self.assertLogs('src.fetchers.rss_fetcher', 'WARNING'):
+            articles, _ = self.fetch(FeedResponse(200, b'<html><body>Maintenance'))
+        self.assertEqual(len(articles), 2)
+        with patch.object(rss_fetcher, 'get_with_retry', side_effect=ProviderError(SERVER, 'down', 503)):
+            with self.assertLogs('src.fetchers.rss_fetcher', 'WARNING'):
+                self.assertEqual(len(fetch_feed(FEED_URL, self.state, deadline=0)), 2)
+        self.assertEqual(self.state.get(FEED_URL)['etag'], '"v1"')
+
+    def test_feeds_are_merged_newest_first(self):
+        responses = {FEED_URL: FeedResponse(200, RSS), 'https://atom.example.com/feed': FeedResponse(200, ATOM)}
+        with patch.object(rss_fetcher, 'get_with_retry', side_effect=lambda url, **kwargs: responses[url]):
+            articles = fetch_feeds(list(responses), self.state, deadline=0)
+        self.assertEqual([a['title'] for a in articles],
+                         ['Chandrayaan update', 'Monsoon reaches Kerala', 'Budget session begins'])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the RSS fetcher...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestParseFeed))
+    suite.addTests(loader.loadTestsFromTestCase(TestConditionalGet))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the event-driven slot scheduler: timezones, DST and misfires
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, time, timedelta, timezone
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.scheduler_core import SlotScheduler, ScheduleSlot, parse_schedule_times, _get_zone
+
+NEW_YORK = _get_zone('America/New_York')
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class Clock:
+    """Settable clock for the scheduler"""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseScheduleTimes(unittest.TestCase):
+
+    def test_entries_with_and_without_a_zone(self):
+        slots = parse_schedule_times('06:00, 14:00@Europe/London,22:00 Asia/Kolkata', 'America/New_York')
+        self.assertEqual([slot.label for slot in slots], ['06:00', '14:00', '22:00'])
+        self.assertEqual([slot.tz.key for slot in slots], ['America/New_York', 'Europe/London', 'Asia/Kolkata'])
+
+    def test_bad_entries_are_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_schedule_times('7am')
+        with self.assertRaises(ValueError):
+            parse_schedule_times('07:00@Mars/Olympus_Mons')
+
+
+class TestDaylightSaving(unittest.TestCase):
+
+    def test_time_in_the_spring_gap_fires_after_the_gap(self):
+        slot = ScheduleSlot(time(2, 30), NEW_YORK)
+        # 02:30 does not exist on 8 March 2026; it runs at 03:30 EDT
+        self.assertEqual(slot.next_after(utc(2026, 3, 8, 0, 0)), utc(2026, 3, 8, 7, 30))
+        self.assertEqual(slot.next_after(utc(2026, 3, 8, 7, 30)), utc(2026, 3, 9, 6, 30))
+
+    def test_time_in_the_autumn_overlap_fires_once(self):
+        slot = ScheduleSlot(time(1, 30), NEW_YORK)
+        first = slot.next_after(utc(2026, 11, 1, 0, 0))
+        # First occurrence (EDT); the repeated 01:30 EST is not a second run
+        self.assertEqual(first, utc(2026, 11, 1, 5, 30))
+        self.assertEqual(slot.next_after(first), utc(2026, 11, 2, 6, 30))
+
+    def test_offset_phase_keeps_the_slot_day(self):
+        prefetch = ScheduleSlot(time(7, 0), NEW_YORK).with_phase('prefetch', timedelta(minutes=-10))
+        self.assertEqual(prefetch.next_after(utc(2026, 3, 8, 0, 0)), utc(2026, 3, 8, 10, 50))
+
+
+class TestMisfirePolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.fired = []
+        self.clock = Clock(utc(2026, 5, 1, 0, 0))
+
+    def scheduler(self, policy):
+        slot = ScheduleSlot(time(7, 0), timezone.utc)
+        return SlotScheduler([slot], lambda slot, when: self.fired.append(when),
+                             clock=self.clock, misfire_policy=policy, misfire_grace=300)
+
+    def resume_after_three_days(self, policy):
+        scheduler = self.scheduler(policy)
+        self.clock.now = utc(2026, 5, 3, 12, 0)
+        with self.assertLogs('src.services.scheduler_core', 'WARNING'):
+            due = [when for when, _ in scheduler._pop_due(self.clock.now)]
+        return scheduler, due
+
+    def test_on_time_run_is_not_a_misfire(self):
+        scheduler = self.scheduler('skip')
+        self.clock.now = utc(2026, 5, 1, 7, 1)
+        self.assertEqual([when for when, _ in scheduler._pop_due(self.clock.now)], [utc(2026, 5, 1, 7, 0)])
+
+    def test_skip(self):
+        scheduler, due = self.resume_after_three_days('skip')
+        self.assertEqual(due, [])
+        self.assertEqual(scheduler.upcoming()[0][0], utc(2026, 5, 4, 7, 0))
+
+    def test_coalesce(self):
+        _, due = self.resume_after_three_days('coalesce')
+        self.assertEqual(due, [utc(2026, 5, 3, 7, 0)])
+
+    def test_catch_up(self):
+        _, due = self.resume_after_three_days('catch-up')
+        self.assertEqual(due, [utc(2026, 5, 1, 7, 0), utc(2026, 5, 2, 7, 0), utc(2026, 5, 3, 7, 0)])
+
+    def test_backwards_clock_jump_does_not_repeat_a_run(self):
+        scheduler = self.scheduler('catch-up')
+        self.clock.now = utc(2026, 5, 1, 7, 0)
+        self.assertEqual(len(scheduler._pop_due(self.clock.now)), 1)
+        self.clock.now = utc(2026, 5, 1, 6, 59)
+        self.assertEqual(scheduler._pop_due(self.clock.now), [])
+        self.clock.now = utc(2026, 5, 1, 7, 0)
+        self.assertEqual(scheduler._pop_due(self.clock.now), [])
+
+    def test_unknown_policy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.scheduler('run-twice')
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the slot scheduler...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestParseScheduleTimes))
+    suite.addTests(loader.loadTestsFromTestCase(TestDaylightSaving))
+    suite.addTests(loader.loadTestsFromTestCase(TestMisfirePolicy))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
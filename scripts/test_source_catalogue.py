@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached NewsAPI.org source catalogue
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import source_catalogue
+from src.fetchers.retry_policy import RATE_LIMITED, SERVER, ProviderError
+from src.fetchers.source_catalogue import FALLBACK_SOURCES, SourceCatalogue
+
+
+def sources_response(*ids):
+    body = {'status': 'ok', 'sources': [{'id': source, 'name': source.title()} for source in ids]}
+    return Mock(content=json.dumps(body).encode('utf-8'))
+
+
+class TestSourceCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'sources.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def catalogue(self, **kwargs):
+        return SourceCatalogue('key', self.path, **kwargs)
+
+    def test_fresh_list_is_not_fetched_again(self):
+        api = Mock(return_value=sources_response('the-hindu', 'ndtv'))
+        with patch.object(source_catalogue, 'get_with_retry', api):
+            self.assertEqual(self.catalogue().sources(), ['the-hindu', 'ndtv'])
+            self.assertEqual(self.catalogue().sources(), ['the-hindu', 'ndtv'])
+        self.assertEqual(api.call_count, 1)
+
+    def test_failed_refresh_backs_off(self):
+        api = Mock(side_effect=ProviderError(RATE_LIMITED, 'rate limited', 429))
+        with patch.object(source_catalogue, 'get_with_retry', api):
+            with self.assertLogs('src.fetchers.source_catalogue', 'WARNING'):
+                self.assertEqual(self.catalogue().sources(), FALLBACK_SOURCES)
+            # A new run (fresh object, same file) does not ask again yet
+            self.assertEqual(self.catalogue().sources(), FALLBACK_SOURCES)
+        self.assertEqual(api.call_count, 1)
+
+    def test_refresh_is_retried_after_the_interval(self):
+        with patch.object(source_catalogue, 'get_with_retry', Mock(side_effect=ProviderError(SERVER, 'down', 503))):
+            with self.assertLogs('src.fetchers.source_catalogue', 'WARNING'):
+                self.catalogue(retry_interval=60).sources()
+        with patch.object(source_catalogue, 'get_with_retry', Mock(return_value=sources_response('ndtv'))):
+            catalogue = self.catalogue(retry_interval=60)
+            catalogue._data['failed_at'] -= 120
+            self.assertEqual(catalogue.sources(), ['ndtv'])
+        self.assertEqual(catalogue._data['failed_at'], 0)
+
+    def test_error_response_counts_as_a_failure(self):
+        body = {'status': 'error', 'code': 'apiKeyInvalid', 'message': 'Your API key is invalid'}
+        api = Mock(return_value=Mock(content=json.dumps(body).encode('utf-8')))
+        with patch.object(source_catalogue, 'get_with_retry', api):
+            with self.assertLogs('src.fetchers.source_catalogue', 'WARNING') as logs:
+                self.catalogue().sources()
+            self.catalogue().sources()
+        self.assertIn('Your API key is invalid', logs.output[0])
+        self.assertEqual(api.call_count, 1)
+
+    def test_stale_list_is_kept_when_a_refresh_fails(self):
+        with patch.object(source_catalogue, 'get_with_retry', Mock(return_value=sources_response('ndtv'))):
+            self.catalogue(ttl=0).sources()
+        with patch.object(source_catalogue, 'get_with_retry', Mock(side_effect=ProviderError(SERVER, 'down', 503))):
+            with self.assertLogs('src.fetchers.source_catalogue', 'WARNING'):
+                self.assertEqual(self.catalogue(ttl=0).sources(), ['ndtv'])
+
+    def test_untried_sources_rank_first(self):
+        with patch.object(source_catalogue, 'get_with_retry', Mock(return_value=sources_response('a', 'b', 'c'))):
+            catalogue = self.catalogue()
+            catalogue.record('a', 5, 5, 1)
+            catalogue.record('b', 5, 5, 4)
+            self.assertEqual(catalogue.top(3), ['c', 'b', 'a'])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the source catalogue...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestSourceCatalogue)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for grouping articles into developing stories across runs
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.story_threads import StoryThreads
+
+LANDFALL = {'title': 'Cyclone Biparjoy makes landfall in Gujarat coast',
+            'description': 'Cyclone Biparjoy hit Kutch with strong winds', 'url': 'https://a.com/landfall'}
+REPO_RATE = {'title': 'RBI keeps repo rate unchanged at 6.5 percent',
+             'description': 'Reserve Bank policy meeting', 'url': 'https://a.com/rbi'}
+EVACUATION = {'title': 'Cyclone Biparjoy: thousands evacuated as landfall nears Gujarat',
+              'description': 'Evacuations along the Kutch coast before the cyclone', 'url': 'https://b.com/evacuation'}
+CRICKET = {'title': 'India beat Australia in World Cup final',
+           'description': 'Cricket victory', 'url': 'https://c.com/final'}
+
+
+class TestStoryThreads(unittest.TestCase):
+
+    def setUp(self):
+        self.threads = StoryThreads(None)
+
+    def test_articles_on_one_story_share_a_thread(self):
+        ids = [self.threads.assign(article, 1000.0).id for article in (LANDFALL, REPO_RATE, EVACUATION, CRICKET)]
+        self.assertEqual(ids[0], ids[2])
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_refetched_article_is_not_an_update(self):
+        first = self.threads.assign(LANDFALL, 1000.0)
+        again = self.threads.assign(dict(LANDFALL, url='https://www.a.com/landfall?utm_source=rss'), 2000.0)
+        self.assertIs(first, again)
+        self.assertEqual(again.count, 1)
+
+    def test_idle_thread_is_not_joined(self):
+        first = self.threads.assign(LANDFALL, 1000.0)
+        later = self.threads.assign(EVACUATION, 1000.0 + self.threads.ttl + 1)
+        self.assertNotEqual(first.id, later.id)
+
+    def test_collapse_keeps_one_article_per_story(self):
+        stories = self.threads.collapse([LANDFALL, REPO_RATE, EVACUATION])
+        self.assertEqual([story['title'] for story in stories], [LANDFALL['title'], REPO_RATE['title']])
+        self.assertEqual(stories[0]['story_updates'], 1)
+        self.assertEqual(stories[0]['story_related'], [{'title': EVACUATION['title'], 'url': EVACUATION['url']}])
+        self.assertNotIn('story_id', LANDFALL)
+
+    def test_story_continues_in_the_next_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'story_threads.json')
+            StoryThreads(path).collapse([LANDFALL, REPO_RATE])
+            stories = StoryThreads(path).collapse([EVACUATION, CRICKET])
+        self.assertEqual(stories[0]['story_id'], 's1')
+        self.assertEqual(stories[0]['story_updates'], 1)
+        self.assertEqual(stories[1]['story_id'], 's3')
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for story threads...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestStoryThreads)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the extractive article summarizer
+"""
+
+import os
+import sys
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers import summarizer
+from src.fetchers.summarizer import (
+    _rank_numpy, _rank_python, _terms, cache_info, clip_text, split_sentences, summarize, summarize_articles,
+)
+
+BODY = (
+    "The Reserve Bank of India kept the repo rate unchanged at 6.5 per cent on Friday. "
+    "Governor Shaktikanta Das said inflation was easing but food prices remained a risk. "
+    "The monetary policy committee voted five to one to hold the repo rate. "
+    "Markets had widely expected the pause. "
+    "Analysts said the Reserve Bank could cut the repo rate later this year if inflation keeps easing. "
+    "Separately, the weather office forecast heavy rain in Mumbai over the weekend."
+)
+
+
+class TestSummarizer(unittest.TestCase):
+
+    def setUp(self):
+        summarizer._cache.clear()
+
+    def test_sentences_keep_abbreviations(self):
+        sentences = split_sentences("Prices rose by Rs. 5 in the U.S. market. Dr. Rao disagreed. Talks end today.")
+        self.assertEqual(sentences, ["Prices rose by Rs. 5 in the U.S. market.", "Dr. Rao disagreed.",
+                                     "Talks end today."])
+
+    def test_clip_at_a_word_boundary(self):
+        self.assertEqual(clip_text('Monsoon arrives early in Kerala', 20), 'Monsoon arrives…')
+        self.assertEqual(clip_text('Short', 20), 'Short')
+
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(summarize('<p>Sensex closes higher.</p>'), 'Sensex closes higher.')
+        self.assertEqual(summarize(None), '')
+
+    def test_summary_picks_central_sentences_in_order(self):
+        summary = summarize(BODY, max_sentences=2, max_length=200)
+        self.assertLessEqual(len(summary), 200)
+        self.assertIn('repo rate', summary)
+        self.assertNotIn('Mumbai', summary)
+        chosen = split_sentences(summary)
+        self.assertEqual(len(chosen), 2)
+        self.assertLess(BODY.index(chosen[0]), BODY.index(chosen[1]))
+
+    def test_python_ranking_matches_numpy(self):
+        if summarizer.np is None:
+            self.skipTest('numpy is not installed')
+        counts = [_terms(sentence) for sentence in split_sentences(BODY)]
+        for fast, slow in zip(_rank_numpy(counts), _rank_python(counts)):
+            self.assertAlmostEqual(fast, slow, places=3)
+
+    def test_repeated_texts_are_summarized_once(self):
+        summarize(BODY)
+        summarize(BODY)
+        self.assertEqual((cache_info()['hits'], cache_info()['misses']), (1, 1))
+
+    def test_article_body_is_preferred(self):
+        articles = [{'description': 'Short description.', 'body': 'Body paragraph one.\n\nBody paragraph two.'},
+                    {'description': 'Only a description.'}]
+        self.assertEqual(summarize_articles(articles),
+                         ['Body paragraph one. Body paragraph two.', 'Only a description.'])
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the summarizer...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestSummarizer)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the text normalizer, including where it intentionally differs from the old clean_html
+"""
+
+import html
+import os
+import re
+import sys
+import unittest
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers.text_normalizer import cache_clear, cache_info, normalize_text
+
+
+def legacy_clean_html(text):
+    """clean_html as it was, to pin down the intended differences"""
+    if not text:
+        return ""
+    text = html.unescape(text)
+    return re.sub('<.*?>', '', text).strip()
+
+
+class TestTextNormalizer(unittest.TestCase):
+
+    def setUp(self):
+        cache_clear()
+
+    def test_same_as_legacy_for_simple_markup(self):
+        for text in ("<p>This is a <strong>test</strong> paragraph.</p>",
+                     "Plain text",
+                     "Tom &amp; Jerry",
+                     "  <a href=\"https://example.com\">link</a> text  ",
+                     "नई दिल्ली: <b>चुनाव</b>"):
+            self.assertEqual(normalize_text(text), legacy_clean_html(text), text)
+
+    def test_empty_input(self):
+        self.assertEqual(normalize_text(None), '')
+        self.assertEqual(normalize_text(''), '')
+
+    def test_block_tags_leave_a_space(self):
+        text = "<ul><li>Sensex up</li><li>Nifty down</li></ul>Read more<br/>here"
+        self.assertEqual(legacy_clean_html(text), "Sensex upNifty downRead morehere")
+        self.assertEqual(normalize_text(text), "Sensex up Nifty down Read more here")
+
+    def test_cdata_is_unwrapped(self):
+        text = "<![CDATA[Monsoon <b>arrives</b> early]]>"
+        self.assertEqual(legacy_clean_html(text), "arrives early]]>")
+        self.assertEqual(normalize_text(text), "Monsoon arrives early")
+
+    def test_scripts_styles_and_comments_are_dropped(self):
+        text = "<script>track('a > b')</script><style>p { color: red }</style>Budget<!-- ad --> passed"
+        self.assertEqual(normalize_text(text), "Budget passed")
+        self.assertIn("track", legacy_clean_html(text))
+
+    def test_whitespace_and_invisible_characters(self):
+        text = "Rupee\u200b  falls\n\tagainst the dollar\u00ad "
+        self.assertEqual(normalize_text(text), "Rupee falls against the dollar")
+
+    def test_escaped_markup_stays_visible(self):
+        text = "Use &lt;b&gt; for bold"
+        self.assertEqual(legacy_clean_html(text), "Use  for bold")
+        self.assertEqual(normalize_text(text), "Use <b> for bold")
+
+    def test_unicode_is_nfc(self):
+        self.assertEqual(normalize_text("Cafe\u0301"), "Caf\u00e9")
+
+    def test_unclosed_script_only_removes_the_tag(self):
+        self.assertEqual(normalize_text("<script src=x.js>Headline"), "Headline")
+
+    def test_results_are_cached_by_input(self):
+        text = "<p>Election&nbsp;results   announced</p>"
+        cleaned = normalize_text(text)
+        self.assertEqual(normalize_text(text), cleaned)
+        self.assertEqual(cache_info(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_output_does_not_depend_on_earlier_calls(self):
+        self.assertEqual(normalize_text("Use <b> for bold"), "Use for bold")
+        cache_clear()
+        # Its result is "Use <b> for bold", which must not become a cache key
+        normalize_text("Use &lt;b&gt; for bold")
+        self.assertEqual(normalize_text("Use <b> for bold"), "Use for bold")
+
+    def test_plain_text_skips_the_cache(self):
+        self.assertEqual(normalize_text(" Sensex closes higher "), "Sensex closes higher")
+        self.assertEqual(normalize_text("नई दिल्ली: चुनाव"), "नई दिल्ली: चुनाव")
+        self.assertEqual(cache_info()['size'], 0)
+        # Anything the fast path cannot settle goes the long way
+        self.assertEqual(normalize_text("Sensex\u00a0closes"), "Sensex closes")
+        self.assertEqual(normalize_text("Cafe\u0301 opens"), "Caf\u00e9 opens")
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the text normalizer...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestTextNormalizer)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for detecting bursting terms in the article stream
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.trends import TrendDetector, article_terms
+
+VOCABULARY = ['market', 'rain', 'court', 'police', 'budget', 'school', 'railway', 'farmer', 'hospital',
+              'election', 'airport', 'bridge', 'temple', 'river', 'power', 'water', 'traffic', 'tax',
+              'exam', 'festival']
+
+
+def routine_news(count=600):
+    """Articles mixing the same everyday words, enough to warm up the baseline"""
+    return [{'title': ' '.join(VOCABULARY[(i * 7 + j * 3) % len(VOCABULARY)] for j in range(5)),
+             'url': f"https://example.com/routine/{i}"} for i in range(count)]
+
+
+def breaking_news(count=6):
+    return [{'title': f"Chandrayaan lands near moon south pole, update {i}",
+             'url': f"https://example.com/moon/{i}"} for i in range(count)]
+
+
+class TestTrendDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.now = time.time()
+        self.detector = TrendDetector(None)
+
+    def warm_up(self):
+        self.detector.observe(routine_news(), self.now - 36 * 3600)
+
+    def test_article_terms(self):
+        terms = article_terms({'title': 'Supreme Court hears Narendra Modi case', 'description': 'In 2026'})
+        self.assertIn('supreme court', terms)
+        self.assertIn('narendra modi', terms)
+        self.assertNotIn('2026', terms)
+
+    def test_nothing_trends_while_warming_up(self):
+        self.detector.observe(breaking_news(), self.now)
+        self.assertEqual(self.detector.trending(now=self.now), [])
+
+    def test_new_story_bursts_and_routine_words_do_not(self):
+        self.warm_up()
+        self.detector.observe(breaking_news(), self.now - 600)
+        trending = dict(self.detector.trending(now=self.now))
+        self.assertIn('chandrayaan', trending)
+        self.assertNotIn('market', trending)
+        self.assertGreater(self.detector.score(breaking_news(1)[0], self.now), 0.5)
+        self.assertEqual(self.detector.score(routine_news(1)[0], self.now), 0.0)
+
+    def test_refetched_articles_count_once(self):
+        articles = breaking_news(3)
+        self.assertEqual(self.detector.observe(articles, self.now), 3)
+        self.assertEqual(self.detector.observe(articles, self.now), 0)
+
+    def test_trending_article_moves_up(self):
+        self.warm_up()
+        self.detector.observe(breaking_news(5), self.now - 600)
+        articles = routine_news(9)[1:] + breaking_news(6)[5:]
+        ranked = self.detector.rank(articles)
+        self.assertLess(ranked.index(articles[-1]), len(articles) - 1)
+        self.assertIn('trend_score', articles[-1])
+
+    def test_state_survives_a_restart(self):
+        self.warm_up()
+        self.detector.observe(breaking_news(), self.now - 600)
+        with tempfile.TemporaryDirectory() as directory:
+            self.detector.path = Path(directory) / 'trends.json'
+            self.detector.save()
+            restored = TrendDetector(self.detector.path)
+        self.assertEqual(restored.trending(now=self.now), self.detector.trending(now=self.now))
+        self.assertEqual(restored.observe(breaking_news(), self.now), 0)
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for the trend detector...")
+
+    # Create a test suite
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestTrendDetector)
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for canonical article URLs, redirect resolution and the URL index
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import requests
+
+# Add the project root to the path so we can import the src package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetchers.urls import RedirectCache, UrlIndex, canonical_url, resolve_urls
+
+
+class TestCanonicalUrl(unittest.TestCase):
+
+    def test_same_page_in_different_forms(self):
+        canonical = 'https://timesofindia.com/india/story'
+        for url in ('http://www.timesofindia.com/india/story/',
+                    'https://m.timesofindia.com/india/story?utm_source=twitter&utm_medium=social',
+                    'https://timesofindia.com/india/story/amp#comments',
+                    'https://TimesOfIndia.com:443/india/story?fbclid=abc'):
+            with self.subTest(url=url):
+                self.assertEqual(canonical_url(url), canonical)
+
+    def test_meaningful_query_is_kept_and_sorted(self):
+        self.assertEqual(canonical_url('https://example.com/view?id=7&page=2&utm_campaign=x'),
+                         'https://example.com/view?id=7&page=2')
+        self.assertEqual(canonical_url('https://example.com/view?page=2&id=7'),
+                         'https://example.com/view?id=7&page=2')
+
+    def test_wrappers_and_amp_caches_are_unwrapped(self):
+        target = 'https://thehindu.com/news/story'
+        self.assertEqual(canonical_url('https://www.google.com/url?q=https%3A%2F%2Fwww.thehindu.com%2Fnews%2Fstory'),
+                         target)
+        self.assertEqual(canonical_url('https://www-thehindu-com.cdn.ampproject.org/c/s/www.thehindu.com/news/story/amp/'),
+                         target)
+        self.assertEqual(canonical_url('https://l.facebook.com/l.php?u=https%3A%2F%2Fthehindu.com%2Fnews%2Fstory'),
+                         target)
+
+    def test_amp_article_paths(self):
+        self.assertEqual(canonical_url('https://timesofindia.indiatimes.com/india/x/amp_articleshow/123.cms'),
+                         canonical_url('https://timesofindia.indiatimes.com/india/x/articleshow/123.cms'))
+
+    def test_two_part_hosts_keep_their_prefix(self):
+        self.assertEqual(canonical_url('https://m.me/page'), 'https://m.me/page')
+
+    def test_non_http_urls(self):
+        self.assertEqual(canonical_url(''), '')
+        self.assertEqual(canonical_url('mailto:editor@example.com'), '')
+        self.assertEqual(canonical_url('not a url'), '')
+
+
+class TestRedirects(unittest.TestCase):
+
+    def test_shortener_links_are_resolved_once(self):
+        session = Mock()
+        session.head.return_value = Mock(url='https://thehindu.com/news/story')
+        cache = RedirectCache(None, session=session)
+        articles = [{'url': 'https://bit.ly/abc'}, {'url': 'https://bit.ly/abc'}, {'url': 'https://thehindu.com/x'}]
+        resolve_urls(articles, cache)
+        resolve_urls([{'url': 'https://bit.ly/abc'}], cache)
+        self.assertEqual([a['url'] for a in articles],
+                         ['https://thehindu.com/news/story', 'https://thehindu.com/news/story', 'https://thehindu.com/x'])
+        self.assertEqual(session.head.call_count, 1)
+
+    def test_failures_keep_the_link_and_are_cached(self):
+        session = Mock()
+        session.head.side_effect = requests.exceptions.ConnectionError('refused')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'redirects.json')
+            cache = RedirectCache(path, session=session)
+            self.assertEqual(cache.resolve('https://t.co/xyz'), 'https://t.co/xyz')
+            cache.save()
+            self.assertEqual(RedirectCache(path, session=session).resolve('https://t.co/xyz'), 'https://t.co/xyz')
+        self.assertEqual(session.head.call_count, 1)
+
+
+class TestUrlIndex(unittest.TestCase):
+
+    def test_any_form_of_a_url_is_seen(self):
+        index = UrlIndex([('https://example.com/a', 'article-1')])
+        self.assertFalse(index.add('http://www.example.com/a/?utm_source=x'))
+        self.assertTrue(index.add('https://example.com/b'))
+        self.assertEqual(index.get('https://m.example.com/a'), 'article-1')
+        self.assertIn('https://example.com/b#top', index)
+        self.assertEqual(len(index), 2)
+
+
+def run_tests():
+    """Run all tests"""
+    print("Running tests for URL helpers...")
+
+    # Create a test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestCanonicalUrl))
+    suite.addTests(loader.loadTestsFromTestCase(TestRedirects))
+    suite.addTests(loader.loadTestsFromTestCase(TestUrlIndex))
+
+    # Run the tests
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    # Return success/failure
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    if success:
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed!")
+        sys.exit(1)
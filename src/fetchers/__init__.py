@@ -4,6 +4,10 @@ News API Fetchers Module
 
 from .newsapi_fetcher import get_indian_news as get_newsapi_articles
 from .newsdata_fetcher import NewsDataFetcher
+from .registry import NewsFetcher, create_fetchers, discover_fetchers, register_fetcher
 
-__all__ = ['get_newsapi_articles', 'NewsDataFetcher']
+__all__ = [
+    'get_newsapi_articles', 'NewsDataFetcher',
+    'NewsFetcher', 'create_fetchers', 'discover_fetchers', 'register_fetcher',
+]
 
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Article Extractor
+Downloads linked article pages concurrently and extracts their main text
+"""
+
+import codecs
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    # The detector behind requests' Response.apparent_encoding
+    from requests.compat import chardet
+except ImportError:
+    chardet = None
+
+from .rate_limiter import host_slots
+from .retry_policy import ProviderError, RetryPolicy, get_with_retry
+from .text_normalizer import normalize_text
+from .urls import canonical_url
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path('state') / 'article_bodies.json'
+
+# Pages larger than this are cut off (the article text is near the top)
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Extracted text kept per article
+MAX_BODY_CHARS = 5000
+
+# Cached bodies kept; oldest are dropped first
+MAX_CACHE_ENTRIES = 2000
+
+# Failed pages are not retried for this long
+FAILURE_TTL_SECONDS = 24 * 3600
+
+MAX_WORKERS = 8
+
+# Provider placeholders that mean "no description"
+PLACEHOLDER_DESCRIPTIONS = {'', 'no description available.', 'no description available'}
+
+# One retry: a page that fails twice is not worth holding up a digest
+PAGE_POLICY = RetryPolicy(max_attempts=2, base_delay=0.5, max_delay=2.0, max_total=15.0)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; IndianNewsFetcher/1.0)'
+
+# Bytes at the top of a page searched for <meta charset> or used to guess
+# the encoding
+SNIFF_BYTES = 64 * 1024
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta\b[^>]*?charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# Subtrees that never hold article text
+_SKIP_TAGS = {'script', 'style', 'noscript', 'iframe', 'svg', 'form', 'button', 'select',
+              'nav', 'footer', 'header', 'aside', 'figure', 'template'}
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+              'param', 'source', 'track', 'wbr'}
+_PARAGRAPH_TAGS = {'p', 'pre', 'blockquote', 'li', 'h2', 'h3'}
+
+_POSITIVE_RE = re.compile(r'article|body|content|entry|main|post|story|text|blog', re.IGNORECASE)
+_NEGATIVE_RE = re.compile(
+    r'comment|footer|nav|sidebar|share|social|promo|related|menu|banner|advert|\bads?\b|'
+    r'subscribe|newsletter|widget|popup|breadcrumb|byline|caption|tags',
+    re.IGNORECASE
+)
+
+
+def decode_page(page: bytes, content_type: str = '') -> str:
+    """
+    Text of an HTML page
+
+    Uses the charset the Content-Type header or a <meta> tag declares,
+    then UTF-8 if the page is valid UTF-8, then a guess from the content.
+    (requests assumes ISO-8859-1 for text/html without a charset, which
+    garbles UTF-8 pages.)
+
+    Args:
+        page: Raw page bytes, possibly cut off mid-character
+        content_type: Content-Type header of the response
+    """
+    declared = []
+    match = _HEADER_CHARSET_RE.search(content_type or '')
+    if match:
+        declared.append(match.group(1))
+    match = _META_CHARSET_RE.search(page[:SNIFF_BYTES])
+    if match:
+        declared.append(match.group(1).decode('ascii'))
+    for encoding in declared:
+        try:
+            return page.decode(encoding, errors='replace')
+        except LookupError:
+            logger.debug(f"Unknown page charset {encoding!r}")
+
+    try:
+        # Not final: a character cut off at MAX_PAGE_BYTES is dropped
+        return codecs.getincrementaldecoder('utf-8')().decode(page)
+    except UnicodeDecodeError:
+        pass
+    encoding = chardet.detect(page[:SNIFF_BYTES]).get('encoding') if chardet is not None else None
+    try:
+        return page.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return page.decode('utf-8', errors='replace')
+
+
+class _Node:
+    __slots__ = ('tag', 'attrs', 'parent', 'children', 'text', 'link_text', 'score')
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['_Node']):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List['_Node'] = []
+        self.text: List[str] = []
+        self.link_text = 0
+        self.score = 0.0
+
+
+class _TreeBuilder(HTMLParser):
+    """Minimal DOM: element nodes with their direct text, skipping non-content subtrees"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('root', {}, None)
+        self.current = self.root
+        self.skip_depth = 0
+        self.in_link = 0
+        self.nodes: List[_Node] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag not in _VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in _SKIP_TAGS:
+            self.skip_depth = 1
+            return
+        if tag in _VOID_TAGS:
+            return
+        node = _Node(tag, {k: v or '' for k, v in attrs if k in ('class', 'id')}, self.current)
+        self.current.children.append(node)
+        self.current = node
+        self.nodes.append(node)
+        if tag == 'a':
+            self.in_link += 1
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag not in _VOID_TAGS:
+                self.skip_depth -= 1
+            return
+        # Close up to the matching open element; stray end tags are ignored
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is self.root:
+            return
+        if tag == 'a':
+            self.in_link = max(0, self.in_link - 1)
+        self.current = node.parent
+
+    def handle_data(self, data):
+        if self.skip_depth or not data.strip():
+            return
+        self.current.text.append(data)
+        if self.in_link:
+            # Count link text against the paragraph holding the link
+            node = self.current
+            while node.tag == 'a' and node.parent is not None:
+                node = node.parent
+            node.link_text += len(data.strip())
+
+
+def _class_weight(node: _Node) -> float:
+    names = f"{node.attrs.get('class', '')} {node.attrs.get('id', '')}"
+    weight = 0.0
+    if _NEGATIVE_RE.search(names):
+        weight -= 25
+    if _POSITIVE_RE.search(names):
+        weight += 25
+    return weight
+
+
+def _inner_text(node: _Node) -> str:
+    return ' '.join(text for descendant in _walk(node) for text in descendant.text)
+
+
+def extract_main_text(page: str) -> str:
+    """
+    Main article text of an HTML page (readability-style scoring)
+
+    Every paragraph with enough text scores 1 + its commas + a point per
+    100 characters (up to 3); the score goes to its parent in full and to
+    its grandparent in half. Containers are weighted by class/id names
+    (article, content... up; comments, share, related... down) and by the
+    share of their text that is links. The paragraphs of the best
+    container are the article.
+
+    Returns:
+        Plain text, '' if no plausible article body was found
+    """
+    builder = _TreeBuilder()
+    try:
+        builder.feed(page)
+        builder.close()
+    except Exception as e:
+        logger.debug(f"HTML parse error: {e}")
+
+    candidates = {}
+    for node in builder.nodes:
+        if node.tag not in _PARAGRAPH_TAGS or node.parent is None:
+            continue
+        text = normalize_text(_inner_text(node))
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(',') + min(len(text) / 100, 3)
+        parent, grandparent = node.parent, node.parent.parent
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if ancestor is None or ancestor is builder.root:
+                continue
+            if id(ancestor) not in candidates:
+                ancestor.score = _class_weight(ancestor)
+                candidates[id(ancestor)] = ancestor
+            ancestor.score += score * share
+
+    best, best_score = None, 0.0
+    for node in candidates.values():
+        text_length = len(_inner_text(node)) or 1
+        link_density = min(1.0, sum(child.link_text for child in _walk(node)) / text_length)
+        score = node.score * (1 - link_density)
+        if score > best_score:
+            best, best_score = node, score
+    if best is None:
+        return ''
+
+    paragraphs = []
+    for node in _walk(best, prune=True):
+        if node.tag in _PARAGRAPH_TAGS:
+            text = normalize_text(_inner_text(node))
+            if len(text) >= 25:
+                paragraphs.append(text)
+    return '\n\n'.join(paragraphs)
+
+
+def _walk(node: _Node, prune: bool = False):
+    """Nodes in document order; with prune, skipping share/related/... subtrees"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        children = current.children
+        if prune:
+            children = [child for child in children if _class_weight(child) >= 0]
+        stack.extend(reversed(children))
+
+
+class BodyCache:
+    """Extracted bodies by canonical URL, persisted as JSON"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries: int = MAX_CACHE_ENTRIES):
+        """
+        Args:
+            path: JSON cache file (None = memory only)
+            max_entries: Entries kept; the oldest are dropped first
+        """
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable article cache {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached entry; failures are forgotten after FAILURE_TTL_SECONDS"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and not entry['body'] and time.time() - entry['fetched_at'] > FAILURE_TTL_SECONDS:
+            return None
+        return entry
+
+    def put(self, key: str, body: str):
+        with self._lock:
+            self._entries[key] = {'body': body, 'fetched_at': time.time()}
+
+    def save(self):
+        """Write the cache atomically, dropping the oldest entries over the limit"""
+        if self.path is None:
+            return
+        with self._lock:
+            if len(self._entries) > self.max_entries:
+                newest = sorted(self._entries.items(), key=lambda item: item[1]['fetched_at'])
+                self._entries = dict(newest[-self.max_entries:])
+            data = json.dumps(self._entries)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save article cache: {e}")
+
+
+class ArticleExtractor:
+    """
+    Fetches article pages (each at most once, via the cache) and extracts
+    their body text. Downloads run on a bounded pool, within the shared
+    per-site connection limit (host_slots) and spaced by the 'article'
+    rate limit per site; pages are read up to MAX_PAGE_BYTES.
+    """
+
+    def __init__(self, cache: Optional[BodyCache] = None, max_workers: int = MAX_WORKERS,
+                 timeout: float = 10.0, session=None):
+        """
+        Args:
+            cache: Body cache (default: state/article_bodies.json)
+            max_workers: Concurrent downloads
+            timeout: Per-request timeout in seconds
+            session: requests.Session to use (default: module-level requests)
+        """
+        self.cache = cache or BodyCache()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session
+
+    def _download(self, url: str) -> Optional[str]:
+        domain = urlsplit(url).netloc.lower()
+        with host_slots.slot(domain):
+            try:
+                response = get_with_retry(url, provider='article', policy=PAGE_POLICY,
+                                          timeout=self.timeout, session=self.session,
+                                          headers={'User-Agent': USER_AGENT}, stream=True,
+                                          api_key=domain)
+            except ProviderError as e:
+                logger.info(f"Could not fetch article {url}: {e}")
+                return None
+            with response:
+                content_type = response.headers.get('Content-Type', 'text/html')
+                if 'html' not in content_type:
+                    return None
+                chunks, size = [], 0
+                try:
+                    for chunk in response.iter_content(64 * 1024):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= MAX_PAGE_BYTES:
+                            break
+                except requests.exceptions.RequestException as e:
+                    # Connection dropped or chunked encoding broken mid-page
+                    logger.info(f"Download of {url} failed: {e}")
+                    return None
+        return decode_page(b''.join(chunks)[:MAX_PAGE_BYTES], content_type)
+
+    def body(self, url: str) -> str:
+        """Extracted text of one article ('' if unavailable)"""
+        key = canonical_url(url)
+        if not key:
+            return ''
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached['body']
+        page = self._download(url)
+        body = extract_main_text(page)[:MAX_BODY_CHARS] if page else ''
+        self.cache.put(key, body)
+        return body
+
+    def enrich(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Add a 'body' to each article, fetching pages concurrently
+
+        Articles whose description is missing or a placeholder get the
+        start of the body as description. The articles are updated in place.
+
+        Returns:
+            The same list
+        """
+        urls = [article.get('url') or article.get('link') or '' for article in articles]
+        # One download per page, however many articles link to it
+        unique = {}
+        for url in urls:
+            key = canonical_url(url)
+            if key and key not in unique:
+                unique[key] = url
+        if not unique:
+            return articles
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='extract') as pool:
+            fetched = dict(zip(unique, pool.map(self.body, unique.values())))
+        self.cache.save()
+
+        bodies = [fetched.get(canonical_url(url), '') for url in urls]
+        for article, body in zip(articles, bodies):
+            if not body:
+                continue
+            article['body'] = body
+            description = (article.get('description') or '').strip().lower()
+            if description in PLACEHOLDER_DESCRIPTIONS:
+                article['description'] = body.split('\n\n', 1)[0]
+        found = sum(1 for body in bodies if body)
+        logger.info(f"Extracted article text for {found}/{len(articles)} articles")
+        return articles
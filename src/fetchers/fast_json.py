@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Fast JSON
+Decodes provider responses with the fastest available backend and keeps only the fields used
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    # 2-4x faster than the standard library and decodes bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data) -> Any:
+    """
+    Decode a JSON document (bytes or str)
+
+    Raises:
+        ValueError: The document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_response(response) -> Any:
+    """
+    Body of a response as JSON
+
+    Decodes the raw bytes, skipping the text decoding (and charset
+    detection) response.json() goes through first.
+
+    Raises:
+        ValueError: The body is not valid JSON
+    """
+    return loads(response.content)
+
+
+def project(item: Optional[Dict], fields: Iterable[str]) -> Dict:
+    """Copy of a decoded object with only the given fields (those present)"""
+    if not isinstance(item, dict):
+        return {}
+    return {field: item[field] for field in fields if field in item}
+
+
+def project_list(items: Optional[List], fields: Iterable[str]) -> List[Dict]:
+    """
+    Projected copies of a list of decoded objects
+
+    Once the projections exist, nothing references the rest of the
+    response tree and it can be freed.
+    """
+    fields = tuple(fields)
+    return [project(item, fields) for item in items or () if isinstance(item, dict)]
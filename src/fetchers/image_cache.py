@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Image Cache
+Downloads article thumbnails once, shrinks them and serves them from disk
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.image import MIMEImage
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    # Resizing and recompression when installed; originals are kept otherwise
+    from PIL import Image, UnidentifiedImageError
+except ImportError:
+    Image = None
+
+import requests
+
+from .rate_limiter import host_slots
+from .retry_policy import ProviderError, RetryPolicy, get_with_retry
+from .urls import canonical_url
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = Path('state') / 'images'
+
+# Disk budget; least recently used images are evicted beyond it
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Thumbnail box (pixels) and encoder quality
+THUMBNAIL_SIZE = (320, 180)
+WEBP_QUALITY = 70
+JPEG_QUALITY = 75
+
+# Downloads larger than this are abandoned
+MAX_DOWNLOAD_BYTES = 8 * 1024 * 1024
+
+# Without Pillow, originals up to this size are kept as they are
+MAX_ORIGINAL_BYTES = 300 * 1024
+
+# Failed images are not retried for this long
+FAILURE_TTL_SECONDS = 24 * 3600
+
+MAX_WORKERS = 16
+
+# WebP for the dashboard; JPEG for email, which many clients need
+VARIANTS = ('webp', 'jpeg')
+
+_EXTENSIONS = {'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif', 'image/webp': 'webp'}
+
+IMAGE_POLICY = RetryPolicy(max_attempts=2, base_delay=0.5, max_delay=2.0, max_total=15.0)
+
+
+def _encode(data: bytes, variant: str) -> Optional[Tuple[bytes, str]]:
+    """Thumbnail of an image as (bytes, extension), None if it is not an image"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            output = io.BytesIO()
+            if variant == 'webp':
+                image.save(output, 'WEBP', quality=WEBP_QUALITY, method=4)
+                return output.getvalue(), 'webp'
+            image.save(output, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            return output.getvalue(), 'jpg'
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError) as e:
+        logger.debug(f"Not a usable image: {e}")
+        return None
+
+
+class ImageCache:
+    """
+    Content-addressed thumbnail store
+
+    Each source image (by canonical URL) is downloaded and processed at
+    most once into small WebP and JPEG variants, stored as <sha256>.<ext>
+    so identical images share a file. An index maps source URLs to files
+    and tracks last use for size-capped LRU eviction.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES,
+                 timeout: float = 10.0, session=None):
+        """
+        Args:
+            directory: Where images and index.json are kept
+            max_bytes: Disk budget for the images
+            timeout: Per-request timeout in seconds
+            session: requests.Session to use (default: module-level requests)
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.session = session
+        # source key -> {variant: file name} ({} = failed), plus 'at' (time tried)
+        self._sources: Dict[str, Dict] = {}
+        # file name -> [size, last used]
+        self._files: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def _index_path(self) -> Path:
+        return self.directory / 'index.json'
+
+    def _load(self):
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._sources = data.get('sources', {})
+            self._files = data.get('files', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable image index {self._index_path}: {e}")
+
+    def _download(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """Image bytes and content type, None if unavailable or too large"""
+        host = urlsplit(url).netloc
+        with host_slots.slot(host):
+            try:
+                response = get_with_retry(url, provider='image', policy=IMAGE_POLICY,
+                                          timeout=self.timeout, session=self.session, stream=True,
+                                          headers={'User-Agent': 'Mozilla/5.0 (compatible; IndianNewsFetcher/1.0)'},
+                                          api_key=host)
+            except ProviderError as e:
+                logger.info(f"Could not fetch image {url}: {e}")
+                return None
+            with response:
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+                if not content_type.startswith('image/'):
+                    return None
+                chunks, size = [], 0
+                try:
+                    for chunk in response.iter_content(64 * 1024):
+                        size += len(chunk)
+                        if size > MAX_DOWNLOAD_BYTES:
+                            logger.info(f"Image too large, skipped: {url}")
+                            return None
+                        chunks.append(chunk)
+                except requests.exceptions.RequestException as e:
+                    # Connection dropped mid-body; only this image is lost
+                    logger.info(f"Download of image {url} failed: {e}")
+                    return None
+        return b''.join(chunks), content_type
+
+    def _store(self, data: bytes, extension: str) -> Optional[str]:
+        """Write data under its content hash; the file name, None if it cannot be written"""
+        name = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        path = self.directory / name
+        if not path.exists():
+            # One temporary file per writer: two URLs can yield the same
+            # image (a publisher's placeholder) and be stored concurrently
+            tmp_path = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not store image {name}: {e}")
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+                return None
+        with self._lock:
+            self._files[name] = [len(data), time.time()]
+        return name
+
+    def _process(self, url: str) -> Dict[str, str]:
+        downloaded = self._download(url)
+        if downloaded is None:
+            return {}
+        data, content_type = downloaded
+        if Image is None:
+            # Kept as is when small enough; the extension comes from the type
+            if len(data) > MAX_ORIGINAL_BYTES or content_type not in _EXTENSIONS:
+                return {}
+            name = self._store(data, _EXTENSIONS[content_type])
+            return {variant: name for variant in VARIANTS} if name else {}
+        files = {}
+        for variant in VARIANTS:
+            encoded = _encode(data, variant)
+            name = self._store(*encoded) if encoded is not None else None
+            if name is None:
+                # Not an image, or the disk is full: the image counts as failed
+                return {}
+            files[variant] = name
+        return files
+
+    def get(self, url: str) -> Dict[str, str]:
+        """
+        Local files for an image URL, downloading it the first time
+
+        Returns:
+            {variant: file name in the cache directory}; {} if unavailable
+        """
+        key = canonical_url(url)
+        if not key:
+            return {}
+        with self._lock:
+            entry = self._sources.get(key)
+        if entry is not None:
+            files = entry.get('files', {})
+            if files and all((self.directory / name).exists() for name in files.values()):
+                now = time.time()
+                with self._lock:
+                    for name in files.values():
+                        if name in self._files:
+                            self._files[name][1] = now
+                return files
+            if not files and time.time() - entry['at'] < FAILURE_TTL_SECONDS:
+                return {}
+        files = self._process(url)
+        with self._lock:
+            self._sources[key] = {'files': files, 'at': time.time()}
+        return files
+
+    def localize(self, articles: List[Dict], max_workers: int = MAX_WORKERS) -> List[Dict]:
+        """
+        Fetch the thumbnails of many articles concurrently and attach them
+
+        Each article with a usable urlToImage gets 'image_files'
+        ({variant: file name}); articles are updated in place.
+        """
+        # One download per image, however many articles (or URL variants) use it
+        unique = {}
+        for article in articles:
+            url = article.get('urlToImage') or ''
+            unique.setdefault(canonical_url(url), url)
+        unique.pop('', None)
+        if not unique:
+            return articles
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique)), thread_name_prefix='images') as pool:
+            results = dict(zip(unique, pool.map(self.get, unique.values())))
+        for article in articles:
+            files = results.get(canonical_url(article.get('urlToImage') or ''))
+            if files:
+                article['image_files'] = files
+        self.evict()
+        self.save()
+        found = sum(1 for files in results.values() if files)
+        logger.info(f"Thumbnails ready for {found}/{len(unique)} images")
+        return articles
+
+    def path(self, name: str) -> Path:
+        """Absolute path of a cached file"""
+        return (self.directory / name).resolve()
+
+    def mime_images(self, articles: List[Dict]) -> List[MIMEImage]:
+        """
+        JPEG thumbnails as inline MIME parts for an email
+
+        Sets each article's 'image_cid' so the template can use
+        src="cid:<image_cid>"; attach the parts to a multipart/related message.
+        """
+        parts, added = [], set()
+        for article in articles:
+            name = (article.get('image_files') or {}).get('jpeg')
+            if not name:
+                continue
+            cid = name.split('.')[0][:16]
+            article['image_cid'] = cid
+            if cid in added:
+                continue
+            try:
+                data = (self.directory / name).read_bytes()
+            except OSError:
+                article.pop('image_cid')
+                continue
+            part = MIMEImage(data)
+            part.add_header('Content-ID', f"<{cid}>")
+            part.add_header('Content-Disposition', 'inline', filename=name)
+            parts.append(part)
+            added.add(cid)
+        return parts
+
+    def evict(self):
+        """Delete least recently used files until the cache fits max_bytes"""
+        with self._lock:
+            total = sum(size for size, _ in self._files.values())
+            if total <= self.max_bytes:
+                return
+            evicted = set()
+            for name, (size, _) in sorted(self._files.items(), key=lambda item: item[1][1]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    (self.directory / name).unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Could not evict {name}: {e}")
+                    continue
+                total -= size
+                evicted.add(name)
+            for name in evicted:
+                del self._files[name]
+            # Sources pointing at evicted files are downloaded again when needed
+            self._sources = {
+                key: entry for key, entry in self._sources.items()
+                if not evicted & set(entry.get('files', {}).values())
+            }
+        logger.info(f"Evicted {len(evicted)} cached images")
+
+    def save(self):
+        """Write the index atomically"""
+        with self._lock:
+            data = json.dumps({'sources': self._sources, 'files': self._files})
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            logger.error(f"Failed to save image index: {e}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Incremental Fetch Cache
+Per-query high-water marks and cached article windows, persisted across runs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .urls import canonical_url
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path('state') / 'fetch_cache.json'
+
+# Cached articles older than this are dropped from a query's window
+DEFAULT_WINDOW_HOURS = 24
+
+# Parameters that do not change which articles a query matches
+_IGNORED_PARAMS = {'apiKey', 'apikey', 'page', 'pageSize', 'from', 'page_token'}
+
+
+def query_key(url: str, params: Dict) -> str:
+    """Stable cache key for an endpoint + query, without credentials or paging"""
+    parts = [url] + [f"{k}={params[k]}" for k in sorted(params) if k not in _IGNORED_PARAMS]
+    return hashlib.sha256('&'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def published_at(article: Dict) -> Optional[datetime]:
+    """Article publish time as an aware datetime, None if missing or unparsable"""
+    value = article.get('publishedAt') or article.get('pubDate')
+    if not value:
+        return None
+    try:
+        # NewsAPI: 2024-01-31T06:15:00Z, NewsData.io: 2024-01-31 06:15:00
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def article_id(article: Dict) -> str:
+    url = article.get('url') or article.get('link') or ''
+    return article.get('article_id') or canonical_url(url) or url or article.get('title', '')
+
+
+class IncrementalCache:
+    """
+    For each query: the newest publish time seen (the high-water mark) and
+    the window of articles it returned, newest first. A run only needs to
+    ask the provider for articles past the mark; the rest come from here.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, window_hours: float = DEFAULT_WINDOW_HOURS):
+        """
+        Args:
+            path: JSON state file (None = keep in memory only)
+            window_hours: Maximum age of cached articles
+        """
+        self.path = Path(path) if path else None
+        self.window = timedelta(hours=window_hours)
+        self._queries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._queries is not None:
+            return self._queries
+        self._queries = {}
+        if self.path is None:
+            return self._queries
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._queries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable fetch cache {self.path}: {e}")
+        return self._queries
+
+    def high_water(self, key: str) -> Optional[datetime]:
+        """Newest publish time seen for a query, None on a cold cache"""
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry or not entry.get('high_water'):
+            return None
+        return published_at({'publishedAt': entry['high_water']})
+
+    def merge(self, key: str, fresh: List[Dict], limit: int) -> List[Dict]:
+        """
+        Merge newly fetched articles into a query's window
+
+        Args:
+            key: Query key
+            fresh: Articles just returned by the provider
+            limit: Window size (what a full, non-incremental fetch returns)
+
+        Returns:
+            The updated window, newest first
+        """
+        cutoff = datetime.now(timezone.utc) - self.window
+        with self._lock:
+            entry = self._load().setdefault(key, {'high_water': None, 'articles': []})
+            merged = {article_id(a): a for a in entry['articles']}
+            # Fresh copies win (edited titles, updated images)
+            merged.update((article_id(a), a) for a in fresh)
+
+            dated = [(published_at(a), a) for a in merged.values()]
+            floor = datetime.min.replace(tzinfo=timezone.utc)
+            window = [a for moment, a in sorted(dated, key=lambda item: item[0] or floor, reverse=True)
+                      if moment is None or moment >= cutoff][:limit]
+
+            newest = max((m for m, _ in dated if m is not None), default=None)
+            if newest is not None:
+                entry['high_water'] = newest.isoformat()
+            entry['articles'] = window
+        return list(window)
+
+    def save(self):
+        """Write the cache atomically"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._load())
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save fetch cache: {e}")
+
+
+_default_cache: Optional[IncrementalCache] = None
+
+
+def get_default_cache() -> IncrementalCache:
+    """Process-wide cache at DEFAULT_CACHE_PATH"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IncrementalCache()
+    return _default_cache
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Link Checker
+Checks digest links concurrently and flags dead or paywalled ones before rendering
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .rate_limiter import host_slots
+from .urls import canonical_url
+
+
+logger = logging.getLogger(__name__)
+
+OK = 'ok'
+BROKEN = 'broken'
+PAYWALLED = 'paywalled'
+# Timeouts, server errors, bot blocking: the link may well work for a reader
+UNKNOWN = 'unknown'
+
+DEFAULT_CACHE_PATH = Path('state') / 'link_health.json'
+
+# How long a result is trusted; unknown results are retried next run
+CACHE_TTL_SECONDS = {OK: 12 * 3600, PAYWALLED: 24 * 3600, BROKEN: 3600}
+
+# Connect and read timeouts: a link that slow is left unchecked, not dropped
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 5.0
+
+# All links of a digest at once: checking takes about one round trip
+MAX_WORKERS = 64
+
+# When more than this share of a batch (of at least GUARD_MIN_LINKS) looks
+# broken, the problem is almost certainly on this side (network or DNS
+# outage) and nothing is dropped
+GUARD_BROKEN_SHARE = 0.5
+GUARD_MIN_LINKS = 4
+
+# getaddrinfo errors that positively say the host does not exist; others
+# (EAI_AGAIN, no resolver) say nothing about the link
+_NO_SUCH_HOST = {code for code in (getattr(socket, 'EAI_NONAME', None), getattr(socket, 'EAI_NODATA', None))
+                 if code is not None}
+
+# HEAD answers that mean "ask with GET instead"
+_HEAD_UNSUPPORTED = {403, 405, 406, 429, 501}
+
+USER_AGENT = 'Mozilla/5.0 (compatible; IndianNewsFetcher/1.0)'
+
+
+def classify_status(status: int) -> str:
+    """Link status for an HTTP status code (after redirects)"""
+    if 200 <= status < 400:
+        return OK
+    if status in (401, 402):
+        return PAYWALLED
+    if status in (404, 410, 451):
+        return BROKEN
+    return UNKNOWN
+
+
+def host_missing(host: str) -> bool:
+    """Whether DNS positively reports that a host does not exist (NXDOMAIN)"""
+    try:
+        socket.getaddrinfo(host, None)
+    except socket.gaierror as e:
+        return e.errno in _NO_SUCH_HOST
+    except (OSError, UnicodeError):
+        return False
+    return False
+
+
+class LinkCache:
+    """Link status by canonical URL with per-status TTLs, persisted as JSON"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        """
+        Args:
+            path: JSON cache file (None = memory only)
+        """
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable link cache {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached status, None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.time() - entry[1] > CACHE_TTL_SECONDS.get(entry[0], 0):
+            return None
+        return entry[0]
+
+    def put(self, key: str, status: str):
+        if status in CACHE_TTL_SECONDS:
+            with self._lock:
+                self._entries[key] = [status, time.time()]
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def save(self):
+        """Write the cache atomically, dropping expired entries"""
+        if self.path is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items()
+                             if now - entry[1] <= CACHE_TTL_SECONDS.get(entry[0], 0)}
+            data = json.dumps(self._entries)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save link cache: {e}")
+
+
+class LinkChecker:
+    """
+    HEAD-checks links concurrently (falling back to a one-byte ranged GET
+    where HEAD is refused), within the shared per-site connection limit
+    """
+
+    def __init__(self, cache: Optional[LinkCache] = None, max_workers: int = MAX_WORKERS,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), session=None):
+        """
+        Args:
+            cache: Status cache (default: state/link_health.json)
+            max_workers: Concurrent checks
+            timeout: requests timeout, seconds or (connect, read)
+            session: requests.Session to use (default: module-level requests)
+        """
+        self.cache = cache or LinkCache()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session
+
+    def _request(self, url: str) -> str:
+        http = self.session or requests
+        headers = {'User-Agent': USER_AGENT}
+        try:
+            response = http.head(url, allow_redirects=True, timeout=self.timeout, headers=headers)
+            response.close()
+            if response.status_code in _HEAD_UNSUPPORTED:
+                headers['Range'] = 'bytes=0-0'
+                response = http.get(url, allow_redirects=True, timeout=self.timeout,
+                                    headers=headers, stream=True)
+                response.close()
+        except requests.exceptions.Timeout:
+            return UNKNOWN
+        except requests.exceptions.ConnectionError:
+            # Only a host that does not exist is dead; resets, TLS errors and
+            # a resolver or network outage on this side are not the link's fault
+            host = urlsplit(url).hostname
+            return BROKEN if host and host_missing(host) else UNKNOWN
+        except requests.exceptions.RequestException:
+            return UNKNOWN
+        if response.status_code == 403:
+            # Usually bot protection, which a browser gets past
+            return UNKNOWN
+        return classify_status(response.status_code)
+
+    def status(self, url: str) -> str:
+        """Status of one link (cached)"""
+        key = canonical_url(url)
+        if not key:
+            return BROKEN
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        with host_slots.slot(urlsplit(url).netloc):
+            status = self._request(url)
+        self.cache.put(key, status)
+        return status
+
+    def check(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Status of many links, checked concurrently; keys are the given URLs
+
+        If most of them look broken, the check is treated as failed and
+        they are reported as unknown instead.
+        """
+        unique = list(dict.fromkeys(url for url in urls if url))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique)),
+                                thread_name_prefix='linkcheck') as pool:
+            statuses = dict(zip(unique, pool.map(self.status, unique)))
+        broken = [url for url, status in statuses.items() if status == BROKEN]
+        if len(statuses) >= GUARD_MIN_LINKS and len(broken) > GUARD_BROKEN_SHARE * len(statuses):
+            logger.error(f"{len(broken)}/{len(statuses)} links look broken; assuming a network "
+                         f"problem on this side and keeping them")
+            for url in broken:
+                statuses[url] = UNKNOWN
+                self.cache.discard(canonical_url(url))
+        self.cache.save()
+        return statuses
+
+    def filter_articles(self, articles: List[Dict], drop_broken: bool = True) -> List[Dict]:
+        """
+        Mark each article's 'link_status' and drop those with dead links
+
+        Articles without a URL are kept unmarked; paywalled links are kept
+        (marked) so renderers can label them.
+
+        Args:
+            articles: Articles, updated in place
+            drop_broken: Remove articles whose link is broken
+
+        Returns:
+            The articles to render
+        """
+        statuses = self.check([article.get('url') or '' for article in articles])
+        kept = []
+        for article in articles:
+            status = statuses.get(article.get('url') or '')
+            if status is not None:
+                article['link_status'] = status
+            if status == BROKEN and drop_broken:
+                logger.info(f"Dropping article with dead link: {article.get('url')}")
+                continue
+            kept.append(article)
+        counts = {}
+        for status in statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+        if counts:
+            logger.info(f"Checked {len(statuses)} links: {counts}")
+        return kept
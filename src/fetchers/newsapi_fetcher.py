@@ -4,61 +4,217 @@ NewsAPI.org Fetcher
 Fetches Indian news from NewsAPI.org
 """
 
-import requests
-from typing import List, Dict
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
 
+from .fast_json import decode_response, project
+from .incremental import IncrementalCache, article_id, get_default_cache, published_at, query_key
+from .registry import NewsFetcher, register_fetcher
+from .retry_policy import AUTH, DEFAULT_POLICY, ProviderError, get_with_retry
+from .text_normalizer import normalize_text
+from .urls import UrlIndex
 
-def get_indian_news(api_key: str) -> List[Dict]:
+
+# Articles per page in a full fetch
+PAGE_SIZE = 20
+
+# Page size once a query has a high-water mark; most runs only find a
+# handful of new headlines
+INCREMENTAL_PAGE_SIZE = 5
+
+# NewsAPI returns at most 100 results per query
+MAX_RESULTS = 100
+
+# Endpoints that accept a `from` publish-time filter
+ENDPOINTS_WITH_FROM = {'https://newsapi.org/v2/everything'}
+
+# Fields of an article the pipeline uses; the rest of the response
+# (notably the truncated 'content') is dropped on decode
+ARTICLE_FIELDS = ('source', 'author', 'title', 'description', 'url', 'urlToImage', 'publishedAt')
+SOURCE_FIELDS = ('id', 'name')
+
+# Queries in priority order; better quality sources first
+QUERIES = [
+    {'country': 'in'},  # India (broader search)
+    {'sources': 'google-news-in'},  # Google News India
+    {'q': 'India'},  # Search for India
+]
+
+
+def normalize_article(article: Dict) -> Optional[Dict]:
     """
-    Fetch top headlines from Indian news sources using NewsAPI.org
-    
+    Article with plain-text title and description, or None if it should be skipped
+
+    Only ARTICLE_FIELDS are kept. Untitled articles and generic
+    "Google News" entries are skipped.
+    """
+    title = normalize_text(article.get('title'))
+    if not title or title.startswith('Google News'):
+        return None
+    normalized = project(article, ARTICLE_FIELDS)
+    normalized['title'] = title
+    normalized['description'] = normalize_text(article.get('description'))
+    normalized['source'] = project(article.get('source'), SOURCE_FIELDS) or {'name': 'Unknown'}
+    return normalized
+
+
+def iter_pages(url: str, params: Dict, api_key: str, deadline: float,
+               page_size: int = PAGE_SIZE) -> Iterator[List[Dict]]:
+    """
+    Yield one page of normalized articles at a time
+
+    The next page is only requested when the consumer asks for it, and
+    paging stops at a short page or the end of the results.
+    """
+    params = dict(params, apiKey=api_key, pageSize=str(page_size))
+    for page in range(1, MAX_RESULTS // page_size + 1):
+        params['page'] = str(page)
+        response = get_with_retry(url, params=params, provider='newsapi',
+                                  deadline=deadline, api_key=api_key)
+        data = decode_response(response)
+        if data.get('status') != 'ok':
+            return
+        raw = data.get('articles') or []
+        returned, total = len(raw), data.get('totalResults', 0)
+        articles = [article for article in map(normalize_article, raw) if article]
+        # Only the projected articles outlive the page, not the response tree
+        del response, data, raw
+        yield articles
+        if returned < page_size or page * page_size >= total:
+            return
+
+
+def iter_query(url: str, params: Dict, api_key: str, deadline: float,
+               cache: IncrementalCache) -> Iterator[Dict]:
+    """
+    Yield a query's articles: new ones from the provider, then the cached window
+
+    On a cold cache the query is paged from the start for as long as the
+    consumer keeps reading. With a high-water mark, endpoints with a `from`
+    filter get it; top-headlines has none, so it is read in small pages,
+    stopping at the first page that reaches the mark. Whatever was fetched
+    is merged into the cache even if the consumer stops early.
+    """
+    key = query_key(url, params)
+    since = cache.high_water(key)
+    fresh = []
+    merged = False
+    try:
+        if since is None or url in ENDPOINTS_WITH_FROM:
+            if since is not None:
+                params = dict(params, **{'from': since.strftime('%Y-%m-%dT%H:%M:%S')})
+            for page in iter_pages(url, params, api_key, deadline):
+                fresh.extend(page)
+                yield from page
+        else:
+            for page in iter_pages(url, params, api_key, deadline, INCREMENTAL_PAGE_SIZE):
+                new = [a for a in page if (published_at(a) or since) > since]
+                fresh.extend(new)
+                yield from new
+                if len(new) < len(page):
+                    break
+
+        seen = {article_id(a) for a in fresh}
+        window = cache.merge(key, fresh, PAGE_SIZE)
+        merged = True
+        yield from (a for a in window if article_id(a) not in seen)
+    finally:
+        if not merged:
+            cache.merge(key, fresh, PAGE_SIZE)
+
+
+def iter_articles(api_key: str, deadline: Optional[float] = None,
+                  cache: Optional[IncrementalCache] = None) -> Iterator[Dict]:
+    """
+    Stream normalized NewsAPI.org articles, query by query
+
+    A query that fails still yields its cached window; an auth failure
+    ends the stream, since every query uses the same key.
+
     Args:
         api_key: NewsAPI.org API key
-    
-    Returns:
-        List of news articles
+        deadline: time.monotonic() after which no more retries are started
+        cache: Incremental fetch cache (default: state/fetch_cache.json)
     """
-    # Try different sources to get better quality articles
-    sources = [
-        {'country': 'in'},  # India (broader search)
-        {'sources': 'google-news-in'},  # Google News India
-        {'q': 'India'},  # Search for India
-    ]
-    
-    all_articles = []
-    
-    for source_params in sources:
-        url = "https://newsapi.org/v2/top-headlines"
-        params = source_params.copy()
-        params['apiKey'] = api_key
-        params['pageSize'] = '20'
-        
+    if deadline is None:
+        deadline = time.monotonic() + DEFAULT_POLICY.max_total
+    cache = cache or get_default_cache()
+    url = "https://newsapi.org/v2/top-headlines"
+
+    for params in QUERIES:
         try:
-            response = requests.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data['status'] == 'ok' and data.get('articles'):
-                    # Filter out generic "Google News" titles
-                    filtered_articles = [
-                        article for article in data['articles']
-                        if article.get('title') and not article['title'].startswith('Google News')
-                    ]
-                    all_articles.extend(filtered_articles)
-                    
-        except requests.exceptions.RequestException as e:
+            yield from iter_query(url, params, api_key, deadline, cache)
+        except (ProviderError, ValueError) as e:
             print(f"Error fetching news from NewsAPI.org: {e}")
-    
-    # Remove duplicates based on title
+            if isinstance(e, ProviderError) and e.kind == AUTH:
+                return
+            yield from cache.merge(query_key(url, params), [], PAGE_SIZE)
+
+
+def take_unique(articles: Iterable[Dict], count: int) -> List[Dict]:
+    """
+    Pull articles until `count` unique ones (by title and canonical URL) are found
+
+    Args:
+        articles: Article stream; it is not read past the last article needed
+        count: Number of articles wanted
+
+    Returns:
+        Up to `count` articles, in stream order
+    """
     seen_titles = set()
-    unique_articles = []
-    for article in all_articles:
+    seen_urls = UrlIndex()
+    selected = []
+    for article in articles:
         title = article.get('title', '').strip()
-        if title and title not in seen_titles:
-            seen_titles.add(title)
-            unique_articles.append(article)
-    
-    # Return top 10 unique articles
-    return unique_articles[:10] if unique_articles else []
+        if not title or title in seen_titles or not seen_urls.add(article.get('url') or ''):
+            continue
+        seen_titles.add(title)
+        selected.append(article)
+        if len(selected) >= count:
+            break
+    return selected
+
+
+def get_indian_news(api_key: str, deadline: Optional[float] = None,
+                    cache: Optional[IncrementalCache] = None, max_articles: int = 10) -> List[Dict]:
+    """
+    Fetch top headlines from Indian news sources using NewsAPI.org
+
+    Pages are requested only until `max_articles` unique articles have
+    been collected.
+
+    Args:
+        api_key: NewsAPI.org API key
+        deadline: time.monotonic() after which no more retries are started
+        cache: Incremental fetch cache (default: state/fetch_cache.json)
+        max_articles: Number of unique articles wanted
+
+    Returns:
+        List of news articles
+    """
+    cache = cache or get_default_cache()
+    stream = iter_articles(api_key, deadline, cache)
+    try:
+        return take_unique(stream, max_articles)
+    finally:
+        # Closing the stream merges what the open query fetched
+        stream.close()
+        cache.save()
+
+
+@register_fetcher
+class NewsAPIFetcher(NewsFetcher):
+    """NewsAPI.org top headlines for India"""
+
+    name = 'newsapi'
+    requests_per_fetch = len(QUERIES)
+
+    @classmethod
+    def is_configured(cls, config: dict) -> bool:
+        api_key = config.get('NEWS_API_KEY')
+        return bool(api_key) and not api_key.startswith('your_')
 
+    def fetch(self, max_articles: int, deadline: float) -> List[Dict]:
+        return get_indian_news(self.config['NEWS_API_KEY'], deadline=deadline,
+                               max_articles=max_articles)
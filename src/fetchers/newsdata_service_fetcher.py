@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+NewsData.io Fetcher Plugin
+Registers NewsData.io with the fetcher registry, fetching through NewsService
+"""
+
+import logging
+from typing import Dict, List
+
+from .registry import NewsFetcher, register_fetcher
+
+
+logger = logging.getLogger(__name__)
+
+
+@register_fetcher
+class NewsDataServiceFetcher(NewsFetcher):
+    """NewsData.io through NewsService, restricted to its own key"""
+
+    name = 'newsdata'
+    requests_per_fetch = 6  # 5 hot categories + general
+
+    @classmethod
+    def is_configured(cls, config: dict) -> bool:
+        api_key = config.get('NEWSDATA_API_KEY')
+        return bool(api_key) and not api_key.startswith('your_')
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        # Imported here so the fetchers package does not depend on the
+        # services package just to be discovered
+        from ..services.provider_router import single_provider_services
+        self.service = single_provider_services(config, ['newsdata'])['newsdata']
+
+    def fetch(self, max_articles: int, deadline: float) -> List[Dict]:
+        articles, _ = self.service.fetch_news(max_articles=max_articles)
+        return articles
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+Client-side token buckets per provider and API key, shared across threads
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Default limits as "<requests>/<period>[,<burst>]"; override with
+# <PROVIDER>_RATE_LIMIT (e.g. NEWSAPI_RATE_LIMIT=2/s,5)
+DEFAULT_RATE_LIMITS = {
+    'newsapi': '2/s,5',
+    'newsdata': '30/15min,6',
+    # Per site, for article pages (see article_extractor)
+    'article': '1/s,2',
+    # Per host, for thumbnails (image CDNs; see image_cache)
+    'image': '8/s,16',
+    # Per host, for following shortener and Google News redirects (see urls)
+    'redirect': '10/s,20',
+}
+
+# Waits longer than this are logged
+SLOW_WAIT_SECONDS = 1.0
+
+_PERIOD_UNITS = {'s': 1, 'sec': 1, 'min': 60, 'm': 60, 'h': 3600}
+_SPEC_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*/\s*(\d*)\s*([a-z]+)\s*(?:,\s*(\d+))?\s*$')
+
+
+def parse_rate_limit(spec: str) -> Tuple[float, float]:
+    """
+    Parse a "<requests>/<period>[,<burst>]" limit, e.g. "2/s,5" or "30/15min"
+
+    Returns:
+        (tokens per second, bucket capacity); the burst defaults to the
+        request count
+
+    Raises:
+        ValueError: The spec is malformed
+    """
+    match = _SPEC_RE.match(spec.lower())
+    if not match or match.group(3) not in _PERIOD_UNITS:
+        raise ValueError(f"Invalid rate limit '{spec}' (expected e.g. 2/s, 30/15min,6)")
+    count = float(match.group(1))
+    period = int(match.group(2) or 1) * _PERIOD_UNITS[match.group(3)]
+    burst = float(match.group(4)) if match.group(4) else count
+    if count <= 0 or burst < 1:
+        raise ValueError(f"Invalid rate limit '{spec}' (rate and burst must be positive)")
+    return count / period, burst
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second
+
+    Callers reserve a token under the lock and then wait outside it for
+    their reservation to mature, so concurrent callers are spaced out in
+    arrival order instead of all retrying at once.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Largest burst allowed after an idle period
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, timeout: Optional[float]) -> Optional[float]:
+        """Reserve one token; returns the wait, or None if it exceeds timeout"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if timeout is not None and wait > timeout:
+                return None
+            # May go negative: later callers queue behind this reservation
+            self.tokens -= 1
+            self.acquired += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Take one token, sleeping until it is available
+
+        Args:
+            timeout: Longest acceptable wait in seconds (None = no limit)
+
+        Returns:
+            Seconds waited, or None if the wait would exceed the timeout
+        """
+        wait = self._reserve(timeout)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Like acquire(), but yields to the event loop while waiting"""
+        wait = self._reserve(timeout)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Withhold tokens for `seconds`, e.g. after the server sent Retry-After"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'acquired': self.acquired,
+                'total_wait': round(self.total_wait, 3),
+                'max_wait': round(self.max_wait, 3),
+            }
+
+
+class RateLimiterRegistry:
+    """Token buckets keyed by provider and API key (keys are stored hashed)"""
+
+    def __init__(self, limits: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            limits: Provider name -> rate limit spec
+        """
+        self._limits = dict(DEFAULT_RATE_LIMITS, **(limits or {}))
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict):
+        """
+        Apply <PROVIDER>_RATE_LIMIT settings
+
+        Buckets already handed out keep their state; only their rate and
+        capacity change. Malformed settings are logged and ignored.
+        """
+        limits = dict(DEFAULT_RATE_LIMITS)
+        for provider in DEFAULT_RATE_LIMITS:
+            spec = config.get(f"{provider.upper()}_RATE_LIMIT")
+            if not spec:
+                continue
+            try:
+                parse_rate_limit(spec)
+                limits[provider] = spec
+            except ValueError as e:
+                logger.error(f"{e}; keeping {limits[provider]} for {provider}")
+
+        with self._lock:
+            self._limits = limits
+            for (provider, _), bucket in self._buckets.items():
+                rate, capacity = parse_rate_limit(self._spec(provider))
+                with bucket._lock:
+                    bucket.rate, bucket.capacity = rate, capacity
+                    bucket.tokens = min(bucket.tokens, capacity)
+
+    def _spec(self, provider: str) -> str:
+        return self._limits.get(provider) or self._limits.get('default', '5/s')
+
+    def bucket(self, provider: str, api_key: Optional[str] = None) -> TokenBucket:
+        """The shared bucket for a provider/API key pair"""
+        digest = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+        key = (provider, digest)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(*parse_rate_limit(self._spec(provider)))
+            return self._buckets[key]
+
+    def acquire(self, provider: str, api_key: Optional[str] = None,
+                timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Wait for a request slot (see TokenBucket.acquire)
+
+        Returns:
+            Seconds waited, or None if the wait would exceed the timeout
+        """
+        wait = self.bucket(provider, api_key).acquire(timeout)
+        if wait and wait >= SLOW_WAIT_SECONDS:
+            logger.info(f"Rate limiter held {provider} request for {wait:.1f}s")
+        return wait
+
+    async def acquire_async(self, provider: str, api_key: Optional[str] = None,
+                            timeout: Optional[float] = None) -> Optional[float]:
+        """Async variant of acquire()"""
+        return await self.bucket(provider, api_key).acquire_async(timeout)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Acquisitions and wait times per provider (summed over API keys)"""
+        with self._lock:
+            buckets = list(self._buckets.items())
+        totals: Dict[str, Dict[str, float]] = {}
+        for (provider, _), bucket in buckets:
+            entry = totals.setdefault(provider, {'acquired': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+            stats = bucket.stats()
+            entry['acquired'] += stats['acquired']
+            entry['total_wait'] += stats['total_wait']
+            entry['max_wait'] = max(entry['max_wait'], stats['max_wait'])
+        return totals
+
+
+rate_limiters = RateLimiterRegistry()
+
+
+class HostSlots:
+    """
+    Per-host concurrency limits shared by every stage that hits publisher
+    sites (article pages, link checks), so together they never open more
+    than `limit` connections to one site
+    """
+
+    def __init__(self, limit: int = 4):
+        self.limit = limit
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, host: str) -> threading.BoundedSemaphore:
+        """Semaphore for a host; use as a context manager around each request"""
+        host = host.lower()
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.limit)
+            return self._slots[host]
+
+
+host_slots = HostSlots()
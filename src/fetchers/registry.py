@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Fetcher Registry
+Plugin interface for news providers, discovered from built-ins, entry points and config
+"""
+
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party packages use to add fetchers
+ENTRY_POINT_GROUP = 'news_agent.fetchers'
+
+# Modules (relative to this package) whose fetchers register themselves on import
+BUILTIN_MODULES = ['.newsapi_fetcher', '.newsdata_service_fetcher', '.rss_fetcher']
+
+_registry: Dict[str, Type['NewsFetcher']] = {}
+
+
+class NewsFetcher(ABC):
+    """
+    A news provider
+
+    Subclasses set `name`, implement `fetch()` and, if the provider needs
+    credentials, `is_configured()`. Articles may be in the provider's own
+    shape; the aggregator normalizes them.
+    """
+
+    # Unique provider name, also the prefix of its config keys
+    name = ''
+
+    # API requests one fetch() is expected to make, to check the daily quota
+    # beforehand; the HTTP attempts it actually makes are what gets counted
+    requests_per_fetch = 1
+
+    # Default seconds a fetch may take (override with <NAME>_TIMEOUT_SECONDS)
+    timeout = 30.0
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+
+    @classmethod
+    def is_configured(cls, config: dict) -> bool:
+        """Whether the configuration has what this fetcher needs"""
+        return True
+
+    @abstractmethod
+    def fetch(self, max_articles: int, deadline: float) -> List[Dict]:
+        """
+        Fetch articles
+
+        Args:
+            max_articles: Number of articles wanted
+            deadline: time.monotonic() by which the fetch should finish
+
+        Returns:
+            Articles, best first
+        """
+
+
+def register_fetcher(cls: Type[NewsFetcher]) -> Type[NewsFetcher]:
+    """Class decorator adding a fetcher to the registry"""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} has no name")
+    if cls.name in _registry and _registry[cls.name] is not cls:
+        logger.warning(f"Fetcher '{cls.name}' redefined by {cls.__module__}.{cls.__name__}")
+    _registry[cls.name] = cls
+    return cls
+
+
+def _load_class(spec: str) -> Optional[Type[NewsFetcher]]:
+    """Import a "package.module:ClassName" spec"""
+    module_name, _, class_name = spec.partition(':')
+    try:
+        module = importlib.import_module(module_name.strip())
+        return getattr(module, class_name.strip()) if class_name else None
+    except (ImportError, AttributeError) as e:
+        logger.error(f"Failed to load fetcher plugin '{spec}': {e}")
+        return None
+
+
+def discover_fetchers(config: Optional[dict] = None) -> Dict[str, Type[NewsFetcher]]:
+    """
+    Every known fetcher class, by name
+
+    Sources: built-in modules, installed `news_agent.fetchers` entry points,
+    and FETCHER_PLUGINS (comma-separated "module:Class" specs) in config.
+    """
+    for module_name in BUILTIN_MODULES:
+        try:
+            importlib.import_module(module_name, __package__)
+        except ImportError as e:
+            logger.error(f"Failed to load built-in fetchers from {module_name}: {e}")
+
+    try:
+        from importlib.metadata import entry_points
+        found = entry_points()
+        plugins = (found.select(group=ENTRY_POINT_GROUP) if hasattr(found, 'select')
+                   else found.get(ENTRY_POINT_GROUP, []))
+        for entry_point in plugins:
+            try:
+                register_fetcher(entry_point.load())
+            except Exception as e:
+                logger.error(f"Failed to load fetcher entry point '{entry_point.name}': {e}")
+    except ImportError:
+        pass
+
+    for spec in ((config or {}).get('FETCHER_PLUGINS') or '').split(','):
+        if spec.strip():
+            cls = _load_class(spec)
+            if cls is not None:
+                register_fetcher(cls)
+
+    return dict(_registry)
+
+
+def create_fetchers(config: dict) -> List[NewsFetcher]:
+    """
+    Instantiate the enabled, configured fetchers
+
+    FETCHERS lists enabled names in preference order; by default every
+    discovered fetcher whose configuration is complete is enabled, with
+    API_PREFERENCE first.
+    """
+    available = discover_fetchers(config)
+    enabled = [name.strip().lower() for name in (config.get('FETCHERS') or '').split(',') if name.strip()]
+    for name in enabled:
+        if name not in available:
+            logger.error(f"Unknown fetcher '{name}' in FETCHERS (known: {', '.join(sorted(available))})")
+
+    if not enabled:
+        preferred = (config.get('API_PREFERENCE') or 'newsapi').lower()
+        enabled = sorted(available, key=lambda name: name != preferred)
+
+    fetchers = []
+    for name in enabled:
+        cls = available.get(name)
+        if cls is None or not cls.is_configured(config):
+            continue
+        try:
+            fetchers.append(cls(config))
+        except Exception as e:
+            logger.error(f"Failed to initialize fetcher '{name}': {e}")
+    return fetchers
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Retry Policy
+Classifies provider errors and retries idempotent GETs with jittered backoff
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import requests
+
+from .rate_limiter import rate_limiters
+
+
+logger = logging.getLogger(__name__)
+
+# Error classes
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+SERVER = 'server'
+RATE_LIMITED = 'rate_limited'
+AUTH = 'auth'
+CLIENT = 'client'
+
+# Worth another attempt; auth and other 4xx errors will not fix themselves
+RETRYABLE = {TIMEOUT, CONNECTION, SERVER, RATE_LIMITED}
+
+
+class ProviderError(requests.exceptions.RequestException):
+    """A provider call that failed for good, tagged with its error class"""
+
+    def __init__(self, kind: str, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+
+
+def classify(response: Optional[requests.Response] = None,
+             error: Optional[Exception] = None) -> Optional[str]:
+    """
+    Error class of a response or exception
+
+    Returns:
+        One of the error classes, or None for a successful response
+    """
+    if error is not None:
+        if isinstance(error, requests.exceptions.Timeout):
+            return TIMEOUT
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return CONNECTION
+        return CLIENT
+
+    status = response.status_code
+    if status < 400:
+        return None
+    if status == 429:
+        return RATE_LIMITED
+    if status in (401, 403):
+        return AUTH
+    if status >= 500:
+        return SERVER
+    return CLIENT
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        Non-negative delay, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryMetrics:
+    """Process-wide retry counters, per provider and error class"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self.wait_seconds = 0.0
+
+    def incr(self, name: str, count: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + count
+
+    def add_wait(self, seconds: float):
+        with self._lock:
+            self.wait_seconds += seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        """Copy of all counters plus the total backoff time"""
+        with self._lock:
+            data = dict(self._counters)
+            data['wait_seconds'] = round(self.wait_seconds, 3)
+        return data
+
+
+metrics = RetryMetrics()
+
+_local = threading.local()
+
+
+class AttemptCounter:
+    """
+    Counts the HTTP attempts get_with_retry makes on the current thread
+
+        with AttemptCounter() as attempts:
+            fetch()
+        quota_used = attempts.count
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._outer = None
+
+    def __enter__(self) -> 'AttemptCounter':
+        self._outer = getattr(_local, 'counter', None)
+        _local.counter = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _local.counter = self._outer
+        if self._outer is not None:
+            self._outer.count += self.count
+
+
+class RetryPolicy:
+    """
+    Decorrelated-jitter backoff: each delay is drawn between `base_delay`
+    and three times the previous delay, capped at `max_delay`. A
+    Retry-After header replaces the drawn delay. Retrying stops after
+    `max_attempts` or once the next wait would pass the deadline.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0,
+                 max_delay: float = 30.0, max_total: float = 60.0):
+        """
+        Args:
+            max_attempts: Attempts per request, including the first
+            base_delay: Smallest backoff in seconds
+            max_delay: Largest backoff in seconds
+            max_total: Retry budget in seconds when the caller gives no deadline
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total = max_total
+
+    def next_delay(self, previous: float) -> float:
+        """Backoff after a failed attempt that followed a `previous` delay"""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def get_with_retry(url: str, params: Optional[Dict] = None, provider: str = 'http',
+                   policy: Optional[RetryPolicy] = None, deadline: Optional[float] = None,
+                   timeout: float = 30, session=None, api_key: Optional[str] = None,
+                   **kwargs) -> requests.Response:
+    """
+    GET a URL, retrying transient failures
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        provider: Name used in logs and metrics
+        policy: Retry policy (default: DEFAULT_POLICY)
+        deadline: time.monotonic() by which the last attempt must have started
+        timeout: Per-attempt timeout in seconds
+        session: requests.Session to use (default: module-level requests)
+        api_key: Key the request is billed to, for per-key rate limiting
+
+    Returns:
+        The successful response
+
+    Raises:
+        ProviderError: The request failed and was not (or no longer) retryable
+    """
+    policy = policy or DEFAULT_POLICY
+    if deadline is None:
+        deadline = time.monotonic() + policy.max_total
+    http = session or requests
+    delay = 0.0
+
+    for attempt in range(1, policy.max_attempts + 1):
+        # Every attempt, retries included, takes a token from the shared bucket
+        if rate_limiters.acquire(provider, api_key, timeout=max(0.0, deadline - time.monotonic())) is None:
+            metrics.incr(f"{provider}.gave_up")
+            raise ProviderError(RATE_LIMITED, f"{provider} rate limit leaves no time before the deadline")
+        metrics.incr(f"{provider}.attempts")
+        counter = getattr(_local, 'counter', None)
+        if counter is not None:
+            counter.count += 1
+        response = error = None
+        try:
+            response = http.get(url, params=params, timeout=timeout, **kwargs)
+            kind = classify(response)
+        except requests.exceptions.RequestException as e:
+            error = e
+            kind = classify(error=e)
+
+        if kind is None:
+            return response
+
+        status = response.status_code if response is not None else None
+        message = f"{provider} request failed ({kind}{f' {status}' if status else ''})"
+        if error is not None:
+            message += f": {error}"
+        metrics.incr(f"{provider}.errors.{kind}")
+
+        if kind not in RETRYABLE or attempt == policy.max_attempts:
+            metrics.incr(f"{provider}.gave_up")
+            raise ProviderError(kind, message, status)
+
+        delay = policy.next_delay(delay)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = retry_after
+
+        if time.monotonic() + delay > deadline:
+            metrics.incr(f"{provider}.gave_up")
+            raise ProviderError(kind, f"{message}; no time left to retry", status)
+
+        logger.warning(f"{message}; retry {attempt}/{policy.max_attempts - 1} in {delay:.1f}s")
+        metrics.incr(f"{provider}.retries")
+        metrics.add_wait(delay)
+        if kind == RATE_LIMITED:
+            # Hold back every caller sharing this key, not just this one;
+            # the next acquire() does the waiting
+            rate_limiters.bucket(provider, api_key).pause(delay)
+        else:
+            time.sleep(delay)
+
+    # Not reached: the last attempt either returns or raises
+    raise ProviderError(CLIENT, f"{provider} request failed")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+RSS/Atom Fetcher
+Pulls Indian publishers' feeds concurrently with conditional GET and streaming parsing
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+try:
+    # Hardened against entity-expansion attacks when installed
+    from defusedxml.ElementTree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+
+from .registry import NewsFetcher, register_fetcher
+from .retry_policy import DEFAULT_POLICY, ProviderError, get_with_retry
+from .text_normalizer import normalize_text
+
+
+logger = logging.getLogger(__name__)
+
+# Free feeds; override with RSS_FEEDS (comma-separated URLs)
+DEFAULT_FEEDS = [
+    'https://www.thehindu.com/news/national/feeder/default.rss',
+    'https://timesofindia.indiatimes.com/rssfeedstopstories.cms',
+    'https://feeds.feedburner.com/ndtvnews-top-stories',
+    'https://indianexpress.com/section/india/feed/',
+    'https://www.hindustantimes.com/feeds/rss/india-news/rssfeed.xml',
+    'https://www.livemint.com/rss/news',
+]
+
+DEFAULT_STATE_PATH = Path('state') / 'rss_feeds.json'
+
+# Items read per feed; parsing stops there
+MAX_ITEMS_PER_FEED = 30
+
+MAX_WORKERS = 16
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(element) -> str:
+    return (element.text or '').strip() if element is not None else ''
+
+
+def _iso(value: str) -> str:
+    """RSS (RFC 822) or Atom (RFC 3339) date as NewsAPI-style UTC ISO, '' if unparsable"""
+    if not value:
+        return ''
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return ''
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_item(item, feed_title: str) -> Optional[Dict]:
+    """RSS <item> or Atom <entry> as a NewsAPI-shaped article"""
+    fields = {}
+    image = None
+    for child in item:
+        name = _local(child.tag)
+        if name == 'link':
+            # Atom links live in href; prefer rel="alternate"
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                fields.setdefault('link', href)
+            elif not href and child.text:
+                fields.setdefault('link', child.text.strip())
+        elif name in ('content', 'thumbnail') and child.get('url'):
+            image = image or child.get('url')
+        elif name == 'enclosure' and (child.get('type') or '').startswith('image'):
+            image = image or child.get('url')
+        elif name not in fields:
+            fields[name] = _text(child)
+
+    title = normalize_text(fields.get('title'))
+    if not title:
+        return None
+    return {
+        'title': title,
+        'description': normalize_text(fields.get('description') or fields.get('summary')),
+        'url': fields.get('link', ''),
+        'urlToImage': image,
+        'publishedAt': _iso(fields.get('pubDate') or fields.get('published') or fields.get('updated', '')),
+        'source': {'name': feed_title or urlsplit(fields.get('link', '')).netloc},
+    }
+
+
+def parse_feed(stream, max_items: int = MAX_ITEMS_PER_FEED) -> Iterator[Dict]:
+    """
+    Yield articles from an RSS 2.0 or Atom document as it is read
+
+    Each item is removed from the tree once parsed, so memory stays flat
+    however long the feed is, and reading stops after `max_items`.
+    """
+    feed_title = ''
+    stack = []
+    count = 0
+    for event, element in iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(element)
+            continue
+        stack.pop()
+        name = _local(element.tag)
+        parent = _local(stack[-1].tag) if stack else ''
+        if name in ('item', 'entry'):
+            article = _parse_item(element, feed_title)
+            # Drop the parsed item from the tree
+            stack[-1].remove(element)
+            if article:
+                yield article
+                count += 1
+                if count >= max_items:
+                    return
+        elif name == 'title' and parent in ('channel', 'feed') and not feed_title:
+            feed_title = _text(element)
+
+
+class FeedState:
+    """ETag/Last-Modified and last articles per feed, persisted as JSON"""
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        """
+        Args:
+            path: JSON state file (None = memory only)
+        """
+        self.path = Path(path) if path else None
+        self._feeds: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._feeds = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable feed state {self.path}: {e}")
+
+    def get(self, url: str) -> Dict:
+        with self._lock:
+            return dict(self._feeds.get(url, {}))
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str], articles: List[Dict]):
+        with self._lock:
+            self._feeds[url] = {'etag': etag, 'last_modified': last_modified, 'articles': articles}
+
+    def save(self):
+        """Write the state atomically"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._feeds)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save feed state: {e}")
+
+
+def fetch_feed(url: str, state: FeedState, deadline: float) -> List[Dict]:
+    """
+    Articles of one feed, re-downloaded only if it changed
+
+    A 304 Not Modified answer (or a failed request) returns the articles
+    parsed last time.
+    """
+    previous = state.get(url)
+    headers = {'User-Agent': 'Mozilla/5.0 (compatible; IndianNewsFetcher/1.0)'}
+    if previous.get('etag'):
+        headers['If-None-Match'] = previous['etag']
+    if previous.get('last_modified'):
+        headers['If-Modified-Since'] = previous['last_modified']
+
+    try:
+        # Feeds are rate limited per host, not per API key
+        response = get_with_retry(url, provider='rss', deadline=deadline, timeout=15,
+                                  headers=headers, stream=True, api_key=urlsplit(url).netloc)
+    except ProviderError as e:
+        logger.warning(f"Feed {url} failed: {e}")
+        return previous.get('articles', [])
+
+    with response:
+        if response.status_code == 304:
+            return previous.get('articles', [])
+        response.raw.decode_content = True
+        try:
+            articles = list(parse_feed(response.raw))
+        except Exception as e:
+            logger.warning(f"Feed {url} is not valid RSS/Atom: {e}")
+            return previous.get('articles', [])
+
+    state.update(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), articles)
+    return articles
+
+
+def fetch_feeds(feeds: List[str], state: Optional[FeedState] = None,
+                deadline: Optional[float] = None, max_articles: int = 50) -> List[Dict]:
+    """
+    Fetch many feeds concurrently
+
+    Args:
+        feeds: Feed URLs
+        state: Conditional-GET state (default: state/rss_feeds.json)
+        deadline: time.monotonic() after which no more retries are started
+        max_articles: Maximum articles returned
+
+    Returns:
+        Articles from all feeds, newest first, without duplicate titles
+    """
+    if deadline is None:
+        deadline = time.monotonic() + DEFAULT_POLICY.max_total
+    state = state or FeedState()
+    if not feeds:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(feeds)), thread_name_prefix='rss') as pool:
+        results = list(pool.map(lambda url: fetch_feed(url, state, deadline), feeds))
+    state.save()
+
+    seen_titles = set()
+    articles = []
+    for article in sorted((a for feed in results for a in feed),
+                          key=lambda a: a['publishedAt'], reverse=True):
+        key = article['title'].casefold()
+        if key not in seen_titles:
+            seen_titles.add(key)
+            articles.append(article)
+    return articles[:max_articles]
+
+
+@register_fetcher
+class RSSFetcher(NewsFetcher):
+    """Publisher RSS/Atom feeds; free, so no daily quota applies"""
+
+    name = 'rss'
+    requests_per_fetch = 0
+
+    @classmethod
+    def is_configured(cls, config: dict) -> bool:
+        return (config.get('RSS_FEEDS') or '').strip().lower() != 'off'
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        configured = [url.strip() for url in (config.get('RSS_FEEDS') or '').split(',') if url.strip()]
+        self.feeds = configured or list(DEFAULT_FEEDS)
+        self.state = FeedState(config.get('RSS_STATE_FILE') or DEFAULT_STATE_PATH)
+
+    def fetch(self, max_articles: int, deadline: float) -> List[Dict]:
+        return fetch_feeds(self.feeds, self.state, deadline, max_articles)
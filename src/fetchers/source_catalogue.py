@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Source Catalogue
+Cached NewsAPI.org source list with per-source yield stats and concurrent fetching
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .fast_json import decode_response
+from .newsapi_fetcher import normalize_article, take_unique
+from .retry_policy import DEFAULT_POLICY, ProviderError, get_with_retry
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOGUE_PATH = Path('state') / 'newsapi_sources.json'
+
+# The source list changes rarely
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Wait after a failed refresh before asking /v2/sources again, so an outage
+# or a bad key does not cost a request on every run
+DEFAULT_RETRY_SECONDS = 3600
+
+# Used when the source list cannot be fetched and nothing is cached
+FALLBACK_SOURCES = ['the-times-of-india', 'the-hindu', 'google-news-in']
+
+# Weight of the newest fetch in a source's yield average
+YIELD_ALPHA = 0.3
+
+
+class SourceCatalogue:
+    """
+    NewsAPI.org sources for one country/category, cached on disk
+
+    Besides the source list, the file keeps per-source stats: how many
+    articles each fetch returned, how many survived filtering and how many
+    had a description. Sources are ranked by their average usable yield;
+    sources never fetched rank first so new ones get a chance.
+    """
+
+    def __init__(self, api_key: str, path=DEFAULT_CATALOGUE_PATH,
+                 ttl: float = DEFAULT_TTL_SECONDS, country: str = 'in', category: str = 'general',
+                 retry_interval: float = DEFAULT_RETRY_SECONDS):
+        """
+        Args:
+            api_key: NewsAPI.org API key
+            path: JSON file for the catalogue (None = memory only)
+            ttl: Seconds before the source list is fetched again
+            country: Source country filter
+            category: Source category filter
+            retry_interval: Seconds to wait after a failed refresh
+        """
+        self.api_key = api_key
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.country = country
+        self.category = category
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        data = {'fetched_at': 0, 'failed_at': 0, 'sources': [], 'stats': {}}
+        if self.path is None:
+            return data
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable source catalogue {self.path}: {e}")
+        return data
+
+    def save(self):
+        """Write the catalogue atomically"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps(self._data)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save source catalogue: {e}")
+
+    def sources(self, deadline: Optional[float] = None) -> List[str]:
+        """
+        Source ids, refreshed from /v2/sources once the cache has expired
+
+        A failed refresh keeps the stale list (or the fallback sources) and
+        is not retried for `retry_interval` seconds.
+        """
+        now = time.time()
+        if self._data['sources'] and now - self._data['fetched_at'] < self.ttl:
+            return list(self._data['sources'])
+        if now - self._data['failed_at'] < self.retry_interval:
+            return list(self._data['sources']) or list(FALLBACK_SOURCES)
+
+        params = {'category': self.category, 'country': self.country, 'apiKey': self.api_key}
+        try:
+            response = get_with_retry("https://newsapi.org/v2/sources", params=params,
+                                      provider='newsapi', deadline=deadline, api_key=self.api_key)
+            data = decode_response(response)
+            if data.get('status') != 'ok' or not data.get('sources'):
+                raise ValueError(data.get('message') or 'no sources returned')
+            with self._lock:
+                self._data['sources'] = [source['id'] for source in data['sources']]
+                self._data['fetched_at'] = time.time()
+                self._data['failed_at'] = 0
+            logger.info(f"Refreshed source catalogue: {len(self._data['sources'])} sources")
+        except (ProviderError, ValueError, KeyError) as e:
+            logger.warning(f"Could not refresh source catalogue (next try in {self.retry_interval:.0f}s): {e}")
+            with self._lock:
+                self._data['failed_at'] = time.time()
+        self.save()
+
+        return list(self._data['sources']) or list(FALLBACK_SOURCES)
+
+    def record(self, source: str, returned: int, kept: int, described: int):
+        """Update a source's stats after fetching from it"""
+        with self._lock:
+            stats = self._data['stats'].setdefault(
+                source, {'fetches': 0, 'returned': 0, 'kept': 0, 'described': 0, 'yield': None}
+            )
+            stats['fetches'] += 1
+            stats['returned'] += returned
+            stats['kept'] += kept
+            stats['described'] += described
+            previous = stats['yield']
+            stats['yield'] = described if previous is None else (
+                YIELD_ALPHA * described + (1 - YIELD_ALPHA) * previous
+            )
+
+    def stats(self, source: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data['stats'].get(source)
+            return dict(entry) if entry else None
+
+    def top(self, count: int, deadline: Optional[float] = None) -> List[str]:
+        """The `count` best sources by average usable yield (untried first)"""
+        sources = self.sources(deadline)
+        with self._lock:
+            stats = self._data['stats']
+            ranked = sorted(
+                enumerate(sources),
+                key=lambda item: (
+                    stats.get(item[1], {}).get('yield') is not None,
+                    -(stats.get(item[1], {}).get('yield') or 0),
+                    item[0],
+                )
+            )
+        return [source for _, source in ranked[:count]]
+
+
+def _fetch_source(catalogue: SourceCatalogue, source: str, page_size: int,
+                  deadline: float) -> List[Dict]:
+    params = {'sources': source, 'apiKey': catalogue.api_key, 'pageSize': str(page_size)}
+    try:
+        response = get_with_retry("https://newsapi.org/v2/top-headlines", params=params,
+                                  provider='newsapi', deadline=deadline, api_key=catalogue.api_key)
+        data = decode_response(response)
+    except (ProviderError, ValueError) as e:
+        logger.warning(f"Error fetching from {source}: {e}")
+        catalogue.record(source, 0, 0, 0)
+        return []
+
+    raw = (data.get('articles') or []) if data.get('status') == 'ok' else []
+    articles = [article for article in map(normalize_article, raw) if article]
+    catalogue.record(source, len(raw), len(articles), sum(1 for a in articles if a['description']))
+    return articles
+
+
+def fetch_top_sources(catalogue: SourceCatalogue, top_n: int = 3, per_source: int = 5,
+                      max_articles: int = 15, deadline: Optional[float] = None) -> List[Dict]:
+    """
+    Fetch the catalogue's best sources concurrently
+
+    Args:
+        catalogue: Source catalogue (its stats are updated and saved)
+        top_n: Number of sources to query
+        per_source: Articles requested from each source
+        max_articles: Maximum unique articles returned
+        deadline: time.monotonic() after which no more retries are started
+
+    Returns:
+        Unique articles, best-ranked sources first
+    """
+    if deadline is None:
+        deadline = time.monotonic() + DEFAULT_POLICY.max_total
+    sources = catalogue.top(top_n, deadline)
+    if not sources:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='source') as pool:
+        results = list(pool.map(lambda source: _fetch_source(catalogue, source, per_source, deadline),
+                                sources))
+    catalogue.save()
+
+    return take_unique((article for articles in results for article in articles), max_articles)
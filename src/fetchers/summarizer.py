@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Extractive Summarizer
+Picks the 1-3 most central sentences of an article (TextRank over TF-IDF similarity)
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+try:
+    # Vectorized similarity and ranking when installed; plain Python otherwise
+    import numpy as np
+except ImportError:
+    np = None
+
+from .text_normalizer import normalize_text
+
+
+DEFAULT_MAX_SENTENCES = 3
+DEFAULT_MAX_LENGTH = 300
+
+# Summaries remembered, keyed by content hash
+CACHE_SIZE = 4096
+
+# Only the first sentences of long bodies are ranked (news puts the
+# substance first, and the matrix grows with the square)
+MAX_CANDIDATES = 40
+
+DAMPING = 0.85
+ITERATIONS = 30
+TOLERANCE = 1e-4
+
+# Weight of position: the lead sentence of a news story is usually the best
+LEAD_BONUS = 0.15
+
+# Sentence ends: . ! ? and the Devanagari danda, followed by a capital,
+# digit, quote or Devanagari letter. Abbreviations are rejoined afterwards.
+_SENTENCE_END_RE = re.compile(
+    r'(?:(?<=[.!?।])|(?<=[.!?।]["\'”’)]))\s+(?=["\'“‘(]?[A-Z0-9\u0900-\u097f])'
+)
+_ABBREVIATION_RE = re.compile(
+    r'(?:\b(?:Mr|Mrs|Ms|Dr|Prof|Sr|Jr|St|Gen|Lt|Col|Capt|Sgt|Rs|Re|No|Nos|vs|Jan|Feb|Mar|Apr|Jun|'
+    r'Jul|Aug|Sep|Sept|Oct|Nov|Dec|Inc|Ltd|Co|Corp|Govt|approx|est|i\.e|e\.g)|\b[A-Z])\.$'
+)
+_WORD_RE = re.compile(r'\w+')
+
+STOPWORDS = frozenset('''
+a about after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers him his how i if in into is it its itself just me more
+most my no nor not now of off on once only or other our out over own said same says she should
+so some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your
+'''.split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences of normalized text, keeping abbreviations like 'Rs.' and 'U.S.' intact"""
+    sentences = []
+    for part in _SENTENCE_END_RE.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        if sentences and _ABBREVIATION_RE.search(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {part}"
+        else:
+            sentences.append(part)
+    return sentences
+
+
+def clip_text(text: str, max_length: int) -> str:
+    """Cut text at a word boundary, ending with an ellipsis (included in max_length)"""
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,;:-') + '…'
+
+
+def _terms(sentence: str) -> Counter:
+    return Counter(
+        word for word in _WORD_RE.findall(sentence.lower())
+        if len(word) > 2 and word not in STOPWORDS and not word.isdigit()
+    )
+
+
+def _rank_numpy(counts: List[Counter]) -> List[float]:
+    vocabulary = {}
+    for terms in counts:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    if not vocabulary:
+        return [0.0] * len(counts)
+
+    tf = np.zeros((len(counts), len(vocabulary)))
+    for row, terms in enumerate(counts):
+        for term, count in terms.items():
+            tf[row, vocabulary[term]] = count
+    # Sentences as documents: a word in every sentence says nothing
+    idf = np.log((1 + len(counts)) / (1 + np.count_nonzero(tf, axis=0))) + 1
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    totals = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, totals, out=np.zeros_like(similarity), where=totals > 0)
+
+    size = len(counts)
+    scores = np.full(size, 1.0 / size)
+    for _ in range(ITERATIONS):
+        updated = (1 - DAMPING) / size + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores.tolist()
+
+
+def _rank_python(counts: List[Counter]) -> List[float]:
+    size = len(counts)
+    document_frequency = Counter(term for terms in counts for term in terms)
+    vectors = []
+    for terms in counts:
+        vector = {
+            term: count * (math.log((1 + size) / (1 + document_frequency[term])) + 1)
+            for term, count in terms.items()
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        vectors.append({term: value / norm for term, value in vector.items()} if norm else {})
+
+    similarity = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i + 1, size):
+            small, large = sorted((vectors[i], vectors[j]), key=len)
+            value = sum(weight * large.get(term, 0.0) for term, weight in small.items())
+            similarity[i][j] = similarity[j][i] = value
+    totals = [sum(row) for row in similarity]
+    # Incoming edges of each sentence, with the sender's share of its weight
+    incoming = [
+        [(j, similarity[j][i] / totals[j]) for j in range(size) if similarity[j][i]]
+        for i in range(size)
+    ]
+
+    scores = [1.0 / size] * size
+    for _ in range(ITERATIONS):
+        updated = [
+            (1 - DAMPING) / size + DAMPING * sum(weight * scores[j] for j, weight in edges)
+            for edges in incoming
+        ]
+        converged = sum(abs(a - b) for a, b in zip(updated, scores)) < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def _summarize(text: str, max_sentences: int, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    sentences = split_sentences(text)[:MAX_CANDIDATES]
+    if len(sentences) <= 1:
+        return clip_text(text, max_length)
+
+    counts = [_terms(sentence) for sentence in sentences]
+    ranks = (_rank_numpy if np is not None else _rank_python)(counts)
+    # TextRank centrality (relative to the average), nudged towards the lead
+    average = sum(ranks) / len(ranks) or 1.0
+    scores = [rank / average + LEAD_BONUS * (1 - position / len(sentences))
+              for position, rank in enumerate(ranks)]
+
+    chosen = []
+    length = 0
+    for position in sorted(range(len(sentences)), key=lambda p: scores[p], reverse=True):
+        sentence_length = len(sentences[position]) + (1 if chosen else 0)
+        if length + sentence_length > max_length:
+            continue
+        chosen.append(position)
+        length += sentence_length
+        if len(chosen) >= max_sentences:
+            break
+    if not chosen:
+        # Even the best sentence is too long: clip it
+        best = max(range(len(sentences)), key=lambda p: scores[p])
+        return clip_text(sentences[best], max_length)
+    return ' '.join(sentences[position] for position in sorted(chosen))
+
+
+class _SummaryCache:
+    """LRU of summaries keyed by a hash of the text and the limits"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(text: str, max_sentences: int, max_length: int) -> str:
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{digest}:{max_sentences}:{max_length}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return summary
+
+    def put(self, key: str, summary: str):
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_cache = _SummaryCache(CACHE_SIZE)
+
+
+def _cached_summary(text: str, max_sentences: int, max_length: int) -> str:
+    """Summary of already normalized text, through the cache"""
+    if not text:
+        return ''
+    key = _cache.key(text, max_sentences, max_length)
+    summary = _cache.get(key)
+    if summary is None:
+        summary = _summarize(text, max_sentences, max_length)
+        _cache.put(key, summary)
+    return summary
+
+
+def summarize(text, max_sentences: int = DEFAULT_MAX_SENTENCES,
+              max_length: int = DEFAULT_MAX_LENGTH) -> str:
+    """
+    Extractive summary of an article text
+
+    Text that already fits is returned unchanged. Otherwise sentences are
+    ranked by TextRank over TF-IDF cosine similarity (the sentences most
+    like the rest of the text win), slightly favouring the lead, and the
+    best ones that fit are returned in their original order.
+
+    Args:
+        text: Article body or description (HTML is stripped)
+        max_sentences: Most sentences in the summary
+        max_length: Maximum length in characters
+
+    Returns:
+        Summary, '' for empty text
+    """
+    return _cached_summary(normalize_text(text), max_sentences, max_length)
+
+
+def summarize_batch(texts: Iterable, max_sentences: int = DEFAULT_MAX_SENTENCES,
+                    max_length: int = DEFAULT_MAX_LENGTH, normalized: bool = False) -> List[str]:
+    """
+    Summaries of many texts; repeated texts are summarized once
+
+    Args:
+        texts: Article bodies or descriptions
+        max_sentences: Most sentences in each summary
+        max_length: Maximum length of each summary in characters
+        normalized: The texts are normalize_text output already, and are
+            not normalized again (which would strip tags decoded from
+            entities, such as "&lt;b&gt;")
+    """
+    done: Dict[str, str] = {}
+    summaries = []
+    for text in texts:
+        text = (text or '') if normalized else normalize_text(text)
+        if text not in done:
+            done[text] = _cached_summary(text, max_sentences, max_length)
+        summaries.append(done[text])
+    return summaries
+
+
+def summarize_articles(articles: List[Dict], max_sentences: int = DEFAULT_MAX_SENTENCES,
+                       max_length: int = DEFAULT_MAX_LENGTH, normalized: bool = False) -> List[str]:
+    """
+    Summaries for a list of articles, in order
+
+    The extracted body (see article_extractor) is summarized when present,
+    the provider description otherwise. Pass normalized=True for articles
+    that went through a fetcher's normalize_article.
+    """
+    return summarize_batch(
+        # Bodies are normalized paragraphs separated by blank lines
+        ((article.get('body') or '').replace('\n\n', ' ') or article.get('description') or ''
+         for article in articles),
+        max_sentences, max_length, normalized
+    )
+
+
+def cache_info() -> Dict[str, int]:
+    """Summary cache statistics"""
+    return {'hits': _cache.hits, 'misses': _cache.misses, 'size': len(_cache._entries)}
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+URL Helpers
+Canonical forms of article URLs, redirect resolution and a URL index for deduplication
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from .rate_limiter import rate_limiters
+
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'cmpid', 'ito', 'ocid', 'ncid', 'sr_share', 'from',
+    'amp', 'amp_js_v', 'usqp', 'outputtype', 'frommail', 'utm',
+}
+
+# Mobile hosts serving the same pages as the desktop site
+_MOBILE_PREFIXES = ('m.', 'mobile.', 'amp.')
+
+# Path forms of AMP pages: /amp, /amp/, .amp, /amp_articleshow/ (Times of India)
+_AMP_PATH_RE = re.compile(r'(?:/amp/?$|\.amp$|(?<=/)amp_(?=\w))')
+
+# AMP cache paths: /c/s/<host>/<path> (https) or /c/<host>/<path>; Google: /amp/s/<host>/<path>
+_AMP_CACHE_PATH_RE = re.compile(r'^/(?:amp/|[a-z]/)(s/)?(.+)$')
+
+# Redirect wrappers that carry the target in a query parameter
+_WRAPPER_PARAMS = {
+    'google.com/url': ('url', 'q'),
+    'l.facebook.com/l.php': ('u',),
+    'lm.facebook.com/l.php': ('u',),
+    'out.reddit.com': ('url',),
+}
+
+# Hosts whose links only redirect elsewhere; resolved over the network (and cached)
+REDIRECT_HOSTS = {
+    'news.google.com', 'feedproxy.google.com', 'feeds.feedburner.com', 't.co', 'bit.ly',
+    'goo.gl', 'ow.ly', 'dlvr.it', 'buff.ly', 'tinyurl.com', 'trib.al', 'lnkd.in',
+}
+
+DEFAULT_REDIRECT_CACHE_PATH = Path('state') / 'url_redirects.json'
+
+# Resolved redirects kept; failures are retried after a day
+MAX_REDIRECT_ENTRIES = 10000
+REDIRECT_FAILURE_TTL_SECONDS = 24 * 3600
+REDIRECT_TIMEOUT = 5.0
+
+# How long a link may wait for its host's 'redirect' rate bucket; a whole
+# digest's Google News links share one host
+REDIRECT_MAX_WAIT = 30.0
+
+
+def _unwrap(url: str) -> str:
+    """Target of a redirect wrapper or AMP cache URL, or the URL itself"""
+    for _ in range(3):
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        bare = host[4:] if host.startswith('www.') else host
+        # AMP caches: <host>.cdn.ampproject.org/c/s/<host>/<path>, google.com/amp/s/<host>/<path>
+        if bare.endswith('.cdn.ampproject.org') or (bare == 'google.com' and parts.path.startswith('/amp/')):
+            match = _AMP_CACHE_PATH_RE.match(parts.path)
+            if not match:
+                return url
+            target = ('https://' if match.group(1) else 'http://') + match.group(2)
+            url = target + (f"?{parts.query}" if parts.query else '')
+            continue
+        wrapper = _WRAPPER_PARAMS.get(f"{bare}{parts.path.rstrip('/')}") or _WRAPPER_PARAMS.get(bare)
+        if wrapper:
+            params = dict(parse_qsl(parts.query))
+            target = next((unquote(params[name]) for name in wrapper if params.get(name)), '')
+            if target.startswith(('http://', 'https://')):
+                url = target
+                continue
+        return url
+    return url
+
+
+@lru_cache(maxsize=16384)
+def canonical_url(url: str) -> str:
+    """
+    URL with the parts that do not change the page removed
+
+    Unwraps redirect wrappers (google.com/url, l.facebook.com) and AMP
+    caches, lowercases the host, drops 'www.' and mobile/AMP host
+    prefixes, AMP path suffixes, default ports, fragments, utm_* and other
+    tracking parameters and a trailing slash, and sorts the remaining
+    query parameters. Works offline: shortener and Google News links are
+    left as they are (see resolve_urls). Returns '' for anything that is
+    not an http(s) URL. Results are memoized.
+    """
+    if not url:
+        return ''
+    url = _unwrap(url.strip())
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return ''
+
+    host = parts.hostname
+    if host.startswith('www.'):
+        host = host[4:]
+    for prefix in _MOBILE_PREFIXES:
+        if host.startswith(prefix) and host.count('.') >= 2:
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = _AMP_PATH_RE.sub('', parts.path).rstrip('/') or '/'
+    # Scheme is normalized to https: publishers serve the same page on both
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def needs_resolution(url: str) -> bool:
+    """Whether a URL is a shortener/aggregator link that only redirects"""
+    host = (urlsplit(url).hostname or '').lower()
+    return (host[4:] if host.startswith('www.') else host) in REDIRECT_HOSTS
+
+
+class RedirectCache:
+    """Where redirecting links lead, persisted as JSON so each is resolved once"""
+
+    def __init__(self, path=DEFAULT_REDIRECT_CACHE_PATH, timeout: float = REDIRECT_TIMEOUT, session=None):
+        """
+        Args:
+            path: JSON cache file (None = memory only)
+            timeout: Seconds allowed to follow one redirect chain
+            session: requests.Session to use (default: module-level requests)
+        """
+        self.path = Path(path) if path else None
+        self.timeout = timeout
+        self.session = session
+        self._targets: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._targets = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable redirect cache {self.path}: {e}")
+
+    def _follow(self, url: str) -> Optional[str]:
+        """Target of a redirect ('' if it cannot be followed), None if rate limited"""
+        host = urlsplit(url).netloc.lower()
+        if rate_limiters.acquire('redirect', host, timeout=REDIRECT_MAX_WAIT) is None:
+            return None
+        http = self.session or requests
+        try:
+            response = http.head(url, allow_redirects=True, timeout=self.timeout,
+                                 headers={'User-Agent': 'Mozilla/5.0 (compatible; IndianNewsFetcher/1.0)'})
+            response.close()
+        except requests.exceptions.RequestException as e:
+            logger.info(f"Could not resolve {url}: {e}")
+            return ''
+        return response.url if response.url != url else ''
+
+    def resolve(self, url: str) -> str:
+        """
+        Final URL of a redirecting link (the link itself if it does not
+        redirect or cannot be followed)
+        """
+        if not needs_resolution(url):
+            return url
+        with self._lock:
+            entry = self._targets.get(url)
+        if entry and (entry[0] or time.time() - entry[1] < REDIRECT_FAILURE_TTL_SECONDS):
+            return entry[0] or url
+        target = self._follow(url)
+        if target is None:
+            # Not a failure of the link: left for the next run, uncached
+            logger.info(f"Rate limit reached, not resolving {url} this run")
+            return url
+        with self._lock:
+            self._targets[url] = [target, time.time()]
+            self._dirty = True
+        return target or url
+
+    def save(self):
+        """Write the cache atomically if it changed, dropping the oldest entries over the limit"""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            if len(self._targets) > MAX_REDIRECT_ENTRIES:
+                newest = sorted(self._targets.items(), key=lambda item: item[1][1])
+                self._targets = dict(newest[-MAX_REDIRECT_ENTRIES:])
+            data = json.dumps(self._targets)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save redirect cache: {e}")
+
+
+_default_redirects: Optional[RedirectCache] = None
+
+
+def get_redirect_cache() -> RedirectCache:
+    """Process-wide redirect cache at DEFAULT_REDIRECT_CACHE_PATH"""
+    global _default_redirects
+    if _default_redirects is None:
+        _default_redirects = RedirectCache()
+    return _default_redirects
+
+
+def resolve_urls(articles: List[Dict], cache: Optional[RedirectCache] = None, max_workers: int = 8) -> List[Dict]:
+    """
+    Replace redirecting article links with their targets, concurrently
+
+    Only links on REDIRECT_HOSTS cost a request, and only the first time
+    they are seen. Articles are updated in place.
+    """
+    pending = [article for article in articles if needs_resolution(article.get('url') or '')]
+    if not pending:
+        return articles
+    cache = cache or get_redirect_cache()
+    links = list(dict.fromkeys(article['url'] for article in pending))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(links)), thread_name_prefix='resolve') as pool:
+        targets = dict(zip(links, pool.map(cache.resolve, links)))
+    for article in pending:
+        article['url'] = targets[article['url']]
+    cache.save()
+    return articles
+
+
+class UrlIndex:
+    """
+    Canonical URL -> article id, for O(1) duplicate and "seen before" checks
+
+    Share one index between the stages that need to agree on identity
+    (fetchers merging results, deduplication, rendering).
+    """
+
+    def __init__(self, urls: Iterable = ()):
+        """
+        Args:
+            urls: (url, article id) pairs to start with
+        """
+        self._ids: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for url, article_id in urls:
+            self.add(url, article_id)
+
+    def add(self, url: str, article_id: Optional[str] = None) -> bool:
+        """
+        Record a URL
+
+        Args:
+            url: Article URL, in any form
+            article_id: Id to return for this URL (default: the canonical URL)
+
+        Returns:
+            True if the URL was new, False if it (or another form of it) was seen
+        """
+        key = canonical_url(url)
+        if not key:
+            return True
+        with self._lock:
+            if key in self._ids:
+                return False
+            self._ids[key] = article_id or key
+            return True
+
+    def get(self, url: str) -> Optional[str]:
+        """Article id recorded for any form of this URL"""
+        return self._ids.get(canonical_url(url))
+
+    def __contains__(self, url: str) -> bool:
+        return canonical_url(url) in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
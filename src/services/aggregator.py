@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Fetch Aggregator
+Queries every enabled fetcher plugin concurrently and merges their articles
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from ..fetchers.registry import NewsFetcher, create_fetchers
+from ..fetchers.retry_policy import AttemptCounter
+from ..fetchers.text_normalizer import normalize_text
+from ..fetchers.urls import UrlIndex, resolve_urls
+from .provider_health import ProviderHealth
+from .provider_router import DEFAULT_DAILY_QUOTAS, provider_health_from_config
+from .trends import TrendDetector, trend_detector_from_config
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_article(article: Dict, provider: str) -> Optional[Dict]:
+    """
+    Article in NewsAPI's shape, whatever the provider
+
+    NewsData.io field names (link, pubDate, image_url, source_id) are
+    mapped onto url, publishedAt, urlToImage and source.name; the original
+    fields are kept. Returns None for untitled articles.
+    """
+    title = normalize_text(article.get('title'))
+    if not title:
+        return None
+    normalized = dict(article)
+    normalized['title'] = title
+    normalized['description'] = normalize_text(article.get('description'))
+    normalized['url'] = article.get('url') or article.get('link') or ''
+    normalized['urlToImage'] = article.get('urlToImage') or article.get('image_url')
+    normalized['publishedAt'] = article.get('publishedAt') or article.get('pubDate') or ''
+    source = article.get('source')
+    if not isinstance(source, dict):
+        source = {'name': source or article.get('source_name') or article.get('source_id') or 'Unknown'}
+    normalized['source'] = source
+    normalized.setdefault('provider', provider)
+    return normalized
+
+
+def merge_articles(results: List[List[Dict]], max_articles: int,
+                   index: Optional[UrlIndex] = None) -> List[Dict]:
+    """
+    Interleave provider results round-robin, dropping duplicates
+
+    Two articles are duplicates if their URLs have the same canonical form
+    (see canonical_url) or they share a title (ignoring case and spacing).
+
+    Args:
+        results: Normalized articles per provider, in preference order
+        max_articles: Maximum articles returned
+        index: URL index to check and fill (default: a new one)
+    """
+    index = index if index is not None else UrlIndex()
+    seen_titles = set()
+    merged = []
+    for rank in range(max((len(articles) for articles in results), default=0)):
+        for articles in results:
+            if rank >= len(articles):
+                continue
+            article = articles[rank]
+            title = ' '.join(article['title'].casefold().split())
+            if title in seen_titles or article['url'] in index:
+                continue
+            index.add(article['url'], article.get('article_id'))
+            seen_titles.add(title)
+            merged.append(article)
+            if len(merged) >= max_articles:
+                return merged
+    return merged
+
+
+class FetchAggregator:
+    """
+    Drop-in replacement for NewsService.fetch_news over all enabled fetchers
+
+    Every fetcher whose circuit is closed and whose daily quota allows
+    another run is started at once; each gets its own timeout, and a
+    fetcher that overruns it is left behind rather than delaying the
+    others. Adding a fetcher therefore does not lengthen a run.
+    """
+
+    def __init__(self, fetchers: List[NewsFetcher], health: ProviderHealth,
+                 quotas: Optional[Dict[str, int]] = None, timeouts: Optional[Dict[str, float]] = None,
+                 trends: Optional[TrendDetector] = None):
+        """
+        Args:
+            fetchers: Fetcher plugins, in preference order
+            health: Shared breaker/latency state
+            quotas: Daily request quota per fetcher name (missing = unlimited)
+            timeouts: Seconds per fetcher name (missing = the fetcher's default)
+            trends: Re-ranks merged results by trending terms (None = merge order)
+        """
+        self.fetchers = fetchers
+        self.health = health
+        self.quotas = quotas or {}
+        self.timeouts = timeouts or {}
+        self.trends = trends
+
+    @property
+    def preference(self) -> List[str]:
+        return [fetcher.name for fetcher in self.fetchers]
+
+    @classmethod
+    def from_config(cls, config: dict, health: Optional[ProviderHealth] = None) -> 'FetchAggregator':
+        """
+        Build an aggregator over every enabled fetcher (see FETCHERS)
+
+        Args:
+            config: Configuration dictionary
+            health: Existing health state to keep (e.g. across config reloads)
+        """
+        fetchers = create_fetchers(config)
+        quotas, timeouts = {}, {}
+        for fetcher in fetchers:
+            prefix = fetcher.name.upper()
+            quota = config.get(f"{prefix}_DAILY_QUOTA") or DEFAULT_DAILY_QUOTAS.get(fetcher.name)
+            if quota:
+                quotas[fetcher.name] = int(quota)
+            if config.get(f"{prefix}_TIMEOUT_SECONDS"):
+                timeouts[fetcher.name] = float(config[f"{prefix}_TIMEOUT_SECONDS"])
+        return cls(fetchers, health or provider_health_from_config(config), quotas, timeouts,
+                   trends=trend_detector_from_config(config))
+
+    def _timeout(self, fetcher: NewsFetcher) -> float:
+        return self.timeouts.get(fetcher.name, fetcher.timeout)
+
+    def _affordable(self, fetcher: NewsFetcher) -> bool:
+        quota = self.quotas.get(fetcher.name)
+        if not quota:
+            return True
+        return self.health.requests_today(fetcher.name) + fetcher.requests_per_fetch <= quota
+
+    def _run(self, fetcher: NewsFetcher, max_articles: int, deadline: float) -> Optional[List[Dict]]:
+        """Run one fetcher and record the outcome; None on failure"""
+        started = time.monotonic()
+        try:
+            # Every HTTP attempt, retries included, counts against the quota
+            with AttemptCounter() as attempts:
+                raw = fetcher.fetch(max_articles, deadline)
+        except Exception as e:
+            self.health.record(fetcher.name, False, time.monotonic() - started)
+            logger.warning(f"Fetcher {fetcher.name} failed: {e}")
+            return None
+        finally:
+            self.health.count_requests(fetcher.name, attempts.count)
+
+        latency = time.monotonic() - started
+        articles = [a for a in (normalize_article(article, fetcher.name) for article in raw or []) if a]
+        # Shortener and Google News links point at the publisher's page (cached after the first run)
+        resolve_urls(articles)
+        # Finishing past the deadline counts as a failure: the run did not wait for it
+        self.health.record(fetcher.name, bool(articles) and time.monotonic() <= deadline, latency)
+        logger.info(f"Fetcher {fetcher.name} returned {len(articles)} articles in {latency:.1f}s")
+        return articles or None
+
+    def fetch_news(self, max_articles: int = 25) -> Tuple[List[Dict], str]:
+        """
+        Fetch from all available fetchers at once and merge the results
+
+        Args:
+            max_articles: Maximum number of articles
+
+        Returns:
+            Tuple of (articles, api_source); api_source names the fetchers
+            that contributed, joined with '+'. ([], 'none') if all failed.
+        """
+        candidates = []
+        for fetcher in self.fetchers:
+            if not self._affordable(fetcher):
+                logger.warning(f"Skipping {fetcher.name}: daily quota of {self.quotas[fetcher.name]} used up")
+            elif not self.health.allow(fetcher.name):
+                logger.info(f"Skipping {fetcher.name}: circuit open")
+            else:
+                candidates.append(fetcher)
+        if not candidates:
+            return [], 'none'
+
+        started = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix='fetch')
+        pending = {}
+        for fetcher in candidates:
+            deadline = started + self._timeout(fetcher)
+            pending[pool.submit(self._run, fetcher, max_articles, deadline)] = (fetcher, deadline)
+        # Threads cannot be killed; stragglers finish in the background
+        pool.shutdown(wait=False)
+
+        results: Dict[str, List[Dict]] = {}
+        while pending:
+            next_deadline = min(deadline for _, deadline in pending.values())
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                fetcher, _ = pending.pop(future)
+                if future.result():
+                    results[fetcher.name] = future.result()
+            now = time.monotonic()
+            for future, (fetcher, deadline) in list(pending.items()):
+                if now >= deadline:
+                    logger.warning(f"Fetcher {fetcher.name} timed out after {self._timeout(fetcher):.0f}s")
+                    del pending[future]
+
+        contributors = [fetcher.name for fetcher in candidates if fetcher.name in results]
+        if not contributors:
+            return [], 'none'
+        articles = merge_articles([results[name] for name in contributors], max_articles)
+        if self.trends is not None:
+            articles = self.trends.rank(articles)
+        return articles, '+'.join(contributors)
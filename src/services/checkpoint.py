@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Send Checkpoint
+Persists an in-flight digest so an interrupted slot can be finished on restart
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from .prefetch import PreparedDigest
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESUME_MAX_AGE_MINUTES = 60
+
+
+class SendCheckpoint:
+    """
+    The digest being sent (one JSON file, written once when the send
+    starts) and a log of the group indices already sent, one line appended
+    per email, so checkpointing costs the same however many groups the
+    digest has. Both are removed once the slot completes.
+    """
+
+    def __init__(self, path, max_age: float = DEFAULT_RESUME_MAX_AGE_MINUTES * 60):
+        """
+        Args:
+            path: Checkpoint file location
+            max_age: Seconds after which an interrupted slot is not resumed
+        """
+        self.path = Path(path)
+        self.sent_path = self.path.with_name(self.path.name + '.sent')
+        self.max_age = max_age
+
+    def begin(self, digest: PreparedDigest, sent: Set[int], created_at: float):
+        """
+        Record a digest and the indices of groups already sent
+
+        Replaces any other send's checkpoint; callers resume that first
+        (see load()), so one still here is logged as lost.
+        """
+        leftover = self._leftover()
+        if leftover is not None and leftover[0] != created_at:
+            _, slot, remaining = leftover
+            logger.warning(f"Discarding the unfinished send for slot {slot} "
+                           f"({remaining} email(s) not sent)")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The log's header names its digest, so a crash between the two
+        # writes cannot pair it with another digest's file
+        tmp_path = self.sent_path.with_name(self.sent_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f"# {created_at!r}\n")
+            f.writelines(f"{index}\n" for index in sorted(sent))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.sent_path)
+
+        state = {
+            'slot': digest.slot,
+            'api_source': digest.api_source,
+            'article_count': digest.article_count,
+            'groups': [[articles, recipients] for articles, recipients in digest.groups],
+            'created_at': created_at,
+        }
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def mark_sent(self, index: int):
+        """Append one sent group index to the log"""
+        with open(self.sent_path, 'a', encoding='utf-8') as f:
+            f.write(f"{index}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_sent(self, created_at: float) -> Set[int]:
+        try:
+            with open(self.sent_path, 'r', encoding='utf-8') as f:
+                if f.readline().strip() != f"# {created_at!r}":
+                    return set()
+                # A line cut short by a crash ("17" of "175") is ignored
+                return {int(line) for line in f if line.endswith('\n') and line.strip().isdigit()}
+        except FileNotFoundError:
+            return set()
+        except OSError as e:
+            logger.error(f"Could not read sent log {self.sent_path}: {e}")
+            return set()
+
+    def _leftover(self) -> Optional[Tuple[float, Optional[str], int]]:
+        """(creation time, slot, unsent email count) of the checkpoint on disk, if any"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            # Missing, or unreadable and so not resumable either
+            return None
+        created_at = state.get('created_at', 0)
+        remaining = len(state.get('groups', [])) - len(self._read_sent(created_at))
+        return created_at, state.get('slot'), remaining
+
+    def load(self) -> Optional[Tuple[PreparedDigest, Set[int], float]]:
+        """
+        Load an interrupted send
+
+        Returns:
+            (digest, sent group indices, creation time) or None if there is
+            nothing to resume or it is too old
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            self.clear()
+            return None
+
+        age = time.time() - state.get('created_at', 0)
+        if age > self.max_age:
+            logger.warning(f"Interrupted send for {state.get('slot')} is {age / 60:.0f} min old, not resuming")
+            self.clear()
+            return None
+
+        digest = PreparedDigest(
+            state.get('slot'), state.get('api_source', 'unknown'),
+            [(articles, recipients) for articles, recipients in state.get('groups', [])],
+            state.get('article_count', 0)
+        )
+        return digest, self._read_sent(state['created_at']), state['created_at']
+
+    def clear(self):
+        """Forget the checkpoint"""
+        for path in (self.path, self.sent_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Configuration Service
+Parses config.txt + environment once, caches it and reloads it when the file changes
+"""
+
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Searched in order; the first file that exists is used
+DEFAULT_CONFIG_PATHS = [
+    PROJECT_ROOT / 'config' / 'config.txt',
+    PROJECT_ROOT / 'config.txt',
+    Path('config') / 'config.txt',
+    Path('config.txt'),
+]
+
+# Every setting, grouped by what has to be rebuilt when it changes; the
+# scheduler subscribes by group. Environment variables may set any of them
+# even when the file does not.
+KEY_GROUPS = {
+    'news_service': (
+        'NEWS_API_KEY', 'NEWSDATA_API_KEY', 'API_PREFERENCE',
+        'HEDGE_REQUESTS', 'NEWSAPI_DAILY_QUOTA', 'NEWSDATA_DAILY_QUOTA',
+        'NEWSAPI_RATE_LIMIT', 'NEWSDATA_RATE_LIMIT',
+        'FETCH_MODE', 'FETCHERS', 'FETCHER_PLUGINS', 'NEWSAPI_TIMEOUT_SECONDS', 'NEWSDATA_TIMEOUT_SECONDS',
+        'RSS_FEEDS', 'RSS_STATE_FILE', 'RSS_TIMEOUT_SECONDS',
+        'ENRICH_ARTICLES', 'ARTICLE_CACHE_FILE', 'ARTICLE_RATE_LIMIT', 'REDIRECT_RATE_LIMIT',
+        'STORY_THREADS', 'STORY_STATE_FILE', 'STORY_SIMILARITY',
+        'TRENDS', 'TREND_STATE_FILE', 'TREND_WEIGHT',
+        'LINK_CHECK', 'LINK_CACHE_FILE',
+        'IMAGE_CACHE', 'IMAGE_CACHE_DIR', 'IMAGE_CACHE_MB', 'IMAGE_RATE_LIMIT',
+    ),
+    'provider_health': (
+        'CIRCUIT_FAILURE_RATE', 'CIRCUIT_SLOW_CALL_SECONDS', 'CIRCUIT_OPEN_MINUTES', 'PROVIDER_HEALTH_FILE',
+    ),
+    'email': (
+        'SMTP_SERVER', 'SMTP_PORT', 'SENDER_EMAIL', 'SENDER_PASSWORD', 'RECIPIENT_EMAILS',
+        'RECIPIENT_PROFILES', 'EMAIL_OPTIMIZE', 'EMAIL_PLAIN_TEXT', 'MAX_ARTICLES',
+    ),
+    'schedule': (
+        'SCHEDULE_TIMES', 'SCHEDULE_TIMEZONE', 'PREFETCH_LEAD_MINUTES',
+        'MISFIRE_POLICY', 'MISFIRE_GRACE_MINUTES',
+    ),
+    'jobs': (
+        'PREFETCH_MAX_AGE_MINUTES', 'JOB_TIMEOUT_MINUTES', 'RESUME_MAX_AGE_MINUTES',
+        'SHUTDOWN_GRACE_SECONDS',
+    ),
+    # Only read when the scheduler starts
+    'startup': ('SCHEDULER_LOCK_FILE', 'CHECKPOINT_FILE', 'CONFIG_RELOAD_SECONDS'),
+}
+
+KNOWN_KEYS = tuple(key for keys in KEY_GROUPS.values() for key in keys)
+
+# Values copied from config.example.txt that mean "not configured"
+PLACEHOLDER_VALUES = {
+    '', 'your_api_key_here', 'your_newsapi_key_here', 'your_newsapi_org_key_here',
+    'your_newsdata_io_api_key_here', 'your_email@gmail.com', 'your_app_password_here',
+}
+
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def parse_config_file(path: Path) -> Dict[str, str]:
+    """
+    Parse a KEY=VALUE config file
+
+    Blank lines and # comments are skipped; surrounding quotes are removed.
+    """
+    values = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                values[key.strip()] = value.strip().strip('"\'')
+    return values
+
+
+class Settings(dict):
+    """
+    Parsed configuration
+
+    Still a dict, so everything that takes a config dictionary keeps
+    working; the properties give typed access to the core settings.
+    """
+
+    def _value(self, key: str) -> Optional[str]:
+        value = self.get(key)
+        return None if value is None or value in PLACEHOLDER_VALUES else value
+
+    @property
+    def news_api_key(self) -> Optional[str]:
+        return self._value('NEWS_API_KEY')
+
+    @property
+    def newsdata_api_key(self) -> Optional[str]:
+        return self._value('NEWSDATA_API_KEY')
+
+    @property
+    def api_preference(self) -> str:
+        return (self.get('API_PREFERENCE') or 'newsapi').lower()
+
+    @property
+    def smtp_server(self) -> Optional[str]:
+        return self._value('SMTP_SERVER')
+
+    @property
+    def smtp_port(self) -> int:
+        return int(self.get('SMTP_PORT') or 587)
+
+    @property
+    def sender_email(self) -> Optional[str]:
+        return self._value('SENDER_EMAIL')
+
+    @property
+    def sender_password(self) -> Optional[str]:
+        # Gmail app passwords are often copied with spaces
+        value = self._value('SENDER_PASSWORD')
+        return value.replace(' ', '') if value else None
+
+    @property
+    def recipient_emails(self) -> List[str]:
+        return [e.strip() for e in (self.get('RECIPIENT_EMAILS') or '').split(',') if e.strip()]
+
+    @property
+    def schedule_times(self) -> str:
+        return self.get('SCHEDULE_TIMES') or '06:00,14:00,22:00'
+
+    def number(self, key: str, default: float) -> float:
+        """Numeric setting, falling back to the default when unset"""
+        value = self.get(key)
+        return float(value) if value not in (None, '') else default
+
+    def validate(self) -> List[str]:
+        """
+        Check the configuration
+
+        Returns:
+            List of problems (empty if the configuration is usable)
+        """
+        errors = []
+
+        if not self.news_api_key and not self.newsdata_api_key:
+            errors.append("No API key configured! Please set NEWS_API_KEY or NEWSDATA_API_KEY")
+        if self.api_preference not in ('newsapi', 'newsdata'):
+            errors.append(f"API_PREFERENCE must be newsapi or newsdata, not '{self.get('API_PREFERENCE')}'")
+
+        for key in ('SMTP_SERVER', 'SMTP_PORT', 'SENDER_EMAIL', 'SENDER_PASSWORD', 'RECIPIENT_EMAILS'):
+            if not self._value(key):
+                errors.append(f"Missing required configuration: {key}")
+
+        try:
+            if not 0 < self.smtp_port < 65536:
+                errors.append(f"SMTP_PORT out of range: {self.smtp_port}")
+        except ValueError:
+            errors.append(f"SMTP_PORT must be a number, not '{self.get('SMTP_PORT')}'")
+
+        for email in [self.get('SENDER_EMAIL') or ''] + self.recipient_emails:
+            if email and not _EMAIL_RE.match(email):
+                errors.append(f"Invalid email address: {email}")
+
+        # Imported here: the scheduler core is only needed to validate
+        from .scheduler_core import MISFIRE_POLICIES, parse_schedule_times
+        try:
+            if not parse_schedule_times(self.schedule_times, self.get('SCHEDULE_TIMEZONE')):
+                errors.append("No valid schedule times configured")
+        except ValueError as e:
+            errors.append(str(e))
+
+        misfire_policy = (self.get('MISFIRE_POLICY') or 'coalesce').lower()
+        if misfire_policy not in MISFIRE_POLICIES:
+            errors.append(f"MISFIRE_POLICY must be one of {', '.join(MISFIRE_POLICIES)}, "
+                          f"not '{self.get('MISFIRE_POLICY')}'")
+
+        for key in ('PREFETCH_LEAD_MINUTES', 'PREFETCH_MAX_AGE_MINUTES', 'JOB_TIMEOUT_MINUTES',
+                    'MISFIRE_GRACE_MINUTES', 'SHUTDOWN_GRACE_SECONDS', 'RESUME_MAX_AGE_MINUTES',
+                    'CONFIG_RELOAD_SECONDS'):
+            try:
+                if self.number(key, 0) < 0:
+                    errors.append(f"{key} must not be negative")
+            except ValueError:
+                errors.append(f"{key} must be a number, not '{self.get(key)}'")
+
+        return errors
+
+
+class ConfigService:
+    """
+    Cached configuration with change notification
+
+    The file is parsed once; `reload_if_changed()` (or the `watch()` thread)
+    re-parses it only when its mtime or size changes and tells subscribers
+    which keys changed, so they can rebuild just the affected components.
+    """
+
+    def __init__(self, paths: Optional[Iterable] = None, environ: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            paths: Config files to search, first existing wins
+            environ: Environment overrides (default: os.environ)
+        """
+        self.paths = [Path(p) for p in paths] if paths is not None else DEFAULT_CONFIG_PATHS
+        self.environ = os.environ if environ is None else environ
+        self._settings: Optional[Settings] = None
+        self._signature: Optional[Tuple] = None
+        self._subscribers: List[Tuple[Set[str], Callable[[Settings, Set[str]], None]]] = []
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Config file in use, None if there is none"""
+        for path in self.paths:
+            if path.exists():
+                return path
+        return None
+
+    def _file_signature(self) -> Optional[Tuple]:
+        path = self.path
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+
+    def _load(self) -> Settings:
+        values = {}
+        path = self.path
+        if path is not None:
+            try:
+                values = parse_config_file(path)
+            except OSError as e:
+                logger.error(f"Failed to read {path}: {e}")
+
+        # Environment variables override the file
+        for key in set(KNOWN_KEYS) | set(values):
+            env_value = self.environ.get(key)
+            if env_value:
+                values[key] = env_value
+        return Settings(values)
+
+    def get(self) -> Settings:
+        """Current settings, parsing the file on first use"""
+        with self._lock:
+            if self._settings is None:
+                self._signature = self._file_signature()
+                self._settings = self._load()
+            return self._settings
+
+    def subscribe(self, keys: Iterable[str], callback: Callable[[Settings, Set[str]], None]):
+        """
+        Call `callback(settings, changed_keys)` when any of `keys` changes
+
+        Callbacks run on the thread that detected the change.
+        """
+        with self._lock:
+            self._subscribers.append((set(keys), callback))
+
+    def reload_if_changed(self) -> Set[str]:
+        """
+        Re-parse the file if it changed and notify subscribers
+
+        An invalid new configuration is rejected and the current one kept.
+
+        Returns:
+            Keys whose values changed (empty if nothing was reloaded)
+        """
+        with self._lock:
+            current = self.get()
+            signature = self._file_signature()
+            if signature == self._signature:
+                return set()
+            self._signature = signature
+
+            updated = self._load()
+            changed = {key for key in set(current) | set(updated) if current.get(key) != updated.get(key)}
+            if not changed:
+                return set()
+
+            errors = updated.validate()
+            if errors:
+                for error in errors:
+                    logger.error(f"Config reload rejected: {error}")
+                return set()
+
+            self._settings = updated
+            subscribers = list(self._subscribers)
+
+        logger.info(f"Configuration reloaded; changed: {', '.join(sorted(changed))}")
+        for keys, callback in subscribers:
+            if keys & changed:
+                try:
+                    callback(updated, changed)
+                except Exception as e:
+                    logger.error(f"Failed to apply configuration change: {e}")
+        return changed
+
+    def watch(self, interval: float, stop_event: threading.Event) -> threading.Thread:
+        """
+        Poll the file's mtime in a daemon thread until stop_event is set
+
+        Args:
+            interval: Seconds between checks
+            stop_event: Ends the watcher when set
+
+        Returns:
+            The started thread
+        """
+        def _watch():
+            while not stop_event.wait(interval):
+                self.reload_if_changed()
+
+        thread = threading.Thread(target=_watch, name='config-watcher', daemon=True)
+        thread.start()
+        return thread
+
+
+_service: Optional[ConfigService] = None
+_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    """Process-wide configuration service"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ConfigService()
+        return _service
+
+
+def get_setting(key: str) -> Optional[str]:
+    """
+    Look up one setting, ignoring placeholders from the example config
+
+    Args:
+        key: Configuration key (e.g. NEWS_API_KEY)
+
+    Returns:
+        The value, or None if it is not configured
+    """
+    return get_config_service().get()._value(key)
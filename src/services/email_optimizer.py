@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Email Payload Optimizer
+Shrinks digest emails before they go out over SMTP
+"""
+
+import hashlib
+import logging
+import re
+import smtplib
+import string
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, List, Tuple
+
+from ..fetchers.summarizer import clip_text, summarize_articles
+from ..fetchers.text_normalizer import normalize_text
+from .email_sender import EmailSender
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DESCRIPTION_LENGTH = 220
+
+# Seconds to wait for the SMTP server when this module sends the message itself
+SMTP_TIMEOUT = 30
+
+_STYLE_ATTR_RE = re.compile(r'\sstyle\s*=\s*("([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_TAG_RE = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*?)?(/?)>')
+_CLASS_ATTR_RE = re.compile(r'\sclass\s*=\s*("([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_HEAD_CLOSE_RE = re.compile(r'</head\s*>', re.IGNORECASE)
+_BODY_OPEN_RE = re.compile(r'<body[^>]*>', re.IGNORECASE)
+_PRESERVE_RE = re.compile(r'(<(pre|textarea|script)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+# Whitespace before a block-level tag is never rendered; between inline
+# elements ("<b>a</b> <a>b</a>") it is a real space and only collapsed
+_BLOCK_GAP_RE = re.compile(
+    r'>\s+(?=</?(?:html|head|body|meta|title|style|table|thead|tbody|tfoot|tr|td|th|'
+    r'div|p|h[1-6]|ul|ol|li|br|hr|center|blockquote)\b)',
+    re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class PayloadReport:
+    """Byte savings for one digest"""
+
+    def __init__(self, original_bytes: int, optimized_bytes: int, shared_styles: int):
+        self.original_bytes = original_bytes
+        self.optimized_bytes = optimized_bytes
+        self.shared_styles = shared_styles
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+    @property
+    def saved_percent(self) -> float:
+        if not self.original_bytes:
+            return 0.0
+        return 100.0 * self.saved_bytes / self.original_bytes
+
+    def __str__(self) -> str:
+        return (f"{self.original_bytes:,} -> {self.optimized_bytes:,} bytes "
+                f"(-{self.saved_percent:.1f}%, {self.shared_styles} shared style(s))")
+
+
+def _normalize_style(style: str) -> str:
+    """Canonical form of an inline style so equivalent ones are merged"""
+    declarations = []
+    for declaration in style.split(';'):
+        if ':' in declaration:
+            prop, value = declaration.split(':', 1)
+            declarations.append(f"{prop.strip().lower()}:{_WHITESPACE_RE.sub(' ', value.strip())}")
+    return ';'.join(declarations)
+
+
+def _class_prefix(content: str) -> str:
+    """Short class name prefix for shared styles, one the template does not use anywhere"""
+    for letter in string.ascii_lowercase:
+        if f"{letter}-" not in content:
+            return f"{letter}-"
+    salt = 0
+    while True:
+        prefix = 'x' + hashlib.sha1(f"{salt}:{content}".encode('utf-8')).hexdigest()[:6] + '-'
+        if prefix not in content:
+            return prefix
+        salt += 1
+
+
+def _dedupe_inline_styles(content: str) -> Tuple[str, int]:
+    """
+    Move repeated inline styles into a single <style> block
+
+    Styles used only once stay inline; turning them into a class would
+    add bytes instead of saving them.
+    """
+    counts: Dict[str, int] = {}
+    for match in _STYLE_ATTR_RE.finditer(content):
+        style = _normalize_style(match.group(2) if match.group(2) is not None else match.group(3))
+        if style:
+            counts[style] = counts.get(style, 0) + 1
+
+    shared = [style for style, count in counts.items() if count > 1]
+    if not shared:
+        return content, 0
+    prefix = _class_prefix(content)
+    class_names = {style: f"{prefix}{i}" for i, style in enumerate(shared)}
+
+    def rewrite_tag(match: re.Match) -> str:
+        name, attrs, closing = match.group(1), match.group(2) or '', match.group(3)
+        style_match = _STYLE_ATTR_RE.search(attrs)
+        if not style_match:
+            return match.group(0)
+        raw = style_match.group(2) if style_match.group(2) is not None else style_match.group(3)
+        class_name = class_names.get(_normalize_style(raw))
+        if not class_name:
+            return match.group(0)
+
+        attrs = attrs[:style_match.start()] + attrs[style_match.end():]
+        class_match = _CLASS_ATTR_RE.search(attrs)
+        if class_match:
+            existing = class_match.group(2) if class_match.group(2) is not None else class_match.group(3)
+            attrs = (attrs[:class_match.start()] + f' class="{existing} {class_name}"'
+                     + attrs[class_match.end():])
+        else:
+            attrs += f' class="{class_name}"'
+        return f"<{name}{attrs}{closing}>"
+
+    content = _TAG_RE.sub(rewrite_tag, content)
+
+    # Element selectors are not used, and the prefix appears nowhere in the
+    # template, so these rules only ever match the classes added above
+    style_block = '<style>' + ''.join(
+        f".{class_names[style]}{{{style}}}" for style in shared
+    ) + '</style>'
+
+    if _HEAD_CLOSE_RE.search(content):
+        content = _HEAD_CLOSE_RE.sub(lambda m: style_block + m.group(0), content, count=1)
+    elif _BODY_OPEN_RE.search(content):
+        content = _BODY_OPEN_RE.sub(lambda m: m.group(0) + style_block, content, count=1)
+    else:
+        content = style_block + content
+    return content, len(shared)
+
+
+def _collapse_whitespace(content: str) -> str:
+    """Strip comments and whitespace runs, leaving <pre>/<textarea> intact"""
+    parts = _PRESERVE_RE.split(content)
+    out = []
+    # split() with two groups yields [text, block, tagname, text, block, tagname, ...]
+    for i in range(0, len(parts), 3):
+        text = _COMMENT_RE.sub('', parts[i])
+        text = _BLOCK_GAP_RE.sub('>', text)
+        out.append(_WHITESPACE_RE.sub(' ', text))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip()
+
+
+def optimize_html(content: str) -> Tuple[str, PayloadReport]:
+    """
+    Optimize a rendered HTML digest
+
+    Args:
+        content: HTML email body
+
+    Returns:
+        Tuple of (optimized HTML, byte savings report)
+    """
+    original_bytes = len(content.encode('utf-8'))
+    content, shared_styles = _dedupe_inline_styles(content)
+    content = _collapse_whitespace(content)
+    report = PayloadReport(original_bytes, len(content.encode('utf-8')), shared_styles)
+    return content, report
+
+
+def truncate_description(text: str, max_length: int = DEFAULT_DESCRIPTION_LENGTH) -> str:
+    """
+    Clean a description and cut it at a word boundary
+
+    Args:
+        text: Raw provider description (may contain HTML)
+        max_length: Maximum length in characters, including the ellipsis
+
+    Returns:
+        Cleaned, possibly truncated description
+    """
+    if not text:
+        return ''
+    return clip_text(normalize_text(text), max_length)
+
+
+def build_plain_text(articles: List[Dict], api_source: str) -> str:
+    """
+    Compact plain-text alternative for the digest
+
+    Args:
+        articles: Articles (ideally already compacted)
+        api_source: API the articles came from
+
+    Returns:
+        Plain text body
+    """
+    lines = [f"Indian News Update ({len(articles)} stories, via {api_source})", '']
+    for i, article in enumerate(articles, 1):
+        source = (article.get('source') or {}).get('name', 'Unknown source')
+        lines.append(f"{i}. {article.get('title', 'No title')} ({source})")
+        if article.get('description'):
+            lines.append(f"   {article['description']}")
+        if article.get('url'):
+            lines.append(f"   {article['url']}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def compact_articles(articles: List[Dict],
+                     max_description: int = DEFAULT_DESCRIPTION_LENGTH) -> List[Dict]:
+    """
+    Copies of the articles with descriptions summarized to fit
+
+    Bulky fields no renderer uses (full `content`, extracted `body`) are
+    dropped. The articles come from the aggregator, which has normalized
+    their text already.
+    """
+    compacted = []
+    summaries = summarize_articles(articles, max_length=max_description, normalized=True)
+    for article, summary in zip(articles, summaries):
+        article = dict(article)
+        article.pop('content', None)
+        article.pop('body', None)
+        article['description'] = summary
+        compacted.append(article)
+    return compacted
+
+
+class OptimizedEmailSender(EmailSender):
+    """
+    EmailSender that compacts articles and optimizes the HTML body
+
+    Hooks `_create_html_email()`, the template's single rendering entry
+    point, so templates can keep their readable inline styles. With
+    `plain_text`, the message is assembled here instead, as a
+    multipart/alternative with a compact text/plain part before the HTML.
+    """
+
+    def __init__(self, smtp_server: str, smtp_port: int, sender_email: str, sender_password: str,
+                 recipient_emails: List[str], max_description: int = DEFAULT_DESCRIPTION_LENGTH,
+                 plain_text: bool = False):
+        """
+        Args:
+            smtp_server, smtp_port, sender_email, sender_password, recipient_emails:
+                As for EmailSender
+            max_description: Summarized description length, in characters
+            plain_text: Add a compact text/plain alternative to each digest
+        """
+        super().__init__(smtp_server, smtp_port, sender_email, sender_password, recipient_emails)
+        self.max_description = max_description
+        self.plain_text = plain_text
+        self.last_report = None
+        self._smtp = (smtp_server, int(smtp_port), sender_email, sender_password)
+        self._recipients = list(recipient_emails)
+
+    def send_news_email(self, articles: List[Dict], api_source: str) -> bool:
+        articles = compact_articles(articles, self.max_description)
+        if not self.plain_text:
+            return super().send_news_email(articles, api_source)
+        try:
+            message = self.build_message(articles, api_source)
+            self._deliver(message)
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"Failed to send news email: {e}")
+            return False
+        return True
+
+    def build_message(self, articles: List[Dict], api_source: str) -> MIMEMultipart:
+        """
+        Assemble the digest as multipart/alternative (text/plain, then HTML)
+
+        Args:
+            articles: Compacted articles
+            api_source: API the articles came from
+
+        Returns:
+            The message, addressed to every recipient
+        """
+        message = MIMEMultipart('alternative')
+        message['Subject'] = f"Indian News Update - {datetime.now():%d %b %Y %H:%M}"
+        message['From'] = self._smtp[2]
+        message['To'] = ', '.join(self._recipients)
+        # Clients show the last part they can render, so HTML goes last
+        message.attach(MIMEText(build_plain_text(articles, api_source), 'plain', 'utf-8'))
+        message.attach(MIMEText(self._create_html_email(articles, api_source), 'html', 'utf-8'))
+        return message
+
+    def _deliver(self, message: MIMEMultipart):
+        server, port, sender_email, sender_password = self._smtp
+        # Port 465 is implicit TLS; the others (587, 25) upgrade with STARTTLS
+        if port == 465:
+            connection = smtplib.SMTP_SSL(server, port, timeout=SMTP_TIMEOUT)
+        else:
+            connection = smtplib.SMTP(server, port, timeout=SMTP_TIMEOUT)
+        with connection:
+            if port != 465:
+                connection.starttls()
+            connection.login(sender_email, sender_password)
+            connection.send_message(message, sender_email, self._recipients)
+
+    def _create_html_email(self, *args, **kwargs) -> str:
+        content, report = optimize_html(super()._create_html_email(*args, **kwargs))
+        self.last_report = report
+        logger.info(f"Digest payload optimized: {report}")
+        return content
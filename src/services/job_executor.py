@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Job Executor
+Runs scheduled jobs in worker threads with deadlines and overlap protection
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobHandle:
+    """A running job"""
+
+    def __init__(self, key: str, timeout: float):
+        self.key = key
+        self.timeout = timeout
+        self.started = time.monotonic()
+        # Set when the deadline passes; jobs check it between steps
+        self.cancel = threading.Event()
+        self.done = threading.Event()
+        self.thread = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+class JobExecutor:
+    """
+    Worker-thread job runner
+
+    Each job key is single-flight: submitting a key that is still running is
+    refused, so a manual run and a scheduled slot cannot overlap. When a job
+    passes its deadline its cancel event is set; the job is expected to stop
+    at its next checkpoint. Python threads cannot be killed, so the key stays
+    held until the worker actually exits: a send still in progress must not
+    overlap a second send of the same digest. Jobs that must not be lost
+    are `enqueue()`d instead and start, in order, once the key is free.
+    """
+
+    def __init__(self):
+        self._active: Dict[str, JobHandle] = {}
+        self._queued: Dict[str, Deque[Tuple[Callable, float, tuple, dict]]] = {}
+        self._lock = threading.Lock()
+        self._accepting = True
+
+    def submit(self, key: str, func: Callable, timeout: float, *args, **kwargs) -> bool:
+        """
+        Start a job unless one with the same key is running
+
+        Args:
+            key: Single-flight key
+            func: Job callable; receives the handle's cancel event as `cancel`
+            timeout: Hard deadline in seconds
+            *args, **kwargs: Passed to func
+
+        Returns:
+            True if the job was started, False if the key was busy
+        """
+        with self._lock:
+            if not self._accepting:
+                logger.warning(f"Shutting down, not starting job '{key}'")
+                return False
+            running = self._active.get(key)
+            if running is not None and running.cancel.is_set():
+                logger.error(f"Job '{key}' passed its deadline {running.elapsed - running.timeout:.0f}s ago "
+                             f"but its worker has not exited, not starting another")
+                return False
+            if running is not None:
+                logger.warning(f"Job '{key}' still running after {running.elapsed:.0f}s, not starting another")
+                return False
+            handle = JobHandle(key, timeout)
+            self._active[key] = handle
+
+        self._start(handle, func, args, kwargs)
+        return True
+
+    def enqueue(self, key: str, func: Callable, timeout: float, *args, **kwargs) -> bool:
+        """
+        Start a job now, or once the running job with the same key exits
+
+        The deadline counts from when the job actually starts. A job equal to
+        one already waiting (same callable and arguments) is not queued twice.
+
+        Args:
+            key: Single-flight key
+            func: Job callable; receives the handle's cancel event as `cancel`
+            timeout: Hard deadline in seconds
+            *args, **kwargs: Passed to func
+
+        Returns:
+            True if the job was started or queued, False when shutting down
+        """
+        with self._lock:
+            if not self._accepting:
+                logger.warning(f"Shutting down, not starting job '{key}'")
+                return False
+            running = self._active.get(key)
+            if running is not None:
+                queued = self._queued.setdefault(key, deque())
+                if (func, timeout, args, kwargs) in queued:
+                    logger.info(f"An identical job '{key}' is already waiting")
+                else:
+                    queued.append((func, timeout, args, kwargs))
+                    logger.warning(f"Job '{key}' still running after {running.elapsed:.0f}s, "
+                                   f"the next one waits for it ({len(queued)} waiting)")
+                return True
+            handle = JobHandle(key, timeout)
+            self._active[key] = handle
+
+        self._start(handle, func, args, kwargs)
+        return True
+
+    def _start(self, handle: JobHandle, func: Callable, args, kwargs):
+        handle.thread = threading.Thread(
+            target=self._run, args=(handle, func, args, kwargs),
+            name=f"job-{handle.key}", daemon=True
+        )
+        handle.thread.start()
+
+        watchdog = threading.Timer(handle.timeout, self._expire, args=(handle,))
+        watchdog.daemon = True
+        watchdog.start()
+
+    def _run(self, handle: JobHandle, func: Callable, args, kwargs):
+        try:
+            func(*args, cancel=handle.cancel, **kwargs)
+        except Exception as e:
+            logger.error(f"Job '{handle.key}' failed: {e}")
+        finally:
+            handle.done.set()
+            self._release(handle)
+            if handle.cancel.is_set():
+                logger.info(f"Timed-out job '{handle.key}' finished after {handle.elapsed:.0f}s")
+
+    def _expire(self, handle: JobHandle):
+        if handle.done.is_set():
+            return
+        logger.error(f"Job '{handle.key}' exceeded its {handle.timeout:.0f}s deadline, cancelling; "
+                     f"its key stays held until the worker exits")
+        handle.cancel.set()
+
+    def _release(self, handle: JobHandle):
+        """Free the handle's key, handing it straight to the next queued job"""
+        with self._lock:
+            if self._active.get(handle.key) is not handle:
+                return
+            del self._active[handle.key]
+            queued = self._queued.get(handle.key)
+            if not queued or not self._accepting:
+                return
+            func, timeout, args, kwargs = queued.popleft()
+            following = JobHandle(handle.key, timeout)
+            self._active[handle.key] = following
+
+        logger.info(f"Starting waiting job '{handle.key}'")
+        self._start(following, func, args, kwargs)
+
+    def active(self) -> List[JobHandle]:
+        """Jobs currently holding their key"""
+        with self._lock:
+            return list(self._active.values())
+
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._active
+
+    def shutdown(self, grace: float, cancel_wait: float = 5.0) -> bool:
+        """
+        Stop accepting jobs and drain the running ones
+
+        Jobs get `grace` seconds to finish on their own. Any still running are
+        then cancelled and get `cancel_wait` more seconds to reach their next
+        checkpoint and save progress.
+
+        Args:
+            grace: Seconds to let running jobs finish
+            cancel_wait: Seconds to wait after cancelling stragglers
+
+        Returns:
+            True if every job finished
+        """
+        with self._lock:
+            self._accepting = False
+            dropped = sum(len(queued) for queued in self._queued.values())
+            self._queued.clear()
+        if dropped:
+            logger.warning(f"Dropping {dropped} waiting job(s)")
+        pending = self.active()
+        if pending:
+            logger.info(f"Waiting up to {grace:.0f}s for {len(pending)} running job(s)...")
+
+        deadline = time.monotonic() + grace
+        for handle in pending:
+            handle.done.wait(max(0.0, deadline - time.monotonic()))
+
+        stragglers = [handle for handle in pending if not handle.done.is_set()]
+        for handle in stragglers:
+            logger.warning(f"Job '{handle.key}' did not finish in time, cancelling")
+            handle.cancel.set()
+        deadline = time.monotonic() + cancel_wait
+        for handle in stragglers:
+            handle.done.wait(max(0.0, deadline - time.monotonic()))
+
+        unfinished = [handle.key for handle in pending if not handle.done.is_set()]
+        if unfinished:
+            logger.error(f"Abandoning job(s) still running: {', '.join(unfinished)}")
+        return not unfinished
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Digest Prefetcher
+Builds each slot's digest ahead of time so the send fires on schedule
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .recipient_profiles import ArticleIndex, RecipientProfile
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEAD_MINUTES = 5
+DEFAULT_MAX_AGE_MINUTES = 30
+
+
+class PreparedDigest:
+    """Everything the send stage needs for one slot"""
+
+    def __init__(self, slot: Optional[str], api_source: str,
+                 groups: List[Tuple[List[Dict], List[str]]], article_count: int):
+        """
+        Args:
+            slot: Schedule slot (HH:MM), None for an ad-hoc run
+            api_source: API the articles came from
+            groups: (articles, recipient emails) pairs, one email each
+            article_count: Size of the shared fetch
+        """
+        self.slot = slot
+        self.api_source = api_source
+        self.groups = groups
+        self.article_count = article_count
+        self.prepared_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the digest was built"""
+        return time.monotonic() - self.prepared_at
+
+
+def build_digest(fetch_news: Callable[[int], Tuple[List[Dict], str]],
+                 profiles: List[RecipientProfile], slot: Optional[str] = None,
+                 min_articles: int = 25,
+                 prepare: Optional[Callable[[List[Dict]], List[Dict]]] = None) -> Optional[PreparedDigest]:
+    """
+    Fetch once and rank every profile due at a slot
+
+    Args:
+        fetch_news: NewsService.fetch_news-compatible callable
+        profiles: Recipient profiles
+        slot: Schedule slot being prepared
+        min_articles: Smallest shared fetch, whatever the profiles ask for
+        prepare: Called on the fetched articles before ranking (full text, stories, link checks)
+
+    Returns:
+        Prepared digest, or None if no articles could be fetched
+    """
+    # One shared fetch per slot, sized for the most demanding profile
+    pool_size = max([min_articles] + [p.max_articles for p in profiles])
+
+    # Fetch hottest/most interesting news articles
+    # NewsData.io will fetch from multiple categories and filter for viral content
+    articles, api_source = fetch_news(max_articles=pool_size)
+    if not articles:
+        return None
+
+    logger.info(f"Fetched {len(articles)} articles from {api_source}")
+    if prepare is not None:
+        try:
+            articles = prepare(articles)
+        except Exception as e:
+            # Full text and story grouping are a bonus; the digest goes out without them
+            logger.error(f"Article preparation failed: {e}")
+    groups = ArticleIndex(articles).group_recipients(profiles, slot)
+    return PreparedDigest(slot, api_source, groups, len(articles))
+
+
+class DigestPrefetcher:
+    """Holds prefetched digests until their slot's send stage claims them"""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE_MINUTES * 60):
+        """
+        Args:
+            max_age: Seconds after which a prepared digest is considered stale
+        """
+        self.max_age = max_age
+        self._prepared: Dict[Optional[str], PreparedDigest] = {}
+        self._lock = threading.Lock()
+
+    def store(self, digest: PreparedDigest):
+        """Keep a prepared digest for its slot, replacing any older one"""
+        with self._lock:
+            self._prepared[digest.slot] = digest
+
+    def discard(self, slot: Optional[str]):
+        """Forget the prepared digest for a slot (e.g. after a failed prefetch)"""
+        with self._lock:
+            self._prepared.pop(slot, None)
+
+    def clear(self):
+        """Forget every prepared digest"""
+        with self._lock:
+            self._prepared.clear()
+
+    def take(self, slot: Optional[str]) -> Optional[PreparedDigest]:
+        """
+        Claim the prepared digest for a slot
+
+        Returns:
+            The digest, or None if there is none or it has gone stale
+        """
+        with self._lock:
+            digest = self._prepared.pop(slot, None)
+        if digest is None:
+            return None
+        if digest.age > self.max_age:
+            logger.warning(f"Prefetched digest for {slot} is stale ({digest.age:.0f}s old)")
+            return None
+        return digest
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Process Lock
+Stops two scheduler processes on one host from both sending
+"""
+
+import logging
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessLock:
+    """
+    Exclusive, non-blocking lock on a file
+
+    The OS releases the lock when the process exits, however it exits, so a
+    crashed scheduler never leaves a stale lock behind.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+
+    def acquire(self) -> bool:
+        """
+        Try to take the lock
+
+        Returns:
+            True if this process now holds it, False if another process does
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            try:
+                lock_file.seek(0)
+                holder = lock_file.read().strip() or 'unknown'
+            except OSError:  # Windows locks block reads too
+                holder = 'unknown'
+            lock_file.close()
+            logger.error(f"Lock {self.path} is held by another process (pid {holder})")
+            return False
+
+        # Record the holder for the error message above
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        """Give up the lock"""
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise RuntimeError(f"Another scheduler is already running (lock: {self.path})")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
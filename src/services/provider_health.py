@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Provider Health
+Per-provider circuit breakers and latency/success tracking, persisted across restarts
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.3
+
+# Latency samples kept per provider for percentiles
+LATENCY_SAMPLES = 50
+
+# Recent success rate below which a provider is tried after untried ones
+HEALTHY_SUCCESS_RATE = 0.5
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one provider
+
+    Closed: calls go through and outcomes are recorded in a sliding window.
+    Open: calls are refused (costing no latency) for `open_seconds`.
+    Half-open: one trial call decides whether to close or re-open.
+
+    A call slower than `slow_call_seconds` counts as a failure, so a provider
+    that answers but takes most of its timeout is also taken out of rotation.
+    """
+
+    def __init__(self, failure_rate: float = 0.5, min_calls: int = 4, window: int = 10,
+                 slow_call_seconds: float = 20.0, open_seconds: float = 300.0):
+        """
+        Args:
+            failure_rate: Failure fraction (0-1) in the window that opens the breaker
+            min_calls: Calls needed in the window before the rate is trusted
+            window: Number of recent calls considered
+            slow_call_seconds: Latency above which a call counts as failed
+            open_seconds: How long the breaker stays open before a trial call
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.outcomes: List[bool] = []
+        self._trial_in_flight = False
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether a call may be attempted now"""
+        now = time.time() if now is None else now
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record(self, success: bool, latency: float, now: Optional[float] = None) -> bool:
+        """
+        Record a call outcome
+
+        Returns:
+            True if the breaker changed state
+        """
+        now = time.time() if now is None else now
+        ok = success and latency <= self.slow_call_seconds
+
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+            if ok:
+                self.state = CLOSED
+                self.outcomes = []
+            else:
+                self.state = OPEN
+                self.opened_at = now
+            return True
+
+        self.outcomes = (self.outcomes + [ok])[-self.window:]
+        failures = self.outcomes.count(False)
+        if (self.state == CLOSED and len(self.outcomes) >= self.min_calls
+                and failures / len(self.outcomes) >= self.failure_rate):
+            self.state = OPEN
+            self.opened_at = now
+            return True
+        return False
+
+    def to_dict(self) -> Dict:
+        return {'state': self.state, 'opened_at': self.opened_at, 'outcomes': self.outcomes}
+
+    def load(self, data: Dict):
+        self.state = data.get('state', CLOSED)
+        self.opened_at = data.get('opened_at', 0.0)
+        self.outcomes = list(data.get('outcomes', []))[-self.window:]
+        if self.state == HALF_OPEN:
+            # A trial interrupted by a restart is simply retried
+            self.state = OPEN
+
+
+class ProviderStats:
+    """Recent latency, success rate and daily request count of one provider"""
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.success_rate = 1.0
+        self.calls = 0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+        self.quota_day = ''
+        self.requests_today = 0
+
+    def record(self, success: bool, latency: float):
+        self.calls += 1
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+        self.success_rate = EWMA_ALPHA * float(success) + (1 - EWMA_ALPHA) * self.success_rate
+        if success:
+            # Only successful calls describe how long an answer takes
+            self.samples.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile of recent successful calls, None without history"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def count_requests(self, count: int, today: str):
+        if self.quota_day != today:
+            self.quota_day = today
+            self.requests_today = 0
+        self.requests_today += count
+
+    def used_today(self, today: str) -> int:
+        return self.requests_today if self.quota_day == today else 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'latency': self.latency, 'success_rate': self.success_rate, 'calls': self.calls,
+            'samples': list(self.samples),
+            'quota_day': self.quota_day, 'requests_today': self.requests_today,
+        }
+
+    def load(self, data: Dict):
+        self.latency = data.get('latency')
+        self.success_rate = data.get('success_rate', 1.0)
+        self.calls = data.get('calls', 0)
+        self.samples.extend(data.get('samples', []))
+        self.quota_day = data.get('quota_day', '')
+        self.requests_today = data.get('requests_today', 0)
+
+
+def _quota_day() -> str:
+    # Provider quotas reset on UTC days
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+class ProviderHealth:
+    """
+    Health of every provider, with adaptive ordering
+
+    Healthy providers are tried first, cheapest first: the expected cost is
+    recent latency divided by recent success rate. Providers with no history
+    follow in their configured preference order, then providers that have
+    been failing (awaiting a trial call, or mostly unsuccessful lately). State is saved to a JSON file after every
+    breaker transition and at most every `save_interval` seconds otherwise.
+    """
+
+    def __init__(self, path=None, breaker_options: Optional[Dict] = None,
+                 save_interval: float = 60.0):
+        """
+        Args:
+            path: State file (None = do not persist)
+            breaker_options: Keyword arguments for each CircuitBreaker
+            save_interval: Minimum seconds between routine saves
+        """
+        self.path = Path(path) if path else None
+        self.breaker_options = breaker_options or {}
+        self.save_interval = save_interval
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._load()
+
+    def _ensure(self, name: str):
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(**self.breaker_options)
+            self.stats[name] = ProviderStats()
+
+    def allow(self, name: str) -> bool:
+        """Whether the provider's breaker lets a call through"""
+        with self._lock:
+            self._ensure(name)
+            return self.breakers[name].allow()
+
+    def record(self, name: str, success: bool, latency: float):
+        """Record the outcome of a provider call"""
+        with self._lock:
+            self._ensure(name)
+            self.stats[name].record(success, latency)
+            changed = self.breakers[name].record(success, latency)
+            state = self.breakers[name].state
+        if changed:
+            logger.warning(f"Circuit for {name} is now {state}")
+        self.save(force=changed)
+
+    def state(self, name: str) -> str:
+        with self._lock:
+            self._ensure(name)
+            return self.breakers[name].state
+
+    def latency(self, name: str) -> Optional[float]:
+        with self._lock:
+            self._ensure(name)
+            return self.stats[name].latency
+
+    def latency_percentile(self, name: str, fraction: float) -> Optional[float]:
+        with self._lock:
+            self._ensure(name)
+            return self.stats[name].percentile(fraction)
+
+    def count_requests(self, name: str, count: int):
+        """Add API requests to the provider's daily usage"""
+        with self._lock:
+            self._ensure(name)
+            self.stats[name].count_requests(count, _quota_day())
+
+    def requests_today(self, name: str) -> int:
+        with self._lock:
+            self._ensure(name)
+            return self.stats[name].used_today(_quota_day())
+
+    def order(self, preferred: List[str]) -> List[str]:
+        """
+        Providers to try, best first; open circuits are left out
+
+        Args:
+            preferred: Configured preference order (used for ties and unknowns)
+
+        Returns:
+            Provider names in the order they should be tried
+        """
+        now = time.time()
+        with self._lock:
+            candidates = []
+            for rank, name in enumerate(preferred):
+                self._ensure(name)
+                breaker = self.breakers[name]
+                if breaker.state == OPEN and now - breaker.opened_at < breaker.open_seconds:
+                    continue
+                stats = self.stats[name]
+                if stats.latency is None:
+                    # Untried: no cost estimate, so the preference order decides
+                    tier, cost = 1, 0.0
+                else:
+                    healthy = breaker.state == CLOSED and stats.success_rate >= HEALTHY_SUCCESS_RATE
+                    tier = 0 if healthy else 2
+                    cost = stats.latency / max(stats.success_rate, 0.05)
+                candidates.append((tier, cost, rank, name))
+        return [name for *_, name in sorted(candidates)]
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable provider health file {self.path}: {e}")
+            return
+        for name, entry in data.items():
+            self._ensure(name)
+            self.breakers[name].load(entry.get('breaker', {}))
+            self.stats[name].load(entry.get('stats', {}))
+
+    def save(self, force: bool = False):
+        """Persist state (throttled unless forced)"""
+        if self.path is None:
+            return
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_save < self.save_interval:
+                return
+            self._last_save = now
+            data = {
+                name: {'breaker': self.breakers[name].to_dict(), 'stats': self.stats[name].to_dict()}
+                for name in self.breakers
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save provider health: {e}")
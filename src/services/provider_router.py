@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Provider Router
+Tries news providers in adaptive order, skipping any whose circuit is open
+"""
+
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..fetchers.retry_policy import AttemptCounter
+from .news_service import NewsService
+from .provider_health import ProviderHealth
+from .trends import TrendDetector, trend_detector_from_config
+
+
+logger = logging.getLogger(__name__)
+
+# Config key holding each provider's API key
+PROVIDER_KEYS = {
+    'newsapi': 'NEWS_API_KEY',
+    'newsdata': 'NEWSDATA_API_KEY',
+}
+
+# Free-tier daily request limits (override with <PROVIDER>_DAILY_QUOTA)
+DEFAULT_DAILY_QUOTAS = {
+    'newsapi': 100,
+    'newsdata': 200,
+}
+
+# API requests one fetch_news call is expected to make (NewsAPI: 3 queries,
+# NewsData: 5 hot categories + general) until a call has been counted;
+# retries and pagination make the real number vary
+REQUESTS_PER_FETCH = {
+    'newsapi': 3,
+    'newsdata': 6,
+}
+
+# Share of each daily quota hedged requests may never dip into
+HEDGE_QUOTA_RESERVE = 0.5
+
+
+def single_provider_services(config: dict, names: Optional[List[str]] = None) -> Dict[str, NewsService]:
+    """
+    One NewsService per configured provider
+
+    Each service gets only its own API key, so NewsService's built-in
+    fallback never runs and the router decides the order instead.
+
+    Args:
+        config: Configuration dictionary
+        names: Providers to build (default: all in PROVIDER_KEYS)
+    """
+    services = {}
+    for name, key in PROVIDER_KEYS.items():
+        if names is not None and name not in names:
+            continue
+        api_key = config.get(key)
+        if not api_key or api_key.startswith('your_'):
+            continue
+        provider_config = dict(config)
+        provider_config['API_PREFERENCE'] = name
+        for other_key in PROVIDER_KEYS.values():
+            if other_key != key:
+                provider_config[other_key] = ''
+        try:
+            services[name] = NewsService(provider_config)
+        except Exception as e:
+            logger.error(f"Failed to initialize {name} provider: {e}")
+    return services
+
+
+def _number(config: dict, key: str, default: float) -> float:
+    value = config.get(key)
+    return float(value) if value not in (None, '') else default
+
+
+def provider_health_from_config(config: dict) -> ProviderHealth:
+    """Provider health state with the configured breaker settings"""
+    return ProviderHealth(
+        config.get('PROVIDER_HEALTH_FILE', str(Path('state') / 'provider_health.json')),
+        breaker_options={
+            'failure_rate': _number(config, 'CIRCUIT_FAILURE_RATE', 0.5),
+            'slow_call_seconds': _number(config, 'CIRCUIT_SLOW_CALL_SECONDS', 20),
+            'open_seconds': _number(config, 'CIRCUIT_OPEN_MINUTES', 5) * 60,
+        }
+    )
+
+
+class ProviderRouter:
+    """
+    Drop-in replacement for NewsService.fetch_news with circuit breaking
+
+    Providers whose breaker is open are skipped without a request. The
+    rest are ordered by recent latency and success rate. An empty result
+    counts as a failure.
+    """
+
+    def __init__(self, providers: Dict[str, Callable[..., Tuple[List[Dict], str]]],
+                 preference: List[str], health: ProviderHealth,
+                 hedge: bool = False, quotas: Optional[Dict[str, int]] = None,
+                 trends: Optional[TrendDetector] = None):
+        """
+        Args:
+            providers: Provider name -> fetch_news(max_articles=...) callable
+            preference: Configured order, used until there is history
+            health: Shared breaker/latency state
+            hedge: Race a second provider when the first is slower than usual
+            quotas: Daily request quota per provider
+            trends: Re-ranks results by trending terms (None = provider order)
+        """
+        self.providers = providers
+        self.preference = [name for name in preference if name in providers]
+        self.preference += [name for name in providers if name not in self.preference]
+        self.health = health
+        self.hedge = hedge
+        self.quotas = dict(DEFAULT_DAILY_QUOTAS, **(quotas or {}))
+        self.trends = trends
+        # HTTP attempts the last call to each provider made
+        self._last_requests: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: dict, health: Optional[ProviderHealth] = None) -> 'ProviderRouter':
+        """
+        Build a router over every provider configured in `config`
+
+        Args:
+            config: Configuration dictionary
+            health: Existing health state to keep (e.g. across config reloads)
+        """
+        services = single_provider_services(config)
+        preferred = (config.get('API_PREFERENCE') or 'newsapi').lower()
+        preference = [preferred] + [name for name in PROVIDER_KEYS if name != preferred]
+
+        health = health or provider_health_from_config(config)
+        quotas = {
+            name: int(_number(config, f"{name.upper()}_DAILY_QUOTA", DEFAULT_DAILY_QUOTAS[name]))
+            for name in PROVIDER_KEYS
+        }
+        return cls(
+            {name: service.fetch_news for name, service in services.items()},
+            preference, health,
+            hedge=(config.get('HEDGE_REQUESTS') or 'false').lower() == 'true',
+            quotas=quotas,
+            trends=trend_detector_from_config(config)
+        )
+
+    def _call(self, name: str, max_articles: int) -> Optional[Tuple[List[Dict], str]]:
+        """Call one provider and record the outcome; None on failure"""
+        started = time.monotonic()
+        try:
+            # Every HTTP attempt, retries included, counts against the quota
+            with AttemptCounter() as attempts:
+                articles, api_source = self.providers[name](max_articles=max_articles)
+        except Exception as e:
+            self.health.record(name, False, time.monotonic() - started)
+            logger.warning(f"Provider {name} failed: {e}")
+            return None
+        finally:
+            self.health.count_requests(name, attempts.count)
+            self._last_requests[name] = attempts.count
+
+        latency = time.monotonic() - started
+        self.health.record(name, bool(articles), latency)
+        if not articles:
+            logger.warning(f"Provider {name} returned no articles ({latency:.1f}s)")
+            return None
+        logger.info(f"Provider {name} returned {len(articles)} articles in {latency:.1f}s")
+        return articles, api_source
+
+    def fetch_news(self, max_articles: int = 25) -> Tuple[List[Dict], str]:
+        """
+        Fetch news from the healthiest available provider
+
+        Args:
+            max_articles: Maximum number of articles
+
+        Returns:
+            Tuple of (articles, api_source); ([], 'none') if every provider failed
+        """
+        articles, api_source = self._fetch_first(max_articles)
+        if self.trends is not None and articles:
+            articles = self.trends.rank(articles)
+        return articles, api_source
+
+    def _fetch_first(self, max_articles: int) -> Tuple[List[Dict], str]:
+        """Articles from the first provider that delivers"""
+        order = self.health.order(self.preference)
+        skipped = [name for name in self.preference if name not in order]
+        if skipped:
+            logger.info(f"Skipping provider(s) with open circuit: {', '.join(skipped)}")
+
+        if self.hedge and len(order) >= 2:
+            result = self._fetch_hedged(order[0], order[1], max_articles)
+            if result is not None:
+                return result
+            # Both were tried (the secondary as a failover at least)
+            remaining = order[2:]
+        else:
+            remaining = order
+
+        for name in remaining:
+            if not self.health.allow(name):
+                continue
+            result = self._call(name, max_articles)
+            if result is not None:
+                return result
+
+        if not order and self.preference:
+            # Every circuit is open: one attempt beats sending nothing at all
+            name = self.preference[0]
+            logger.warning(f"All provider circuits open, trying {name} anyway")
+            result = self._call(name, max_articles)
+            if result is not None:
+                return result
+
+        return [], 'none'
+
+    def _hedge_affordable(self, name: str) -> bool:
+        """Whether a hedged call keeps the provider above its quota reserve"""
+        quota = self.quotas.get(name)
+        if not quota:
+            return True
+        expected = self._last_requests.get(name, REQUESTS_PER_FETCH.get(name, 1))
+        remaining = quota - self.health.requests_today(name) - expected
+        return remaining >= quota * HEDGE_QUOTA_RESERVE
+
+    def _fetch_hedged(self, primary: str, secondary: str,
+                      max_articles: int) -> Optional[Tuple[List[Dict], str]]:
+        """
+        Race the secondary provider against a slow primary
+
+        The primary gets its observed p90 latency to answer. After that the
+        secondary is started too (if its quota allows) and the first usable
+        result wins. A running HTTP request cannot be aborted, so the loser
+        finishes in the background; its result is discarded but its outcome
+        still feeds the provider's health. If the primary fails, the
+        secondary is tried as an ordinary failover, quota reserve or not.
+
+        Returns:
+            Winning (articles, api_source), or None if both failed
+        """
+        results: queue.Queue = queue.Queue()
+        started = set()
+
+        def run(name):
+            results.put((name, self._call(name, max_articles)))
+
+        def start(name):
+            started.add(name)
+            threading.Thread(target=run, args=(name,), name=f"fetch-{name}", daemon=True).start()
+
+        pending = 0
+        if self.health.allow(primary):
+            start(primary)
+            pending = 1
+            hedge_after = self.health.latency_percentile(primary, 0.9)
+            try:
+                # Without latency history there is no basis for hedging yet
+                name, result = results.get(timeout=hedge_after)
+                pending = 0
+                if result is not None:
+                    return result
+            except queue.Empty:
+                # Only a real hedge (the primary still running) must respect the quota reserve
+                if not self._hedge_affordable(secondary):
+                    logger.info(f"{primary} is slow but {secondary} quota is reserved, not hedging")
+                elif not self.health.allow(secondary):
+                    logger.info(f"{primary} is slow but {secondary} circuit is "
+                                f"{self.health.state(secondary)}, not hedging")
+                else:
+                    logger.info(f"{primary} slower than its p90 ({hedge_after:.1f}s), hedging with {secondary}")
+                    start(secondary)
+                    pending += 1
+
+        while True:
+            if not pending:
+                # The primary failed (or was skipped): plain failover to the secondary
+                if secondary in started or not self.health.allow(secondary):
+                    return None
+                start(secondary)
+                pending = 1
+            name, result = results.get()
+            pending -= 1
+            if result is not None:
+                if pending:
+                    logger.info(f"Hedged fetch won by {name}")
+                return result
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Recipient Profiles
+Per-recipient preferences evaluated over one shared article fetch
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Weight of a category match vs. a keyword hit; the article's position in the
+# shared (already hotness-sorted) list only breaks ties between equal matches
+CATEGORY_WEIGHT = 2.0
+KEYWORD_WEIGHT = 3.0
+
+DEFAULT_MAX_ARTICLES = 25
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for keyword matching"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _split_list(value) -> List[str]:
+    """Accept either a JSON list or a comma-separated string"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+class RecipientProfile:
+    """Preferences for a single recipient"""
+
+    def __init__(self, email: str, categories: Optional[List[str]] = None,
+                 keywords: Optional[List[str]] = None,
+                 max_articles: int = DEFAULT_MAX_ARTICLES,
+                 slots: Optional[List[str]] = None):
+        """
+        Initialize recipient profile
+
+        Args:
+            email: Recipient email address
+            categories: Article categories to include (empty = any); articles
+                without categories match when they mention one by name
+            keywords: Keywords or phrases to look for (empty = any)
+            max_articles: Maximum articles in this recipient's digest
+            slots: Schedule slots (HH:MM) this recipient gets (empty = all)
+        """
+        self.email = email
+        self.categories = frozenset(c.lower() for c in categories or [])
+        # Each keyword becomes a tuple of tokens so phrases match as a whole
+        self.keywords = frozenset(
+            tuple(tokens) for tokens in (tokenize(k) for k in keywords or []) if tokens
+        )
+        self.max_articles = max(1, int(max_articles))
+        self.slots = frozenset(slots or [])
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RecipientProfile':
+        """Build a profile from one entry of the profiles file"""
+        return cls(
+            email=data['email'].strip(),
+            categories=_split_list(data.get('categories')),
+            keywords=_split_list(data.get('keywords')),
+            max_articles=data.get('max_articles', DEFAULT_MAX_ARTICLES),
+            slots=_split_list(data.get('slots')),
+        )
+
+    @property
+    def signature(self) -> Tuple:
+        """Recipients with equal signatures always get the same digest"""
+        return (self.categories, self.keywords, self.max_articles)
+
+    def wants_slot(self, slot: Optional[str]) -> bool:
+        """Check whether this recipient is due at the given schedule slot"""
+        return slot is None or not self.slots or slot in self.slots
+
+
+def load_profiles(config: dict) -> List[RecipientProfile]:
+    """
+    Load recipient profiles
+
+    Profiles come from the JSON file named by RECIPIENT_PROFILES. Any address
+    in RECIPIENT_EMAILS without a profile gets the default (unfiltered) one.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        List of recipient profiles
+    """
+    profiles: List[RecipientProfile] = []
+    profiles_path = config.get('RECIPIENT_PROFILES')
+
+    if profiles_path:
+        try:
+            with open(Path(profiles_path), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            for entry in entries:
+                try:
+                    profiles.append(RecipientProfile.from_dict(entry))
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    logger.error(f"Skipping invalid recipient profile {entry!r}: {e}")
+        except FileNotFoundError:
+            logger.warning(f"Recipient profiles file not found: {profiles_path}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load recipient profiles: {e}")
+
+    known = {profile.email for profile in profiles}
+    default_max = int(config.get('MAX_ARTICLES', DEFAULT_MAX_ARTICLES))
+    for email in _split_list(config.get('RECIPIENT_EMAILS', '')):
+        if email not in known:
+            profiles.append(RecipientProfile(email, max_articles=default_max))
+            known.add(email)
+
+    return profiles
+
+
+class ArticleIndex:
+    """
+    In-memory index over one shared fetch
+
+    Built once per slot; each profile is then ranked by walking only the
+    postings for its categories and keywords, so the cost per profile is
+    proportional to the matches rather than to the number of articles.
+    """
+
+    def __init__(self, articles: List[Dict]):
+        """
+        Build the index
+
+        Args:
+            articles: Normalized articles, best first
+        """
+        self.articles = articles
+        count = len(articles) or 1
+        # Earlier articles rank higher; stays below any single match weight
+        self._base = [1.0 - i / count for i in range(len(articles))]
+        self._by_category: Dict[str, List[int]] = {}
+        self._by_token: Dict[str, set] = {}
+        self._tokens: List[Tuple[str, ...]] = []
+        # Articles the provider did not categorize (NewsAPI, RSS)
+        self._uncategorized: set = set()
+        # Profiles share far fewer category sets, phrases and tastes than
+        # they are many, so partial scores, postings and rankings are
+        # memoized per index
+        self._category_scores: Dict[frozenset, Tuple[List[float], set]] = {}
+        self._phrase_cache: Dict[Tuple[str, ...], set] = {}
+        self._ranking_cache: Dict[Tuple, List[int]] = {}
+
+        for i, article in enumerate(articles):
+            categories = article.get('category') or []
+            if isinstance(categories, str):
+                categories = [categories]
+            if not categories:
+                self._uncategorized.add(i)
+            for category in {str(c).lower() for c in categories}:
+                self._by_category.setdefault(category, []).append(i)
+
+            tokens = tuple(tokenize(
+                f"{article.get('title') or ''} {article.get('description') or ''}"
+            ))
+            self._tokens.append(tokens)
+            for token in set(tokens):
+                self._by_token.setdefault(token, set()).add(i)
+
+    def _phrase_postings(self, phrase: Tuple[str, ...]) -> set:
+        """Articles containing every token of a phrase, in order"""
+        if len(phrase) == 1:
+            return self._by_token.get(phrase[0], set())
+
+        cached = self._phrase_cache.get(phrase)
+        if cached is not None:
+            return cached
+
+        postings = self._by_token.get(phrase[0], set())
+        for token in phrase[1:]:
+            postings = postings & self._by_token.get(token, set())
+            if not postings:
+                break
+        width = len(phrase)
+        postings = {
+            i for i in postings
+            if any(self._tokens[i][j:j + width] == phrase
+                   for j in range(len(self._tokens[i]) - width + 1))
+        }
+        self._phrase_cache[phrase] = postings
+        return postings
+
+    def _category_postings(self, category: str) -> List[int]:
+        """
+        Articles in a category
+
+        Articles without categories would never match a category-only
+        profile, so they match when their title or description names it.
+        """
+        postings = self._by_category.get(category, [])
+        name = tuple(tokenize(category))
+        if self._uncategorized and name:
+            postings = postings + sorted(self._uncategorized & self._phrase_postings(name))
+        return postings
+
+    def _scores_for_categories(self, categories: frozenset) -> Tuple[List[float], set]:
+        """
+        Base + category score of every article, and the articles matched
+
+        Shared between profiles; do not mutate.
+        """
+        cached = self._category_scores.get(categories)
+        if cached is None:
+            scores, matched = list(self._base), set()
+            for category in categories:
+                postings = self._category_postings(category)
+                matched.update(postings)
+                for i in postings:
+                    scores[i] += CATEGORY_WEIGHT
+            cached = self._category_scores[categories] = (scores, matched)
+        return cached
+
+    def _ranking(self, categories: frozenset, keywords: frozenset) -> List[int]:
+        """Positions of the articles matching a taste, best first"""
+        key = (categories, keywords)
+        cached = self._ranking_cache.get(key)
+        if cached is not None:
+            return cached
+
+        scores, matched = self._scores_for_categories(categories)
+        if keywords:
+            scores, matched = list(scores), set(matched)
+            for phrase in keywords:
+                postings = self._phrase_postings(phrase)
+                matched |= postings
+                for i in postings:
+                    scores[i] += KEYWORD_WEIGHT
+        cached = self._ranking_cache[key] = sorted(matched, key=scores.__getitem__, reverse=True)
+        return cached
+
+    def select_ids(self, profile: RecipientProfile) -> List[int]:
+        """Article positions selected for a profile, best first"""
+        if not profile.categories and not profile.keywords:
+            return list(range(min(profile.max_articles, len(self.articles))))
+        return self._ranking(profile.categories, profile.keywords)[:profile.max_articles]
+
+    def select(self, profile: RecipientProfile) -> List[Dict]:
+        """Articles selected for a profile, best first"""
+        return [self.articles[i] for i in self.select_ids(profile)]
+
+    def group_recipients(self, profiles: List[RecipientProfile],
+                         slot: Optional[str] = None) -> List[Tuple[List[Dict], List[str]]]:
+        """
+        Group recipients that receive an identical digest
+
+        Args:
+            profiles: Recipient profiles
+            slot: Current schedule slot (None = every profile)
+
+        Returns:
+            List of (articles, recipient emails) pairs; recipients whose
+            preferences match nothing are left out
+        """
+        groups: Dict[Tuple[int, ...], List[str]] = {}
+        for profile in profiles:
+            if not profile.wants_slot(slot):
+                continue
+            ids = tuple(self.select_ids(profile))
+            if ids:
+                groups.setdefault(ids, []).append(profile.email)
+            else:
+                logger.info(f"No matching articles for {profile.email}, skipping")
+
+        return [([self.articles[i] for i in ids], emails) for ids, emails in groups.items()]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Scheduler Core
+Sleeps until the next scheduled slot instead of polling every minute
+"""
+
+import logging
+import threading
+from datetime import date, datetime, time as datetime_time, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = KeyError
+
+
+logger = logging.getLogger(__name__)
+
+# Longest single sleep. Waits run on the monotonic clock, so re-checking the
+# wall clock this often bounds how late a slot fires after a clock jump.
+MAX_SLEEP_SECONDS = 300
+
+# A run that starts more than this late (suspend, clock jump, busy loop) is
+# "missed" and handled by the misfire policy
+MISFIRE_GRACE_SECONDS = 300
+
+# What to do with missed runs:
+#   skip      - drop them and wait for the next occurrence
+#   coalesce  - run once for however many occurrences were missed
+#   catch-up  - run every missed occurrence
+MISFIRE_POLICIES = ('skip', 'coalesce', 'catch-up')
+
+
+def _get_zone(name: str):
+    """Resolve an IANA timezone name"""
+    if ZoneInfo is None:
+        raise ValueError(f"Timezone '{name}' needs Python 3.9+ (zoneinfo)")
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone '{name}'") from e
+
+
+class ScheduleSlot:
+    """A daily wall-clock time, optionally in a fixed timezone"""
+
+    def __init__(self, at: datetime_time, tz=None, label: Optional[str] = None,
+                 phase: str = 'send', offset: timedelta = timedelta(0)):
+        """
+        Initialize schedule slot
+
+        Args:
+            at: Wall-clock time of day
+            tz: tzinfo for the slot (None = system local time)
+            label: Slot name used in logs and recipient profiles (HH:MM)
+            phase: Which stage of the slot's job this entry triggers
+            offset: Fire this long before (negative) or after the slot time
+        """
+        self.at = at
+        self.tz = tz
+        self.label = label or at.strftime('%H:%M')
+        self.phase = phase
+        self.offset = offset
+
+    def with_phase(self, phase: str, offset: timedelta) -> 'ScheduleSlot':
+        """Same slot, firing a different phase at an offset from the slot time"""
+        return ScheduleSlot(self.at, self.tz, self.label, phase, offset)
+
+    def _localize(self, day: date) -> datetime:
+        """This slot on a given day, as an aware datetime"""
+        naive = datetime.combine(day, self.at)
+        if self.tz is None:
+            # astimezone() on a naive datetime applies the system's DST rules
+            return naive.astimezone()
+        # fold=0: ambiguous times (DST end) fire on their first occurrence,
+        # non-existent ones (DST start) shift forward by the gap
+        return naive.replace(tzinfo=self.tz)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Next occurrence strictly after a moment
+
+        Args:
+            moment: Aware datetime
+
+        Returns:
+            Aware UTC datetime of the next occurrence
+        """
+        local_day = moment.astimezone(self.tz).date() if self.tz else moment.astimezone().date()
+        # Yesterday covers slots whose UTC instant falls "today" across an offset change
+        for day_offset in range(-1, 3):
+            due = self._localize(local_day + timedelta(days=day_offset)).astimezone(timezone.utc)
+            due += self.offset
+            if due > moment:
+                return due
+        raise RuntimeError(f"Could not compute next run for slot {self.label}")
+
+    def __repr__(self) -> str:
+        zone = getattr(self.tz, 'key', None) or 'local'
+        return f"ScheduleSlot({self.label} {zone} {self.phase})"
+
+
+def parse_schedule_times(schedule_times: str, default_timezone: Optional[str] = None) -> List[ScheduleSlot]:
+    """
+    Parse SCHEDULE_TIMES
+
+    Entries are HH:MM, optionally followed by an IANA timezone, e.g.
+    "06:00,14:00@Europe/London,22:00 Asia/Kolkata". Entries without a zone use
+    SCHEDULE_TIMEZONE, or system local time when that is not set.
+
+    Args:
+        schedule_times: Comma-separated schedule entries
+        default_timezone: Timezone for entries without one
+
+    Returns:
+        List of schedule slots
+
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    default_tz = _get_zone(default_timezone) if default_timezone else None
+    slots = []
+
+    for entry in schedule_times.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        time_part, _, zone_part = entry.replace('@', ' ').partition(' ')
+        try:
+            at = datetime.strptime(time_part, '%H:%M').time()
+        except ValueError as e:
+            raise ValueError(f"Invalid schedule time '{entry}' (expected HH:MM)") from e
+        tz = _get_zone(zone_part.strip()) if zone_part.strip() else default_tz
+        slots.append(ScheduleSlot(at, tz, label=time_part))
+
+    return slots
+
+
+class SlotScheduler:
+    """
+    Event-driven daily scheduler
+
+    Computes the next due slot and waits exactly until then. The wait is
+    interruptible: `stop()` ends the loop, `reload()` swaps the slot table
+    and recomputes the next due time immediately.
+    """
+
+    def __init__(self, slots: List[ScheduleSlot], callback: Callable[[ScheduleSlot, datetime], None],
+                 max_sleep: float = MAX_SLEEP_SECONDS, clock: Callable[[], datetime] = None,
+                 misfire_policy: str = 'coalesce', misfire_grace: float = MISFIRE_GRACE_SECONDS):
+        """
+        Initialize scheduler
+
+        Args:
+            slots: Daily slots to fire
+            callback: Called with (slot, due time) when a slot is due; should
+                hand long work off (see JobExecutor) so later slots stay on time
+            max_sleep: Longest uninterrupted sleep in seconds
+            clock: Returns the current aware datetime (for tests)
+            misfire_policy: One of MISFIRE_POLICIES
+            misfire_grace: Seconds late before a run counts as missed
+        """
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Invalid misfire policy '{misfire_policy}' "
+                             f"(expected one of {', '.join(MISFIRE_POLICIES)})")
+        self.callback = callback
+        self.max_sleep = max_sleep
+        self.misfire_policy = misfire_policy
+        self.misfire_grace = misfire_grace
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._slots: List[ScheduleSlot] = []
+        self._next: List[Tuple[datetime, ScheduleSlot]] = []
+        self.reload(slots)
+
+    def reload(self, slots: List[ScheduleSlot]):
+        """Replace the slot table; takes effect without waiting for the current sleep"""
+        if not slots:
+            raise ValueError("No valid schedule times configured")
+        now = self.clock()
+        with self._lock:
+            self._slots = list(slots)
+            self._next = sorted(
+                ((slot.next_after(now), slot) for slot in self._slots),
+                key=lambda item: item[0]
+            )
+        self._wakeup.set()
+
+    def upcoming(self) -> List[Tuple[datetime, ScheduleSlot]]:
+        """Next due time of every slot, soonest first"""
+        with self._lock:
+            return list(self._next)
+
+    def stop(self):
+        """Stop the loop; safe to call from a signal handler"""
+        self._stop_event.set()
+        self._wakeup.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _apply_misfire_policy(self, slot: ScheduleSlot, occurrences: List[datetime],
+                              now: datetime) -> List[datetime]:
+        """Pick which of a slot's due occurrences actually run"""
+        missed = [when for when in occurrences
+                  if (now - when).total_seconds() > self.misfire_grace]
+        if not missed:
+            return occurrences
+
+        if self.misfire_policy == 'catch-up':
+            logger.warning(f"Catching up {len(missed)} missed run(s) of {slot.label} {slot.phase}")
+            return occurrences
+        if self.misfire_policy == 'coalesce':
+            logger.warning(f"Coalescing {len(missed)} missed run(s) of {slot.label} {slot.phase} into one")
+            return occurrences[-1:]
+
+        logger.warning(f"Skipping {len(missed)} missed run(s) of {slot.label} {slot.phase}")
+        return [when for when in occurrences if when not in missed]
+
+    def _pop_due(self, now: datetime) -> List[Tuple[datetime, ScheduleSlot]]:
+        """Remove and return every slot occurrence that should run now, rescheduling each"""
+        due = []
+        with self._lock:
+            while self._next and self._next[0][0] <= now:
+                when, slot = self._next.pop(0)
+                # Walk forward from the one that fired, so a backwards clock
+                # jump can never fire the same occurrence twice
+                occurrences = [when]
+                following = slot.next_after(when)
+                while following <= now:
+                    occurrences.append(following)
+                    following = slot.next_after(following)
+                self._next.append((following, slot))
+                due.extend((when, slot) for when in self._apply_misfire_policy(slot, occurrences, now))
+            self._next.sort(key=lambda item: item[0])
+        due.sort(key=lambda item: item[0])
+        return due
+
+    def run(self):
+        """Run until stop() is called"""
+        while not self._stop_event.is_set():
+            # Cleared before reading the table so a concurrent reload() is never lost
+            self._wakeup.clear()
+            now = self.clock()
+            for when, slot in self._pop_due(now):
+                if self._stop_event.is_set():
+                    return
+                try:
+                    self.callback(slot, when)
+                except Exception as e:
+                    logger.error(f"Scheduled job for {slot.label} failed: {e}")
+
+            upcoming = self.upcoming()
+            if not upcoming:
+                return
+            remaining = (upcoming[0][0] - self.clock()).total_seconds()
+            if remaining > 0:
+                self._wakeup.wait(min(remaining, self.max_sleep))
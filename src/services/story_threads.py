@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Story Threads
+Online clustering of articles into developing stories, persisted across runs
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ..fetchers.summarizer import STOPWORDS
+from ..fetchers.urls import canonical_url
+from .recipient_profiles import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path('state') / 'story_threads.json'
+
+# Hashed feature space (2^18 buckets: collisions are rare at news vocabulary sizes)
+FEATURE_BITS = 18
+_FEATURE_MASK = (1 << FEATURE_BITS) - 1
+
+# Cosine similarity to a thread's centroid needed to join it
+DEFAULT_SIMILARITY = 0.25
+
+# Threads (and the articles remembered in them) without news for this long are closed
+DEFAULT_THREAD_TTL_HOURS = 48
+
+# Heaviest features kept per centroid; bounds memory and the inverted index
+CENTROID_TERMS = 64
+
+# Document frequencies halve over this period, so yesterday's big story
+# does not make its own words look common forever
+DF_HALF_LIFE_HOURS = 72
+
+TITLE_WEIGHT = 2
+
+
+def _bucket(feature: str) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(feature.encode('utf-8')) & _FEATURE_MASK
+
+
+def _terms(text: str) -> List[str]:
+    """Content words, with plurals folded ('results' -> 'result')"""
+    terms = []
+    for token in tokenize(text):
+        if len(token) <= 2 or token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def article_features(article: Dict) -> Counter:
+    """Hashed term counts: title words (double weight) and bigrams, description words"""
+    title = _terms(article.get('title') or '')
+    description = _terms(article.get('description') or '')
+    features = Counter()
+    for token in title:
+        features[_bucket(token)] += TITLE_WEIGHT
+    for first, second in zip(title, title[1:]):
+        features[_bucket(f"{first} {second}")] += 1
+    for token in description:
+        features[_bucket(token)] += 1
+    return features
+
+
+def article_key(article: Dict) -> str:
+    """Identity of an article across runs and providers"""
+    url = article.get('url') or article.get('link') or ''
+    return canonical_url(url) or (article.get('title') or '').casefold()
+
+
+class StoryThread:
+    """A developing story: the running mean of its articles' vectors"""
+
+    __slots__ = ('id', 'centroid', 'count', 'first_seen', 'last_seen', 'headline')
+
+    def __init__(self, thread_id: str, centroid: Dict[int, float], count: int,
+                 first_seen: float, last_seen: float, headline: str):
+        self.id = thread_id
+        self.centroid = centroid
+        self.count = count
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.headline = headline
+
+    def absorb(self, vector: Dict[int, float], headline: str, now: float):
+        """Move the centroid towards a new article (incremental mean, top terms kept)"""
+        merged = {bucket: weight * self.count for bucket, weight in self.centroid.items()}
+        for bucket, weight in vector.items():
+            merged[bucket] = merged.get(bucket, 0.0) + weight
+        self.count += 1
+        top = sorted(merged.items(), key=lambda item: item[1], reverse=True)[:CENTROID_TERMS]
+        norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+        self.centroid = {bucket: weight / norm for bucket, weight in top}
+        self.last_seen = now
+        self.headline = headline
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id, 'count': self.count, 'first_seen': self.first_seen,
+            'last_seen': self.last_seen, 'headline': self.headline,
+            'centroid': {str(bucket): round(weight, 5) for bucket, weight in self.centroid.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StoryThread':
+        centroid = {int(bucket): weight for bucket, weight in data['centroid'].items()}
+        return cls(data['id'], centroid, data['count'], data['first_seen'],
+                   data['last_seen'], data.get('headline', ''))
+
+
+class StoryThreads:
+    """
+    Assigns each new article to the most similar open story thread, or
+    starts a new one. Candidate threads are found through an inverted
+    index over centroid features, so the cost per article depends on its
+    terms, not on how many threads exist. Nothing is ever reclustered.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH, similarity: float = DEFAULT_SIMILARITY,
+                 ttl_hours: float = DEFAULT_THREAD_TTL_HOURS):
+        """
+        Args:
+            path: JSON state file (None = memory only)
+            similarity: Cosine similarity needed to join a thread
+            ttl_hours: Threads idle for longer are closed
+        """
+        self.path = Path(path) if path else None
+        self.similarity = similarity
+        self.ttl = ttl_hours * 3600
+        self.threads: Dict[str, StoryThread] = {}
+        self._index: Dict[int, Set[str]] = {}
+        # article key -> (thread id, time seen): re-fetched articles are not new updates
+        self._seen: Dict[str, List] = {}
+        self._df: Dict[int, float] = {}
+        self._documents = 0.0
+        self._decayed_at = time.time()
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable story state {self.path}: {e}")
+            return
+        for entry in data.get('threads', []):
+            self._add_thread(StoryThread.from_dict(entry))
+        self._seen = data.get('seen', {})
+        self._df = {int(bucket): count for bucket, count in data.get('df', {}).items()}
+        self._documents = data.get('documents', 0.0)
+        self._decayed_at = data.get('decayed_at', self._decayed_at)
+        self._next_id = data.get('next_id', len(self.threads) + 1)
+
+    def _add_thread(self, thread: StoryThread):
+        self.threads[thread.id] = thread
+        for bucket in thread.centroid:
+            self._index.setdefault(bucket, set()).add(thread.id)
+
+    def _reindex(self, thread: StoryThread, old_buckets):
+        for bucket in old_buckets - thread.centroid.keys():
+            ids = self._index.get(bucket)
+            if ids is not None:
+                ids.discard(thread.id)
+                if not ids:
+                    del self._index[bucket]
+        for bucket in thread.centroid.keys() - old_buckets:
+            self._index.setdefault(bucket, set()).add(thread.id)
+
+    def _decay(self, now: float):
+        """Age document frequencies; near-zero entries are dropped"""
+        factor = 0.5 ** ((now - self._decayed_at) / (DF_HALF_LIFE_HOURS * 3600))
+        if factor > 0.99:
+            return
+        self._df = {bucket: count * factor for bucket, count in self._df.items() if count * factor >= 0.5}
+        self._documents *= factor
+        self._decayed_at = now
+
+    def _vector(self, features: Counter) -> Dict[int, float]:
+        """Sublinear TF-IDF, L2-normalized"""
+        vector = {}
+        for bucket, count in features.items():
+            idf = math.log((1 + self._documents) / (1 + self._df.get(bucket, 0.0))) + 1
+            vector[bucket] = (1 + math.log(count)) * idf
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {bucket: weight / norm for bucket, weight in vector.items()}
+
+    def _best_thread(self, vector: Dict[int, float], now: float) -> Optional[StoryThread]:
+        scores: Dict[str, float] = {}
+        for bucket, weight in vector.items():
+            for thread_id in self._index.get(bucket, ()):
+                scores[thread_id] = scores.get(thread_id, 0.0) + weight * self.threads[thread_id].centroid[bucket]
+        best, best_score = None, self.similarity
+        for thread_id, score in scores.items():
+            thread = self.threads[thread_id]
+            if score >= best_score and now - thread.last_seen <= self.ttl:
+                best, best_score = thread, score
+        return best
+
+    def assign(self, article: Dict, now: Optional[float] = None) -> StoryThread:
+        """
+        The story thread of an article, creating or updating threads as needed
+
+        An article already assigned in an earlier run returns its thread
+        unchanged.
+        """
+        now = now if now is not None else time.time()
+        key = article_key(article)
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and seen[0] in self.threads:
+                return self.threads[seen[0]]
+
+            features = article_features(article)
+            for bucket in features:
+                self._df[bucket] = self._df.get(bucket, 0.0) + 1
+            self._documents += 1
+            vector = self._vector(features)
+
+            thread = self._best_thread(vector, now) if vector else None
+            headline = article.get('title') or ''
+            if thread is None:
+                thread = StoryThread(f"s{self._next_id}", {}, 0, now, now, headline)
+                self._next_id += 1
+                self.threads[thread.id] = thread
+            old_buckets = set(thread.centroid)
+            thread.absorb(vector, headline, now)
+            self._reindex(thread, old_buckets)
+            self._seen[key] = [thread.id, now]
+            return thread
+
+    def collapse(self, articles: List[Dict]) -> List[Dict]:
+        """
+        One article per story, in the order of each story's best article
+
+        The articles kept are copies carrying 'story_id', 'story_updates'
+        (how many more articles the story has had, this run or earlier) and
+        'story_related' (the other articles of this batch on the story).
+        """
+        now = time.time()
+        with self._lock:
+            self._decay(now)
+        leaders: Dict[str, Dict] = {}
+        order = []
+        for article in articles:
+            thread = self.assign(article, now)
+            leader = leaders.get(thread.id)
+            if leader is None:
+                leader = dict(article)
+                leader['story_id'] = thread.id
+                leader['story_related'] = []
+                leaders[thread.id] = leader
+                order.append(leader)
+            else:
+                leader['story_related'].append({
+                    'title': article.get('title'), 'url': article.get('url') or article.get('link'),
+                })
+        for leader in order:
+            leader['story_updates'] = self.threads[leader['story_id']].count - 1
+        self.save(now)
+        if len(order) < len(articles):
+            logger.info(f"Grouped {len(articles)} articles into {len(order)} stories")
+        return order
+
+    def save(self, now: Optional[float] = None):
+        """Close idle threads and write the state atomically"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            for thread_id in [t.id for t in self.threads.values() if now - t.last_seen > self.ttl]:
+                thread = self.threads.pop(thread_id)
+                for bucket in thread.centroid:
+                    ids = self._index.get(bucket)
+                    if ids is not None:
+                        ids.discard(thread_id)
+                        if not ids:
+                            del self._index[bucket]
+            self._seen = {key: value for key, value in self._seen.items()
+                          if value[0] in self.threads and now - value[1] <= self.ttl}
+            if self.path is None:
+                return
+            data = json.dumps({
+                'threads': [thread.to_dict() for thread in self.threads.values()],
+                'seen': self._seen,
+                'df': {str(bucket): round(count, 3) for bucket, count in self._df.items()},
+                'documents': self._documents,
+                'decayed_at': self._decayed_at,
+                'next_id': self._next_id,
+            })
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save story threads: {e}")
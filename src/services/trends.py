@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Trend Detector
+Flags terms whose frequency in the article stream bursts above their baseline
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..fetchers.summarizer import STOPWORDS
+from ..fetchers.urls import canonical_url
+from .recipient_profiles import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path('state') / 'trends.json'
+
+# Count-min sketch size: 4 x 4096 counters per window, ~0.1% overcount
+# per 1000 tokens at 98% confidence
+SKETCH_WIDTH = 4096
+SKETCH_DEPTH = 4
+
+# Recent activity vs. baseline, as exponential-decay half-lives
+SHORT_HALF_LIFE_HOURS = 3
+LONG_HALF_LIFE_HOURS = 72
+
+# A term trends when its recent count is this many times what its
+# baseline share predicts, and it was seen at least MIN_RECENT_COUNT times
+BURST_RATIO = 3.0
+MIN_RECENT_COUNT = 3.0
+
+# Until the baseline has this many tokens, everything would look new
+WARMUP_TOKENS = 2000
+
+# Add-one smoothing over a notional vocabulary of this size, so rare
+# terms need several sightings before they can burst
+SMOOTHING_VOCABULARY = 1000
+
+# Candidate terms remembered (the sketch cannot list its keys)
+MAX_TRACKED_TERMS = 5000
+
+# Article keys remembered so a re-fetched article is not counted twice
+MAX_SEEN_ARTICLES = 5000
+
+DEFAULT_TREND_WEIGHT = 0.5
+
+_PHRASE_WORDS = 3
+
+
+def _hashes(term: str) -> Tuple[int, int]:
+    digest = hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest[:4], 'little'), int.from_bytes(digest[4:], 'little') | 1
+
+
+def article_terms(article: Dict) -> List[str]:
+    """
+    Distinct terms of an article: content words of title and description,
+    plus capitalized title phrases ("Supreme Court", "Narendra Modi")
+    """
+    title = article.get('title') or ''
+    terms = {
+        token for token in tokenize(f"{title} {article.get('description') or ''}")
+        if len(token) > 2 and token not in STOPWORDS and not token.isdigit()
+    }
+    phrase = []
+    for word in title.split() + ['']:
+        word = word.strip('.,:;!?"\'()[]')
+        if word[:1].isupper() and word.lower() not in STOPWORDS:
+            phrase.append(word.lower())
+            continue
+        if 2 <= len(phrase) <= _PHRASE_WORDS:
+            terms.add(' '.join(phrase))
+        phrase = []
+    return sorted(terms)
+
+
+class DecayedSketch:
+    """
+    Count-min sketch of exponentially decayed counts
+
+    Uses forward decay: an increment at time t is stored as
+    2^((t - t0) / half_life), so adding is O(depth) and nothing has to be
+    aged in place; the counters are rescaled only when the weights grow
+    large.
+    """
+
+    def __init__(self, half_life: float, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        """
+        Args:
+            half_life: Seconds after which a count is worth half
+            width: Counters per row
+            depth: Rows (independent hash functions)
+        """
+        self.half_life = half_life
+        self.width = width
+        self.depth = depth
+        self.origin = time.time()
+        self.cells = array('d', bytes(8 * width * depth))
+        self.total = 0.0
+
+    def _weight(self, now: float) -> float:
+        return 2.0 ** ((now - self.origin) / self.half_life)
+
+    def _rescale(self, now: float):
+        factor = 1.0 / self._weight(now)
+        for i, value in enumerate(self.cells):
+            if value:
+                self.cells[i] = value * factor
+        self.total *= factor
+        self.origin = now
+
+    def _slots(self, hashes: Tuple[int, int]) -> Iterable[int]:
+        first, second = hashes
+        for row in range(self.depth):
+            yield row * self.width + (first + row * second) % self.width
+
+    def add(self, hashes: Tuple[int, int], now: float, count: float = 1.0):
+        if now - self.origin > 40 * self.half_life:
+            self._rescale(now)
+        weight = count * self._weight(now)
+        for slot in self._slots(hashes):
+            self.cells[slot] += weight
+        self.total += weight
+
+    def estimate(self, hashes: Tuple[int, int], now: float) -> float:
+        """Decayed count (an overestimate by at most the collision noise)"""
+        return min(self.cells[slot] for slot in self._slots(hashes)) / self._weight(now)
+
+    def size(self, now: float) -> float:
+        """Decayed number of increments"""
+        return self.total / self._weight(now)
+
+    def to_dict(self) -> Dict:
+        return {
+            'half_life': self.half_life, 'width': self.width, 'depth': self.depth,
+            'origin': self.origin, 'total': self.total,
+            'cells': base64.b64encode(zlib.compress(self.cells.tobytes())).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DecayedSketch':
+        sketch = cls(data['half_life'], data['width'], data['depth'])
+        sketch.origin = data['origin']
+        sketch.total = data['total']
+        cells = array('d')
+        cells.frombytes(zlib.decompress(base64.b64decode(data['cells'])))
+        if len(cells) == len(sketch.cells):
+            sketch.cells = cells
+        return sketch
+
+
+def trend_detector_from_config(config: dict) -> Optional['TrendDetector']:
+    """The configured trend detector, None if TRENDS=false"""
+    if (config.get('TRENDS') or 'true').lower() == 'false':
+        return None
+    weight = config.get('TREND_WEIGHT')
+    return TrendDetector(
+        config.get('TREND_STATE_FILE') or DEFAULT_STATE_PATH,
+        weight=float(weight) if weight not in (None, '') else DEFAULT_TREND_WEIGHT
+    )
+
+
+class TrendDetector:
+    """
+    Rolling term counts over a short and a long window (count-min
+    sketches, bounded memory); a term bursts when its short-window count
+    is far above what its long-window share predicts. Observing an article
+    costs O(its terms); the state is snapshotted to a compact JSON file.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH, weight: float = DEFAULT_TREND_WEIGHT):
+        """
+        Args:
+            path: JSON snapshot file (None = memory only)
+            weight: Share of an article's rank that comes from trending terms
+        """
+        self.path = Path(path) if path else None
+        self.weight = weight
+        self.recent = DecayedSketch(SHORT_HALF_LIFE_HOURS * 3600)
+        self.baseline = DecayedSketch(LONG_HALF_LIFE_HOURS * 3600)
+        self._terms: 'OrderedDict[str, float]' = OrderedDict()
+        self._seen: 'OrderedDict[str, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.recent = DecayedSketch.from_dict(data['recent'])
+            self.baseline = DecayedSketch.from_dict(data['baseline'])
+            self._terms = OrderedDict(data.get('terms', []))
+            self._seen = OrderedDict.fromkeys(data.get('seen', []))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring unreadable trend state {self.path}: {e}")
+
+    def observe(self, articles: List[Dict], now: Optional[float] = None) -> int:
+        """
+        Count the terms of articles not seen before
+
+        Returns:
+            Number of new articles counted
+        """
+        now = now if now is not None else time.time()
+        counted = 0
+        with self._lock:
+            for article in articles:
+                key = canonical_url(article.get('url') or article.get('link') or '') or article.get('title', '')
+                key = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                if len(self._seen) > MAX_SEEN_ARTICLES:
+                    self._seen.popitem(last=False)
+                counted += 1
+                for term in article_terms(article):
+                    hashes = _hashes(term)
+                    self.recent.add(hashes, now)
+                    self.baseline.add(hashes, now)
+                    self._terms[term] = now
+                    self._terms.move_to_end(term)
+            while len(self._terms) > MAX_TRACKED_TERMS:
+                self._terms.popitem(last=False)
+        return counted
+
+    def burst(self, term: str, now: Optional[float] = None) -> float:
+        """
+        How many times more frequent a term is recently than its baseline
+        predicts (0 if too rare, or while the baseline is warming up)
+        """
+        now = now if now is not None else time.time()
+        baseline_size = self.baseline.size(now)
+        if baseline_size < WARMUP_TOKENS:
+            return 0.0
+        hashes = _hashes(term)
+        recent = self.recent.estimate(hashes, now)
+        if recent < MIN_RECENT_COUNT:
+            return 0.0
+        # Share of the baseline, smoothed so unseen terms are not infinitely bursty
+        share = (self.baseline.estimate(hashes, now) + 1) / (baseline_size + SMOOTHING_VOCABULARY)
+        expected = share * self.recent.size(now)
+        return recent / expected if expected > 0 else 0.0
+
+    def trending(self, limit: int = 10, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """The most bursting terms, as (term, burst ratio)"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            terms = list(self._terms)
+        bursts = [(term, self.burst(term, now)) for term in terms]
+        bursts = [(term, ratio) for term, ratio in bursts if ratio >= BURST_RATIO]
+        return sorted(bursts, key=lambda item: item[1], reverse=True)[:limit]
+
+    def score(self, article: Dict, now: Optional[float] = None) -> float:
+        """Trend score in [0, 1): grows with the number and strength of bursting terms"""
+        now = now if now is not None else time.time()
+        total = 0.0
+        for term in article_terms(article):
+            ratio = self.burst(term, now)
+            if ratio >= BURST_RATIO:
+                total += math.log(ratio / BURST_RATIO) + 1
+        return 1 - math.exp(-total / 3)
+
+    def rank(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Observe articles, then re-rank them by position blended with trend score
+
+        The incoming order (the provider's hotness ranking) stays the
+        base; trending articles move up by up to `weight` of the list.
+        """
+        if not articles:
+            return articles
+        now = time.time()
+        self.observe(articles, now)
+        count = len(articles)
+        scored = []
+        for position, article in enumerate(articles):
+            trend = self.score(article, now)
+            if trend:
+                article['trend_score'] = round(trend, 3)
+            scored.append((1 - position / count + self.weight * trend, -position, article))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        top = self.trending(5, now)
+        if top:
+            logger.info("Trending: " + ', '.join(f"{term} x{ratio:.1f}" for term, ratio in top))
+        self.save()
+        return [article for _, _, article in scored]
+
+    def save(self):
+        """Write a snapshot atomically"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = json.dumps({
+                'recent': self.recent.to_dict(),
+                'baseline': self.baseline.to_dict(),
+                'terms': list(self._terms.items()),
+                'seen': list(self._seen),
+            })
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save trend state: {e}")